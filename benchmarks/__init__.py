@@ -0,0 +1,9 @@
+"""
+Benchmark suite for the hot paths of ics.py, run it from the repository root with ``python -m benchmarks``.
+
+Each benchmark is run on synthetic calendars described by a :class:`benchmarks.generate.CalendarSpec`
+and reports its best time, throughput and peak memory. The results are compared against the baseline
+stored in ``benchmarks/baseline.json`` and the exit status is non-zero if any benchmark regressed.
+As timings depend on the machine, record a new baseline with ``python -m benchmarks --save``
+(on the unchanged code) before comparing changes on a different machine.
+"""
@@ -0,0 +1,133 @@
+"""
+Generators for synthetic calendars, parameterized by a `CalendarSpec`.
+The generated data is deterministic for a given spec, so timings of different runs are comparable.
+"""
+import random
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+import attr
+from attr.validators import in_, instance_of
+
+from ics import Attendee, Calendar, ContentLine, DisplayAlarm, Event, Organizer
+from ics.timezone import UTC, Timezone
+
+__all__ = ["PROPERTY_MIXES", "TIMEZONES", "CalendarSpec", "generate_calendar"]
+
+# which properties the generated events have, each mix includes the properties of the previous one
+PROPERTY_MIXES = ("minimal", "typical", "full")
+TIMEZONES = (
+    "Europe/Berlin",
+    "America/New_York",
+    "Asia/Tokyo",
+    "Australia/Sydney",
+    "America/Sao_Paulo",
+    "Asia/Kolkata",
+    "Europe/London",
+    "America/Los_Angeles",
+)
+START = datetime(2021, 1, 1, 8, 0)
+WORDS = (
+    "meeting review planning sync budget release roadmap team customer "
+    "design retro demo lunch training interview workshop standup report"
+).split()
+
+
+@attr.s(frozen=True)
+class CalendarSpec:
+    """
+    Shape of a synthetic calendar:
+    `events` events spread over one year, with the properties of the `properties` mix,
+    of which a `recurring` fraction recur weekly and which use `timezones` different timezones
+    (all events are in UTC if this is 0).
+    """
+
+    events: int = attr.ib(default=1000, validator=instance_of(int))
+    properties: str = attr.ib(default="typical", validator=in_(PROPERTY_MIXES))
+    recurring: float = attr.ib(default=0.0)
+    timezones: int = attr.ib(default=0)
+    seed: int = attr.ib(default=0)
+
+    @timezones.validator
+    def _validate_timezones(self, attribute, value):
+        if not 0 <= value <= len(TIMEZONES):
+            raise ValueError(f"timezones must be between 0 and {len(TIMEZONES)}")
+
+    @property
+    def name(self) -> str:
+        return (
+            f"{self.events}-{self.properties}-rec{self.recurring:g}-tz{self.timezones}"
+        )
+
+    @property
+    def start(self) -> datetime:
+        return START.replace(tzinfo=UTC)
+
+    @property
+    def end(self) -> datetime:
+        return self.start + timedelta(days=365)
+
+
+def words(rnd: random.Random, count: int) -> str:
+    return " ".join(rnd.choice(WORDS) for _ in range(count))
+
+
+def generate_event(
+    spec: CalendarSpec, rnd: random.Random, nr: int, tz: Optional[Timezone]
+) -> Event:
+    begin = START.replace(tzinfo=tz or UTC) + timedelta(
+        minutes=15 * rnd.randrange(365 * 24 * 4)
+    )
+    event = Event(
+        uid=f"event-{nr}@benchmark.ics.py",
+        dtstamp=datetime(2020, 12, 1, tzinfo=UTC),
+        summary=words(rnd, 3).capitalize(),
+    )
+    if spec.properties != "minimal" and rnd.random() < 0.05:
+        event.begin = date(begin.year, begin.month, begin.day)
+        event.make_all_day()
+    else:
+        event.begin = begin
+        event.duration = timedelta(minutes=15 * rnd.randint(1, 16))
+
+    if spec.properties in ("typical", "full"):
+        event.description = ", ".join(words(rnd, 8) for _ in range(rnd.randint(1, 6)))
+        event.location = f"Room {rnd.randint(1, 40)}"
+        event.status = rnd.choice(["CONFIRMED", "TENTATIVE", "CANCELLED"])
+        event.categories = rnd.sample(WORDS, rnd.randint(0, 3))
+        event.created = datetime(2020, 11, rnd.randint(1, 30), tzinfo=UTC)
+        event.last_modified = datetime(2020, 12, 1, tzinfo=UTC)
+    if spec.properties == "full":
+        event.url = f"https://example.com/events/{nr}"
+        event.organizer = Organizer(
+            f"organizer{nr % 7}@example.com", common_name="Organizer"
+        )
+        event.attendees = [
+            Attendee(f"person{rnd.randrange(100)}@example.com", rsvp=True)
+            for _ in range(rnd.randint(1, 5))
+        ]
+        event.alarms = [
+            DisplayAlarm(trigger=timedelta(minutes=-15), description="Reminder")
+        ]
+        event.classification = rnd.choice(["PUBLIC", "PRIVATE"])
+        event.transparent = rnd.random() < 0.2
+        event.extra.append(ContentLine("X-BENCHMARK-NR", value=str(nr)))
+
+    if rnd.random() < spec.recurring:
+        event.extra.append(
+            ContentLine("RRULE", value=f"FREQ=WEEKLY;COUNT={rnd.randint(2, 20)}")
+        )
+    return event
+
+
+def generate_calendar(spec: CalendarSpec) -> Calendar:
+    rnd = random.Random(spec.seed)
+    timezones: List[Optional[Timezone]] = [
+        Timezone.from_tzid(tzid) for tzid in TIMEZONES[: spec.timezones]
+    ] or [None]
+    calendar = Calendar(creator="-//ics.py//benchmark//EN")
+    calendar.events.extend(
+        generate_event(spec, rnd, nr, rnd.choice(timezones))
+        for nr in range(spec.events)
+    )
+    return calendar
@@ -0,0 +1,454 @@
+"""
+Time the hot paths of ics.py on synthetic calendars and compare the results against a stored baseline.
+"""
+import argparse
+import functools
+import gc
+import itertools
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import attr
+
+from benchmarks.generate import TIMEZONES, CalendarSpec, generate_calendar
+from ics import Calendar
+from ics.contentline import string_to_containers
+from ics.table import EventTable
+from ics.timeline import Timeline
+from ics.timezone import UTC, Timezone
+
+__all__ = [
+    "BENCHMARKS",
+    "DEFAULT_SPECS",
+    "BenchmarkResult",
+    "Scenario",
+    "compare",
+    "main",
+    "run_benchmarks",
+]
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+DEFAULT_SPECS = (
+    CalendarSpec(2000, "minimal"),
+    CalendarSpec(1000, "typical", recurring=0.1, timezones=3),
+    CalendarSpec(300, "full", timezones=8),
+)
+# number of weekly windows used for each timeline query
+TIMELINE_QUERIES = 52
+UTCOFFSET_CALLS = 10000
+MIN_SAMPLE_SECONDS = 0.1
+
+
+@attr.s
+class Scenario:
+    """A synthetic calendar in the different forms the benchmarks need, each created on first use."""
+
+    spec: CalendarSpec = attr.ib()
+
+    @functools.cached_property
+    def calendar(self) -> Calendar:
+        return generate_calendar(self.spec)
+
+    @functools.cached_property
+    def text(self) -> str:
+        return self.calendar.serialize()
+
+    @functools.cached_property
+    def parsed(self) -> Calendar:
+        return Calendar(self.text)
+
+    def new_timeline(self) -> Timeline:
+        # expand the recurring events if there are any, as that is what the recurrence ratio is about
+        return Timeline(self.parsed, None, expand_recurrences=self.spec.recurring > 0)
+
+    @functools.cached_property
+    def timeline(self) -> Timeline:
+        timeline = self.new_timeline()
+        timeline.index()  # build the index outside of the timed queries
+        return timeline
+
+    @functools.cached_property
+    def table(self) -> EventTable:
+        table = self.parsed.to_table()
+        table.begin_order()  # sort the begins outside of the timed queries
+        return table
+
+    def windows(self) -> List[datetime]:
+        return [
+            self.spec.start + timedelta(weeks=week) for week in range(TIMELINE_QUERIES)
+        ]
+
+
+# A benchmark prepares everything it needs from the scenario and returns the function to time,
+# which returns the number of items (e.g. events or queries) it processed.
+BenchmarkFactory = Callable[[Scenario], Callable[[], int]]
+BENCHMARKS: Dict[str, BenchmarkFactory] = {}
+
+
+def benchmark(name: str) -> Callable[[BenchmarkFactory], BenchmarkFactory]:
+    def register(factory: BenchmarkFactory) -> BenchmarkFactory:
+        BENCHMARKS[name] = factory
+        return factory
+
+    return register
+
+
+@benchmark("contentline.string_to_containers")
+def bench_string_to_containers(scenario: Scenario) -> Callable[[], int]:
+    text = scenario.text
+
+    def run() -> int:
+        (calendar,) = string_to_containers(text)
+        return sum(1 for item in calendar if item.name == "VEVENT")
+
+    return run
+
+
+def bench_parse(**kwargs) -> BenchmarkFactory:
+    def factory(scenario: Scenario) -> Callable[[], int]:
+        text = scenario.text
+        return lambda: len(Calendar(text, **kwargs).events)
+
+    return factory
+
+
+benchmark("calendar.parse")(bench_parse())
+benchmark("calendar.parse_lazy")(bench_parse(lazy=True))
+benchmark("calendar.parse_workers")(bench_parse(workers=2))
+
+
+@benchmark("calendar.serialize")
+def bench_serialize(scenario: Scenario) -> Callable[[], int]:
+    return serialize(scenario.parsed)
+
+
+@benchmark("calendar.serialize_keep_source")
+def bench_serialize_keep_source(scenario: Scenario) -> Callable[[], int]:
+    return serialize(Calendar(scenario.text, keep_source=True))
+
+
+def serialize(calendar: Calendar) -> Callable[[], int]:
+    def run() -> int:
+        calendar.serialize()
+        return len(calendar.events)
+
+    return run
+
+
+@benchmark("calendar.diff")
+def bench_diff(scenario: Scenario) -> Callable[[], int]:
+    old, new = (Calendar(scenario.text, keep_source=True, lazy=True) for _ in range(2))
+    return lambda: len(old.diff(new).changed) + len(new.events)
+
+
+def bench_normalize(in_place: bool) -> BenchmarkFactory:
+    def factory(scenario: Scenario) -> Callable[[], int]:
+        # a copy of its own, as normalizing modifies the events
+        calendar = Calendar(scenario.text)
+
+        def run() -> int:
+            calendar.normalize(UTC, in_place=in_place)
+            return len(calendar.events)
+
+        return run
+
+    return factory
+
+
+benchmark("calendar.normalize")(bench_normalize(in_place=False))
+benchmark("calendar.normalize_in_place")(bench_normalize(in_place=True))
+
+
+@benchmark("timeline.index")
+def bench_timeline_index(scenario: Scenario) -> Callable[[], int]:
+    return lambda: len(scenario.new_timeline().index().entries)
+
+
+@benchmark("timeline.iterate")
+def bench_timeline_iterate(scenario: Scenario) -> Callable[[], int]:
+    timeline = scenario.timeline
+    return lambda: sum(1 for _ in timeline)
+
+
+@benchmark("timeline.overlapping_pairs")
+def bench_timeline_overlapping_pairs(scenario: Scenario) -> Callable[[], int]:
+    timeline, events = scenario.timeline, len(scenario.parsed.events)
+    return lambda: sum(1 for _ in timeline.overlapping_pairs()) + events
+
+
+def bench_timeline_query(query: Callable[[Timeline, datetime], Iterable]):
+    def factory(scenario: Scenario) -> Callable[[], int]:
+        timeline, windows = scenario.timeline, scenario.windows()
+
+        def run() -> int:
+            for start in windows:
+                for _ in query(timeline, start):
+                    pass
+            return len(windows)
+
+        return run
+
+    return factory
+
+
+WEEK = timedelta(weeks=1)
+benchmark("timeline.overlapping")(
+    bench_timeline_query(lambda tl, start: tl.overlapping(start, start + WEEK))
+)
+benchmark("timeline.included")(
+    bench_timeline_query(lambda tl, start: tl.included(start, start + WEEK))
+)
+benchmark("timeline.start_after")(
+    bench_timeline_query(lambda tl, start: itertools.islice(tl.start_after(start), 10))
+)
+benchmark("timeline.at")(bench_timeline_query(lambda tl, start: tl.at(start)))
+benchmark("timeline.on")(bench_timeline_query(lambda tl, start: tl.on(start)))
+
+
+def bench_table_query(query: Callable[[EventTable, datetime], Iterable]):
+    def factory(scenario: Scenario) -> Callable[[], int]:
+        table, windows = scenario.table, scenario.windows()
+
+        def run() -> int:
+            for start in windows:
+                query(table, start)
+            return len(windows)
+
+        return run
+
+    return factory
+
+
+benchmark("table.overlapping")(
+    bench_table_query(lambda table, start: table.overlapping(start, start + WEEK))
+)
+benchmark("table.included")(
+    bench_table_query(lambda table, start: table.included(start, start + WEEK))
+)
+benchmark("table.start_after")(
+    bench_table_query(lambda table, start: table.start_after(start))
+)
+benchmark("table.at")(bench_table_query(lambda table, start: table.at(start)))
+
+
+@benchmark("timezone.utcoffset")
+def bench_utcoffset(scenario: Scenario) -> Callable[[], int]:
+    timezones = [
+        Timezone.from_tzid(tzid)
+        for tzid in TIMEZONES[: max(scenario.spec.timezones, 1)]
+    ]
+    # naive local times spread over 40 years, so that both cached and uncached observances are looked up
+    instants = [
+        datetime(1990, 1, 1) + timedelta(hours=nr * 35) for nr in range(UTCOFFSET_CALLS)
+    ]
+
+    def run() -> int:
+        for tz in timezones:
+            for instant in instants:
+                tz.utcoffset(instant)
+        return len(timezones) * len(instants)
+
+    return run
+
+
+@attr.s(frozen=True)
+class BenchmarkResult:
+    name: str = attr.ib()
+    seconds: float = attr.ib()  # best time of all repetitions
+    items: int = attr.ib()
+    # in bytes, as measured by tracemalloc
+    peak_memory: Optional[int] = attr.ib(default=None)
+
+    @property
+    def throughput(self) -> float:
+        return self.items / self.seconds if self.seconds else float("inf")
+
+    def to_json(self) -> Dict:
+        return attr.asdict(self)
+
+
+def measure(
+    name: str, func: Callable[[], int], repeat: int, memory: bool
+) -> BenchmarkResult:
+    """
+    Get the best time of `repeat` samples of calling `func`.
+    Fast functions are called multiple times per sample, so that each sample takes at least `MIN_SAMPLE_SECONDS`.
+    """
+
+    def sample(loops: int) -> float:
+        nonlocal items
+        gc.collect()
+        start = time.perf_counter()
+        for _ in range(loops):
+            items = func()
+        return time.perf_counter() - start
+
+    items, loops = 0, 1
+    elapsed = sample(loops)
+    while elapsed < MIN_SAMPLE_SECONDS:
+        loops *= 2
+        elapsed = sample(loops)
+    best = elapsed
+    for _ in range(repeat - 1):
+        best = min(best, sample(loops))
+    best /= loops
+
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return BenchmarkResult(name, best, items, peak)
+
+
+def run_benchmarks(
+    specs: Sequence[CalendarSpec] = DEFAULT_SPECS,
+    names: Optional[Iterable[str]] = None,
+    repeat: int = 3,
+    memory: bool = True,
+    report: Callable[[BenchmarkResult], None] = lambda result: None,
+) -> List[BenchmarkResult]:
+    """
+    Run the benchmarks with the given `names` (all by default) on calendars of each spec
+    and call `report` with each result as soon as it is available.
+    """
+    results = []
+    for spec in specs:
+        scenario = Scenario(spec)
+        for name, factory in BENCHMARKS.items():
+            if names is not None and name not in names:
+                continue
+            result = measure(f"{name}[{spec.name}]", factory(scenario), repeat, memory)
+            report(result)
+            results.append(result)
+    return results
+
+
+def load_baseline(path: Path) -> Dict[str, BenchmarkResult]:
+    with path.open() as f:
+        return {
+            name: BenchmarkResult(**values) for name, values in json.load(f).items()
+        }
+
+
+def save_baseline(path: Path, results: Iterable[BenchmarkResult]) -> None:
+    data = {result.name: result.to_json() for result in results}
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+def compare(
+    result: BenchmarkResult,
+    baseline: Dict[str, BenchmarkResult],
+    tolerance: float,
+) -> List[str]:
+    """
+    Get a description of each way `result` regressed by more than the relative `tolerance` compared to `baseline`.
+    Results without a baseline never regress.
+    """
+    base = baseline.get(result.name)
+    if base is None:
+        return []
+    regressions = []
+    if result.seconds > base.seconds * (1 + tolerance):
+        regressions.append(f"time {result.seconds / base.seconds - 1:+.0%}")
+    if (
+        result.peak_memory is not None
+        and base.peak_memory is not None
+        and result.peak_memory > base.peak_memory * (1 + tolerance)
+    ):
+        regressions.append(f"memory {result.peak_memory / base.peak_memory - 1:+.0%}")
+    return regressions
+
+
+def format_result(
+    result: BenchmarkResult, baseline: Dict[str, BenchmarkResult], tolerance: float
+) -> str:
+    line = f"{result.name:<65} {result.seconds * 1000:10.2f} ms {result.throughput:12.0f}/s"
+    if result.peak_memory is not None:
+        line += f" {result.peak_memory / 2 ** 20:8.1f} MiB"
+    base = baseline.get(result.name)
+    if base is not None:
+        line += f"  {result.seconds / base.seconds - 1:+6.0%} vs. baseline"
+        regressions = compare(result, baseline, tolerance)
+        if regressions:
+            line += "  REGRESSED: " + ", ".join(regressions)
+    return line
+
+
+def parse_spec(value: str) -> CalendarSpec:
+    """Parse a spec given as EVENTS[,PROPERTIES[,RECURRING[,TIMEZONES]]]."""
+    parts = value.split(",")
+    converters = (int, str, float, int)
+    try:
+        return CalendarSpec(*(conv(part) for conv, part in zip(converters, parts)))
+    except (TypeError, ValueError) as e:
+        raise argparse.ArgumentTypeError(f"invalid spec {value!r}: {e}")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__.strip()
+    )
+    parser.add_argument(
+        "-k",
+        "--benchmark",
+        action="append",
+        choices=sorted(BENCHMARKS),
+        help="only run this benchmark, can be given multiple times",
+    )
+    parser.add_argument(
+        "-s",
+        "--spec",
+        action="append",
+        type=parse_spec,
+        help="calendar to benchmark as EVENTS[,PROPERTIES[,RECURRING[,TIMEZONES]]], "
+        "e.g. '5000,full,0.1,3', can be given multiple times",
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument(
+        "--no-memory", action="store_true", help="skip measuring the peak memory"
+    )
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help="store the results as new baseline, keeping the baseline of other benchmarks",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="relative slowdown or memory increase that counts as regression",
+    )
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline) if args.baseline.exists() else {}
+    results = run_benchmarks(
+        args.spec or DEFAULT_SPECS,
+        args.benchmark,
+        args.repeat,
+        not args.no_memory,
+        lambda result: print(
+            format_result(result, baseline, args.tolerance), flush=True
+        ),
+    )
+    if args.save:
+        # keep the baseline of benchmarks that weren't run
+        baseline.update((result.name, result) for result in results)
+        save_baseline(args.baseline, baseline.values())
+        print(f"saved baseline to {args.baseline}")
+        return 0
+    regressed = [r.name for r in results if compare(r, baseline, args.tolerance)]
+    if regressed:
+        print(f"{len(regressed)} benchmarks regressed", file=sys.stderr)
+        return 1
+    return 0
@@ -7,6 +7,7 @@ from .attendee import Attendee, Organizer
 from .component import Component
 from .contentline import Container, ContentLine
 from .event import Event
+from .freebusy import BusyPeriod, FreeBusy
 from .geo import Geo
 from .icalendar import Calendar
 from .rrule import rrule_eq  # ensure the monkey-patching is done
@@ -29,6 +30,7 @@ def initialize_converters():
     import ics.converter.value
     import ics.converter.types.timespan
     import ics.converter.types.various
+    import ics.converter.types.freebusy
 
     # 3) converters for all remaining component subclasses
     from ics.converter.component import ComponentMeta
@@ -38,6 +40,7 @@ def initialize_converters():
 
     ComponentMeta.BY_TYPE[Event] = ComponentMeta(Event)
     ComponentMeta.BY_TYPE[Todo] = ComponentMeta(Todo)
+    ComponentMeta.BY_TYPE[FreeBusy] = ComponentMeta(FreeBusy)
 
     # 4) the converter for the calendar
     import ics.converter.types.calendar
@@ -70,12 +73,14 @@ def dump_converters():
 __all__ = [
     *all_alarms,
     "Attendee",
+    "BusyPeriod",
     "Calendar",
     "Component",
     "Container",
     "ContentLine",
     "Event",
     "EventTimespan",
+    "FreeBusy",
     "Geo",
     "Organizer",
     "Timezone",
@@ -1,17 +1,95 @@
-from typing import ClassVar, Dict, List, Optional, Type, TypeVar, Union
+import weakref
+from typing import (
+    TYPE_CHECKING,
+    ClassVar,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 import attr
 from attr.validators import instance_of
 
-from ics.contentline import Container
-from ics.types import ContextDict, ExtraParams, RuntimeAttrValidation
+from ics.contentline import Container, SerializerConfig
+from ics.types import (
+    ContextDict,
+    ExtraParams,
+    LazySlot,
+    RuntimeAttrValidation,
+    VersionedList,
+)
+
+if TYPE_CHECKING:
+    from ics.converter.component import ComponentSource, LazyProperties
 
 ComponentType = TypeVar("ComponentType", bound="Component")
 ComponentExtraParams = Dict[str, Union[ExtraParams, List[ExtraParams]]]
 
 
-@attr.s
-class Component(RuntimeAttrValidation):
+class ParsedComponentMixin(RuntimeAttrValidation):
+    """
+    Mixin providing the slots for the state of parsed components, which aren't `attr` fields
+    so that they are ignored when comparing, copying or pickling components:
+    `_lazy` holds the `LazyProperties` of lazily populated components and `_source` the `ComponentSource`
+    of components that were parsed with `keep_source` (see `ComponentMeta`).
+    Assigning any attribute marks the component as modified by dropping its `_source`.
+    `_owners` holds weak references to the `VersionedList`s the component was added to.
+    """
+
+    __slots__ = ("_lazy", "_source", "_owners")
+
+    _lazy: Optional["LazyProperties"]
+    _source: Optional["ComponentSource"]
+    _owners: Tuple["weakref.ReferenceType[VersionedList]", ...]
+
+    def _attribute_assigned(self, key: str):
+        if self._source is not None:
+            object.__setattr__(self, "_source", None)
+
+    def _added_to(self, owner: VersionedList):
+        ref = weakref.ref(owner)
+        if not any(other is ref for other in self._owners):
+            owners = tuple(other for other in self._owners if other() is not None)
+            object.__setattr__(self, "_owners", owners + (ref,))
+
+    def _notify_owners(self):
+        """
+        Increment the `VersionedList.version` of all lists this component was added to, so that caches
+        derived from only these lists are invalidated. Lists the component was removed from again may also
+        be notified, which only causes their caches to be rebuilt unnecessarily.
+        """
+        for ref in self._owners:
+            owner = ref()
+            if owner is not None:
+                owner.version += 1
+
+
+ParsedComponentMixin._lazy = LazySlot(  # type: ignore[assignment]
+    ParsedComponentMixin.__dict__["_lazy"], lambda self: None
+)
+ParsedComponentMixin._source = LazySlot(  # type: ignore[assignment]
+    ParsedComponentMixin.__dict__["_source"], lambda self: None
+)
+ParsedComponentMixin._owners = LazySlot(  # type: ignore[assignment]
+    ParsedComponentMixin.__dict__["_owners"], lambda self: ()
+)
+
+
+@attr.s(slots=True, getstate_setstate=False)
+class Component(ParsedComponentMixin):
+    """
+    Base class of all components, storing unknown properties and sub-components in `extra`
+    and unknown parameters of known properties in `extra_params`.
+    Both are only created on first access, see `LazySlot`.
+    Components are slotted classes, so subclasses should also be declared with `@attr.s(slots=True)`
+    or define `__slots__` if they don't need a `__dict__`. `__getstate__` and `__setstate__` support
+    pickling subclasses that store some attributes in slots and others in their `__dict__`.
+    """
+
     NAME: ClassVar[str] = "ABSTRACT-COMPONENT"
     SUBTYPES: ClassVar[List[Type["Component"]]] = []
 
@@ -20,19 +98,32 @@ class Component(RuntimeAttrValidation):
     )
     extra_params: ComponentExtraParams = attr.ib(
         init=False,
-        factory=dict,
         validator=instance_of(dict),
         metadata={"ics_ignore": True},
     )
 
-    def __attrs_post_init__(self):
-        super().__attrs_post_init__()
-        object.__setattr__(self, "extra", Container(self.NAME))
-
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
+        if issubclass(cls, LazyComponentMixin):
+            return
+        # attrs re-creates slotted classes, so replace the original class if it already was registered
+        Component.SUBTYPES[:] = [
+            sub
+            for sub in Component.SUBTYPES
+            if (sub.__module__, sub.__qualname__) != (cls.__module__, cls.__qualname__)
+        ]
         Component.SUBTYPES.append(cls)
 
+    def __getstate__(self):
+        state = dict(getattr(self, "__dict__", {}))
+        for field in attr.fields(type(self)):
+            state.setdefault(field.name, getattr(self, field.name))
+        return state
+
+    def __setstate__(self, state):
+        for key, value in state.items():
+            object.__setattr__(self, key, value)
+
     @classmethod
     def from_container(
         cls: Type[ComponentType],
@@ -62,10 +153,31 @@ class Component(RuntimeAttrValidation):
 
         return ComponentMeta.BY_TYPE[type(self)].serialize_toplevel(self, context)
 
-    def serialize(self, context: Optional[ContextDict] = None) -> str:
-        """Creates a serialized string fit for file write."""
+    def digest(self) -> str:
+        """
+        Get a hex digest of the content of this component, which only changes if its serialization changes.
+        Components that were parsed with `keep_source` and not modified since are hashed from their original text,
+        so the digest of equal components may differ depending on whether and from which text they were parsed.
+        Lazily populated properties are hashed without converting them.
+        """
+        from ics import initialize_converters
+
+        initialize_converters()
+        from ics.converter.component import ComponentMeta
+
+        return ComponentMeta.BY_TYPE[type(self)].digest(self)
 
-        return self.to_container(context).serialize()
+    def serialize(
+        self,
+        context: Optional[ContextDict] = None,
+        config: Optional[SerializerConfig] = None,
+    ) -> str:
+        """
+        Creates a serialized string fit for file write.
+        The line folding and line endings can be configured by passing a `SerializerConfig`.
+        """
+
+        return self.to_container(context).serialize(config=config)
 
     def strip_extras(
         self,
@@ -97,3 +209,76 @@ class Component(RuntimeAttrValidation):
         """Returns an exact (shallow) copy of self"""
         # TODO deep copies?
         return attr.evolve(self)
+
+
+Component.extra = LazySlot(  # type: ignore[assignment]
+    Component.__dict__["extra"], lambda self: Container(self.NAME)
+)
+Component.extra_params = LazySlot(  # type: ignore[assignment]
+    Component.__dict__["extra_params"], lambda self: {}
+)
+
+
+class LazyComponentMixin:
+    """
+    Mixin for the subclass of a component type that is generated by `ComponentMeta` for lazily populated components.
+    Instances only have that subclass while the raw lines of some attributes are pending in `_lazy` and
+    the slots of these attributes are empty, so that reading them falls back to `__getattr__`, which converts the lines.
+    Once no lines are pending any more, the instance is changed back to its `PLAIN_TYPE`, so that all other
+    components keep accessing their attributes through the plain slots.
+    """
+
+    __slots__ = ()
+
+    PLAIN_TYPE: ClassVar[Type[Component]]
+
+    def __attrs_post_init__(self):
+        super().__attrs_post_init__()  # type: ignore[misc]
+        # instances that are created directly, e.g. by `attr.evolve`, have no pending lines
+        object.__setattr__(self, "__class__", self.PLAIN_TYPE)
+
+    def __getattr__(self, key: str):
+        lazy = self._lazy  # type: ignore[attr-defined]
+        if lazy is None or key not in lazy.lines:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {key!r}"
+            )
+        self._load_lazy(key)
+        return object.__getattribute__(self, key)
+
+    def __setattr__(self, key, value):
+        lazy = self._lazy  # type: ignore[attr-defined]
+        if lazy is not None and key in lazy.lines:
+            # convert the raw lines first to keep their extra params, in the same way as for an eagerly populated instance
+            self._load_lazy(key)
+        super().__setattr__(key, value)
+
+    def __delattr__(self, key):
+        lazy = self._lazy  # type: ignore[attr-defined]
+        if lazy is not None and lazy.lines.pop(key, None) is not None:
+            if not lazy.lines:
+                object.__setattr__(self, "_lazy", None)
+                object.__setattr__(self, "__class__", self.PLAIN_TYPE)
+        else:
+            super().__delattr__(key)
+
+    def __eq__(self, other):
+        return self._load_all().__eq__(self, other)
+
+    def __reduce_ex__(self, protocol):
+        # pickle and copy the instance as its plain type
+        return self._load_all().__reduce_ex__(self, protocol)
+
+    def _load_lazy(self, key: str):
+        from ics.converter.component import ComponentMeta
+
+        ComponentMeta.BY_TYPE[type(self)].load_lazy(self, key)
+
+    def _load_all(self) -> Type[Component]:
+        plain_type = self.PLAIN_TYPE
+        lazy = self._lazy  # type: ignore[attr-defined]
+        if lazy is not None:
+            for key in list(lazy.lines):
+                self._load_lazy(key)
+        object.__setattr__(self, "__class__", plain_type)
+        return plain_type
@@ -5,14 +5,16 @@ from ics.contentline.container import (
     ContentLine,
     ParseError,
     QuotedParamValue,
+    SerializerConfig,
 )
-from ics.contentline.parser import ParserClass
+from ics.contentline.parser import BUFFER_TYPES, Buffer, ParserClass, Stream
 from ics.types import ContainerItem
 from ics.utils import one
 
 Parser = ParserClass()
 string_to_containers = Parser.string_to_containers
 lines_to_containers = Parser.lines_to_containers
+buffer_to_containers = Parser.buffer_to_containers
 
 
 def string_to_container(txt: str) -> ContainerItem:
@@ -26,11 +28,13 @@ def lines_to_container(lines: Iterable[str]) -> ContainerItem:
 __all__ = [
     "ParseError",
     "QuotedParamValue",
+    "SerializerConfig",
     "ContentLine",
     "Container",
     "Parser",
     "string_to_containers",
     "lines_to_containers",
+    "buffer_to_containers",
     "string_to_container",
     "lines_to_container",
 ]
@@ -1,16 +1,22 @@
+import copy
 import functools
+import hashlib
+import mmap
 import re
 import sys
+from array import array
 from collections import UserString
 from contextlib import contextmanager
+from contextvars import ContextVar
 from textwrap import TextWrapper
-from typing import List, MutableSequence, Tuple, Union
+from typing import Any, List, MutableSequence, Optional, Tuple, Union
 
 import attr
 
 from ics.types import (
     ContainerItem,
     ExtraParams,
+    LazySlot,
     RuntimeAttrValidation,
     copy_extra_params,
 )
@@ -29,17 +35,185 @@ DEFAULT_LINE_WRAP = TextWrapper(
 )
 
 
+# chunks as split by `TextWrapper` for text without hyphens, its whitespace only consists of these ASCII characters
+WRAP_CHUNK = re.compile(r"[\t\n\x0b\x0c\r ]+|[^\t\n\x0b\x0c\r ]+")
+
+
+def fold_line(
+    line: str, wrap: TextWrapper = DEFAULT_LINE_WRAP, octets: bool = False
+) -> List[str]:
+    """
+    Fold a serialized content line into physical lines of at most `wrap.width` octets, see RFC 5545 section 3.1.
+    Lines that are short enough are returned as they are.
+
+    Longer lines are folded like `wrap` does, so that the output stays byte-identical to that of previous versions
+    wherever that output was valid. Only if one of the resulting lines is longer than `wrap.width` in UTF-8
+    (or if `octets` is set), the line is folded by `fold_line_octets` instead.
+    """
+    width = wrap.width
+    if len(line) <= width and not wrap.initial_indent:
+        if line.isascii() or len(line.encode("utf-8")) <= width:
+            return [line]
+        return fold_line_octets(line, width, wrap.subsequent_indent)
+    if octets:
+        return fold_line_octets(line, width, wrap.subsequent_indent)
+    if "-" not in line and is_plain_wrap(wrap):
+        lines = wrap_chunks(WRAP_CHUNK.findall(line), width, wrap.subsequent_indent)
+    else:
+        lines = wrap.wrap(line)
+    if not line.isascii() and any(len(part.encode("utf-8")) > width for part in lines):
+        return fold_line_octets(line, width, wrap.subsequent_indent)
+    return lines
+
+
+def is_plain_wrap(wrap: TextWrapper) -> bool:
+    """
+    Check whether `wrap` only breaks long words and preserves all whitespace, like `DEFAULT_LINE_WRAP`,
+    so that `wrap_chunks` folds exactly like it.
+    """
+    return (
+        wrap.break_long_words
+        and not wrap.initial_indent
+        and not wrap.drop_whitespace
+        and not wrap.expand_tabs
+        and not wrap.replace_whitespace
+        and not wrap.fix_sentence_endings
+        and wrap.max_lines is None
+    )
+
+
+def wrap_chunks(chunks: List[str], width: int, indent: str) -> List[str]:
+    """
+    Fill lines of at most `width` characters with the whitespace and word `chunks` of a text without hyphens,
+    giving the same result as `TextWrapper._wrap_chunks` for a `TextWrapper` with `is_plain_wrap`,
+    without the overhead of its configurability.
+    """
+    lines: List[str] = []
+    chunks.reverse()
+    while chunks:
+        line_width = width - len(indent) if lines else width
+        cur_line = []
+        cur_len = 0
+        while chunks and cur_len + len(chunks[-1]) <= line_width:
+            chunk = chunks.pop()
+            cur_line.append(chunk)
+            cur_len += len(chunk)
+        if chunks and len(chunks[-1]) > line_width:
+            # break the long word, making sure at least one character is taken if the indent is too long
+            end = 1 if line_width < 1 else line_width - cur_len
+            chunk = chunks[-1]
+            cur_line.append(chunk[:end])
+            chunks[-1] = chunk[end:]
+        if cur_line:
+            lines.append((indent if lines else "") + "".join(cur_line))
+    return lines
+
+
+def fold_line_octets(line: str, width: int = 75, indent: str = " ") -> List[str]:
+    """
+    Split `line` into lines of at most `width` octets in UTF-8, without breaking multi-byte characters.
+    All lines but the first are prefixed with `indent`, which counts towards their width.
+    """
+    data = line.encode("utf-8")
+    indent_len = len(indent.encode("utf-8"))
+    lines = []
+    start, limit = 0, width
+    while len(data) - start > limit:
+        end = start + limit
+        # don't split within the continuation bytes 0b10xxxxxx of a multi-byte character
+        while end > start and (data[end] & 0xC0) == 0x80:
+            end -= 1
+        if end == start:
+            # the width is too small to hold even a single character
+            end += 1
+            while end < len(data) and (data[end] & 0xC0) == 0x80:
+                end += 1
+        lines.append(data[start:end].decode("utf-8"))
+        start, limit = end, max(width - indent_len, 1)
+    lines.append(data[start:].decode("utf-8"))
+    return lines[:1] + [indent + part for part in lines[1:]]
+
+
+@attr.s(frozen=True, slots=True)
+class SerializerConfig:
+    """
+    Options for serializing content lines, which can be passed to the `serialize` methods of
+    `ContentLine`, `Container` and `ics.component.Component`.
+    As instances are immutable and each has its own `TextWrapper`, concurrent serializations
+    with different options don't interfere with each other.
+
+    - `width` is the maximum length of the physical lines in UTF-8 octets when folding.
+    - `octets` fills all folded lines up to `width` octets instead of breaking them at whitespace
+      like `TextWrapper`, which is only done if that gives valid lines.
+    - `line_ending` is used for terminating all lines.
+    - `fold` can be set to False to never fold long lines.
+    """
+
+    width: int = attr.ib(default=75)
+    octets: bool = attr.ib(default=False)
+    line_ending: str = attr.ib(default="\r\n")
+    fold: bool = attr.ib(default=True)
+    _wrap: TextWrapper = attr.ib(init=False, eq=False, repr=False)
+
+    @width.validator
+    def _validate_width(self, attribute, value):
+        if value <= 0:
+            raise ValueError(f"line width must be positive, not {value}")
+
+    @_wrap.default
+    def _make_wrap(self):
+        wrap = copy.copy(DEFAULT_LINE_WRAP)
+        wrap.width = self.width
+        return wrap
+
+    def fold_line(self, line: str) -> List[str]:
+        if not self.fold:
+            return [line]
+        return fold_line(line, self._wrap, self.octets)
+
+
+default_serializer_config: ContextVar[Optional[SerializerConfig]] = ContextVar(
+    "ics.contentline.default_serializer_config", default=None
+)
+
+# default for the `wrap` argument of the `serialize` methods, telling apart calls that don't pass `wrap` at all
+CONTEXT_WRAP: Any = object()
+
+
+def resolve_serializer_config(
+    wrap: Optional[TextWrapper], config: Optional[SerializerConfig]
+) -> Tuple[Optional[SerializerConfig], Optional[TextWrapper]]:
+    """
+    Determine the `(config, wrap)` to serialize with, where only one of both is used if `config` is not None.
+    Explicitly passed arguments take precedence over the `SerializerConfig` set for the current context,
+    which in turn takes precedence over `DEFAULT_LINE_WRAP`.
+    """
+    if config is not None:
+        return config, None
+    if wrap is not CONTEXT_WRAP:
+        return None, wrap
+    config = default_serializer_config.get()
+    if config is not None:
+        return config, None
+    return None, DEFAULT_LINE_WRAP
+
+
 @contextmanager
 def contentline_set_wrap(width):
-    oldwidth = DEFAULT_LINE_WRAP.width
+    """
+    Use a line width of `width` (or no folding at all if `width` is not positive) for all serializations
+    in the current context that don't explicitly specify a `SerializerConfig`.
+    This only affects the current thread or asyncio task, see `contextvars`.
+    """
     if not width or width <= 0:
-        DEFAULT_LINE_WRAP.width = sys.maxsize
+        config = SerializerConfig(fold=False)
     else:
-        DEFAULT_LINE_WRAP.width = width
+        config = SerializerConfig(width=width)
+    token = default_serializer_config.set(config)
     try:
         yield
     finally:
-        DEFAULT_LINE_WRAP.width = oldwidth
+        default_serializer_config.reset(token)
 
 
 @attr.s(slots=True, frozen=True, auto_exc=True)  # type: ignore[misc]
@@ -128,6 +302,20 @@ class Patterns:
         "(?P<name>" + IDENTIFIER + ")(;" + PARAM + ")*:(?P<value>" + VALUE_CHARS + ")"
     )
 
+    # The following patterns exactly describe the lines ContentLineParser.parse can handle without error,
+    # allowing ContentLineParser.parse_fast to tokenize a line using a single match.
+    FAST_PVAL_RAW = '[^",:;][^,:;]*'
+    FAST_PVAL_QUOTED = DQUOTE + "[^" + DQUOTE + "]*" + DQUOTE
+    FAST_PVALS = (
+        "(?:(?:" + FAST_PVAL_QUOTED + "|(?:" + FAST_PVAL_RAW + ")?),)*"
+        "(?:" + FAST_PVAL_QUOTED + "|" + FAST_PVAL_RAW + ")"
+    )
+    FAST_PARAM = ";(?P<pname>[^=:;]*)=(?P<pvals>" + FAST_PVALS + ")"
+    FAST_PVAL = DQUOTE + "(?P<quoted>[^" + DQUOTE + "]*)" + DQUOTE + "|(?P<raw>[^,]*)"
+    FAST_LINE = (
+        "(?P<name>[^:;]*)(?P<params>(?:;[^=:;]*=" + FAST_PVALS + ")*):(?P<value>.*)"
+    )
+
 
 @attr.s(slots=True)
 class ContentLine(RuntimeAttrValidation):
@@ -148,19 +336,43 @@ class ContentLine(RuntimeAttrValidation):
     # TODO store value type for jCal
     line_nr: int = attr.ib(default=-1, eq=False)
 
-    def serialize(self, newline=False, wrap=DEFAULT_LINE_WRAP):
+    def serialize(
+        self,
+        newline=False,
+        wrap=CONTEXT_WRAP,
+        config: Optional[SerializerConfig] = None,
+    ):
+        config, wrap = resolve_serializer_config(wrap, config)
+        if config is not None:
+            return "".join(self.serialize_iter(newline, config=config))
         if wrap is None:
             return self._serialize_unwrapped(newline)
-        return "\r\n".join(wrap.wrap(self._serialize_unwrapped(newline)))
-
-    def serialize_iter(self, newline=False, wrap=DEFAULT_LINE_WRAP):
-        if wrap is None:
+        return "\r\n".join(fold_line(self._serialize_unwrapped(newline), wrap))
+
+    def serialize_iter(
+        self,
+        newline=False,
+        wrap=CONTEXT_WRAP,
+        config: Optional[SerializerConfig] = None,
+    ):
+        """
+        Serialize this line, folded using `config` if given, or else using the `TextWrapper` `wrap`,
+        or not at all if it is None. If neither is given, the `SerializerConfig` set for the current context is used.
+        """
+        config, wrap = resolve_serializer_config(wrap, config)
+        if config is not None:
+            folded, line_ending = (
+                config.fold_line(self._serialize_unwrapped(False)),
+                config.line_ending,
+            )
+        elif wrap is None:
             return self._serialize_iter_unwrapped(newline)
-        lines = [
-            elem
-            for line in wrap.wrap(self._serialize_unwrapped(False))
-            for elem in [line, "\r\n"]
-        ]
+        else:
+            folded, line_ending = (
+                fold_line(self._serialize_unwrapped(False), wrap),
+                "\r\n",
+            )
+        lines = [elem for line in folded for elem in [line, line_ending]]
         if not newline:
             lines.pop()
         return lines
@@ -205,6 +417,135 @@ class ContentLine(RuntimeAttrValidation):
         return f"{self.name}{self.params or ''}='{limit_str_length(self.value)}'"
 
 
+LINEBREAK = re.compile(Patterns.LINEBREAK)
+BYTES_LINEBREAK = re.compile(Patterns.LINEBREAK.encode("ascii"))
+LINEFOLD = re.compile(Patterns.LINEFOLD)
+# patterns for quickly classifying the line breaks of a text, for str and for bytes
+LINE_BREAK_KINDS = {
+    str: tuple(map(re.compile, ("\n", "\r(?!\n)", "\r\n", "(?<!\r)\n"))),
+    bytes: tuple(map(re.compile, (b"\n", b"\r(?!\n)", b"\r\n", b"(?<!\r)\n"))),
+}
+
+
+def content_digest(text: str) -> str:
+    """
+    Get a hex digest of the unfolded content lines in `text`,
+    which doesn't depend on how the lines are folded and terminated and ignores empty lines.
+    """
+    lines = LINEBREAK.split(LINEFOLD.sub("", text))
+    data = "\n".join(line for line in lines if line)
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@attr.s(slots=True, frozen=True, repr=False)
+class SourceText:
+    """
+    The original text (or raw bytes) some `Container`s were parsed from, together with the start offsets of all
+    physical lines, so that the original text of each container can be retrieved, see `SourceSpan`.
+    `line_ending` is the line break used by all lines, or None if they are mixed.
+    """
+
+    text: Union[str, bytes, bytearray, memoryview, mmap.mmap] = attr.ib()
+    line_starts: array = attr.ib()
+    line_ending: Optional[str] = attr.ib()
+    encoding: str = attr.ib(default="utf-8")
+
+    @classmethod
+    def from_text(
+        cls,
+        text: Union[str, bytes, bytearray, memoryview, mmap.mmap],
+        encoding: str = "utf-8",
+    ) -> "SourceText":
+        newline, lone_cr, cr_lf, lone_lf = LINE_BREAK_KINDS[
+            str if isinstance(text, str) else bytes
+        ]
+        line_starts = array("q", [0])
+        line_ending: Optional[str] = None
+        if lone_cr.search(text) is None:  # type: ignore[arg-type]
+            # every line ends with a LF, which is much faster to search for than the general pattern
+            line_starts.extend([m.end() for m in newline.finditer(text)])  # type: ignore[arg-type]
+            has_cr_lf = cr_lf.search(text) is not None  # type: ignore[arg-type]
+            has_lone_lf = lone_lf.search(text) is not None  # type: ignore[arg-type]
+            if has_cr_lf != has_lone_lf:
+                line_ending = "\r\n" if has_cr_lf else "\n"
+        else:
+            pattern = LINEBREAK if isinstance(text, str) else BYTES_LINEBREAK
+            endings = set()
+            for line_break in pattern.finditer(text):  # type: ignore[arg-type]
+                line_starts.append(line_break.end())
+                endings.add(line_break.group())
+            if len(endings) == 1:
+                line_ending = endings.pop()
+                if isinstance(line_ending, bytes):
+                    line_ending = line_ending.decode(encoding)
+        line_starts.append(len(text))
+        return cls(text, line_starts, line_ending, encoding)
+
+    def lines(self, first: int, last: int) -> str:
+        """Get the original text of the physical lines `first` to `last` (inclusive), including their line breaks."""
+        text = self.text[self.line_starts[first] : self.line_starts[last + 1]]
+        if isinstance(text, str):
+            return text
+        return bytes(text).decode(self.encoding)
+
+    def is_continuation(self, line: int) -> bool:
+        """Check whether physical line number `line` is the continuation of a folded line."""
+        if line + 1 >= len(self.line_starts):
+            return False
+        start = self.line_starts[line]
+        return self.text[start : start + 1] in (" ", "\t", b" ", b"\t")
+
+
+@attr.s(slots=True, frozen=True, repr=False)
+class SourceSpan:
+    """
+    The physical lines `first` (the BEGIN line) to `last` (the END line) of a `SourceText`,
+    containing the original text of a `Container`.
+    """
+
+    source: SourceText = attr.ib()
+    first: int = attr.ib()
+    last: int = attr.ib()
+
+    def text(self) -> str:
+        return self.source.lines(self.first, self.last)
+
+    def contains(self, other: "SourceSpan") -> bool:
+        return (
+            other.source is self.source
+            and self.first <= other.first
+            and other.last <= self.last
+        )
+
+    def serialize(
+        self, newline: bool, line_ending: str, width: Optional[int]
+    ) -> Optional[str]:
+        """
+        Get the original text, if it is also valid output for the given line ending and maximum line `width`
+        in octets (or None if no lines may be folded), otherwise None.
+        """
+        if self.source.line_ending != line_ending or self.source.is_continuation(
+            self.last + 1
+        ):
+            return None
+        text = self.text()
+        if text.endswith(line_ending):
+            text = text[: -len(line_ending)]
+        for line in text.split(line_ending):
+            if not line:
+                return None  # empty lines are skipped when parsing
+            if width is None:
+                if line[0] in " \t":
+                    return None
+            elif len(line) > width:
+                return None
+            elif not line.isascii() and len(line.encode("utf-8")) > width:
+                return None
+        if newline:
+            text += line_ending
+        return text
+
+
 def _wrap_list_func(list_func):
     @functools.wraps(list_func)
     def wrapper(self, *args, **kwargs):
@@ -213,8 +554,24 @@ def _wrap_list_func(list_func):
     return wrapper
 
 
+class ParsedContainerMixin:
+    """
+    Mixin providing the slot for the `SourceSpan` of a parsed `Container` (see `Container.from_source`),
+    which isn't an `attr` field so that it is ignored when comparing, copying or pickling containers.
+    """
+
+    __slots__ = ("source",)
+
+    source: Optional[SourceSpan]
+
+
+ParsedContainerMixin.source = LazySlot(  # type: ignore[assignment]
+    ParsedContainerMixin.__dict__["source"], lambda self: None
+)
+
+
 @attr.s(slots=True, repr=False)
-class Container(MutableSequence[ContainerItem]):
+class Container(ParsedContainerMixin, MutableSequence[ContainerItem]):
     """Represents an iCalendar object.
     Contains a list of ContentLines or Containers.
 
@@ -231,6 +588,27 @@ class Container(MutableSequence[ContainerItem]):
         validator=lambda inst, attr, value: inst.check_items(*value),
     )
 
+    @classmethod
+    def from_source(cls, name: str, source: SourceSpan) -> "Container":
+        """
+        Create a container that is serialized as the original text of `source` if possible.
+        The items are only parsed from that text once they are first accessed,
+        after that the container is serialized from its (possibly modified) items again.
+        """
+        container = cls.__new__(cls)
+        container.name = name.upper()
+        container.source = source
+        return container
+
+    def _parse_source(self) -> List[ContainerItem]:
+        if self.source is None:
+            raise AttributeError("data")
+        from ics.contentline import string_to_container
+
+        container = string_to_container(self.source.text())
+        assert isinstance(container, Container)
+        return container.data
+
     def __str__(self):
         return f"{self.name}[{', '.join(str(cl) for cl in self.data)}]"
 
@@ -243,19 +621,40 @@ class Container(MutableSequence[ContainerItem]):
             return self.data[0].line_nr
         return -1
 
-    def serialize(self, newline=False, wrap=DEFAULT_LINE_WRAP):
-        return "".join(self.serialize_iter(newline, wrap))
-
-    def serialize_iter(self, newline=False, wrap=DEFAULT_LINE_WRAP):
+    def serialize(
+        self,
+        newline=False,
+        wrap=CONTEXT_WRAP,
+        config: Optional[SerializerConfig] = None,
+    ):
+        return "".join(self.serialize_iter(newline, wrap, config))
+
+    def serialize_iter(
+        self,
+        newline=False,
+        wrap=CONTEXT_WRAP,
+        config: Optional[SerializerConfig] = None,
+    ):
+        config, wrap = resolve_serializer_config(wrap, config)
+        line_ending = "\r\n" if config is None else config.line_ending
+        if self.source is not None and Container.data.peek(self) is None:  # type: ignore[attr-defined]
+            if config is None:
+                width = wrap.width if wrap else None
+            else:
+                width = config.width if config.fold else None
+            text = self.source.serialize(newline, line_ending, width)
+            if text is not None:
+                yield text
+                return
         yield "BEGIN:"
         yield self.name
-        yield "\r\n"
+        yield line_ending
         for line in self:
-            yield from line.serialize_iter(newline=True, wrap=wrap)
+            yield from line.serialize_iter(newline=True, wrap=wrap, config=config)
         yield "END:"
         yield self.name
         if newline:
-            yield "\r\n"
+            yield line_ending
 
     def clone(self, items=None, deep=False):
         """Makes a copy of itself"""
@@ -317,3 +716,8 @@ class Container(MutableSequence[ContainerItem]):
     pop = _wrap_list_func(list.pop)
     remove = _wrap_list_func(list.remove)
     reverse = _wrap_list_func(list.reverse)
+
+
+Container.data = LazySlot(  # type: ignore[assignment]
+    Container.__dict__["data"], Container._parse_source
+)
@@ -1,24 +1,64 @@
+import asyncio
+import mmap
 import re
 import warnings
-from typing import ClassVar, Iterable, Iterator, List, Match, Tuple, Union
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    ClassVar,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Match,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import attr
 
 from ics.contentline.container import (
+    BYTES_LINEBREAK,
     Container,
     ContentLine,
     ParseError,
     Patterns,
     QuotedParamValue,
+    SourceSpan,
+    SourceText,
     unescape_param,
 )
-from ics.types import ContainerItem
+from ics.types import ContainerItem, ExtraParams
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+BUFFER_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+Stream = Union[asyncio.StreamReader, AsyncIterable[bytes]]
+# number of bytes read from an `asyncio.StreamReader` at once
+STREAM_CHUNK_SIZE = 2**16
+FAST_LINE = re.compile(Patterns.FAST_LINE, re.DOTALL)
+FAST_PARAM = re.compile(Patterns.FAST_PARAM)
+FAST_PVAL = re.compile(Patterns.FAST_PVAL)
 
 
 class ParserClass:
-    def string_to_containers(self, txt: str) -> Iterator[ContainerItem]:
+    def __init__(self, fast_tokenizer: bool = True):
+        """
+        :param fast_tokenizer: whether content lines should be tokenized using `ContentLineParser.parse_fast`
+            instead of the step-wise `ContentLineParser.parse`, both yield the same results
+        """
+        self.fast_tokenizer = fast_tokenizer
+
+    def string_to_containers(
+        self, txt: str, keep_source: bool = False
+    ) -> Iterator[ContainerItem]:
+        """
+        Parse all top-level items of `txt`.
+        With `keep_source`, each `Container` references its original text in `Container.source`.
+        """
         return self.contentlines_to_containers(
-            self.lines_to_contentlines(self.unfold_lines(self.string_to_lines(txt)))
+            self.lines_to_contentlines(self.unfold_lines(self.string_to_lines(txt))),
+            SourceText.from_text(txt) if keep_source else None,
         )
 
     def lines_to_containers(self, lines: Iterable[str]) -> Iterator[ContainerItem]:
@@ -26,6 +66,14 @@ class ParserClass:
             self.lines_to_contentlines(self.unfold_lines(lines))
         )
 
+    def buffer_to_containers(
+        self, buffer: Buffer, encoding: str = "utf-8", keep_source: bool = False
+    ) -> Iterator[ContainerItem]:
+        return self.contentlines_to_containers(
+            self.lines_to_contentlines(self.unfold_buffer(buffer, encoding)),
+            SourceText.from_text(buffer, encoding) if keep_source else None,
+        )
+
     def string_to_lines(self, txt: str) -> Iterable[str]:
         # unicode newlines are interpreted as such by str.splitlines(), but not by the ics standard
         # "A:abc\x85def".splitlines() => ['A:abc', 'def'] which is wrong
@@ -63,51 +111,238 @@ class ParserClass:
         if current_lines:
             yield current_nr, "".join(current_lines)
 
+    def unfold_buffer(
+        self, buffer: Buffer, encoding: str = "utf-8"
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Equivalent to `unfold_lines(string_to_lines(buffer.decode(encoding)))`, but works directly on the
+        (possibly memory-mapped) raw bytes of the file. Only the boundaries of the folded lines are searched
+        in the buffer and every unfolded line is decoded on its own once it is needed,
+        so the whole decoded text never needs to be held in memory.
+        The `encoding` must be ASCII-compatible, i.e. it must represent line breaks as single bytes.
+        """
+        current_nr = -1
+        current_parts: List[Union[bytes, memoryview]] = []
+        line_nr = 0
+        line_start = 0
+        breaks = BYTES_LINEBREAK.finditer(buffer)  # type: ignore[call-overload]
+        while line_start >= 0:
+            line_break = next(breaks, None)
+            if line_break is None:
+                line_end, next_start = len(buffer), -1
+            else:
+                line_end, next_start = line_break.span()
+            if line_end > line_start:  # ignore empty lines
+                if buffer[line_start] in b" \t":
+                    if not current_parts:
+                        raise ParseError(
+                            "Line %s is a continuation (starts with space) without a preceding line: %r"
+                            % (
+                                line_nr,
+                                bytes(buffer[line_start:line_end]).decode(encoding),
+                            )
+                        )
+                    current_parts.append(buffer[line_start + 1 : line_end])
+                else:
+                    if current_parts:
+                        yield current_nr, b"".join(current_parts).decode(encoding)
+                    current_nr = line_nr
+                    current_parts = [buffer[line_start:line_end]]
+            line_nr += 1
+            line_start = next_start
+        if current_parts:
+            yield current_nr, b"".join(current_parts).decode(encoding)
+
+    async def stream_to_contentlines(
+        self, stream: Stream, encoding: str = "utf-8"
+    ) -> AsyncIterator[List[ContentLine]]:
+        """
+        Incrementally tokenize the raw bytes received from `stream`, an `asyncio.StreamReader` or any async iterable
+        of byte chunks, yielding the content lines of each chunk as soon as they are complete.
+        The physical lines are passed through `unfold_lines` and `lines_to_contentlines` in batches,
+        holding back the last line of each chunk until it is known whether the next chunk continues it.
+        The `encoding` must be ASCII-compatible, see `unfold_buffer`.
+        """
+        pending = b""  # the incomplete last physical line
+        lines: List[str] = []  # complete physical lines that weren't unfolded yet
+        line_nr = 0  # number of the first line in `lines`
+        async for chunk in iter_stream(stream):
+            data = pending + chunk
+            # a trailing CR might be the first half of a CRLF split between chunks
+            end = len(data) - 1 if data.endswith(b"\r") else len(data)
+            physical = BYTES_LINEBREAK.split(data[:end])
+            pending = physical.pop() + data[end:]
+            lines.extend(line.decode(encoding) for line in physical)
+            # hold back all lines from the start of the last logical line, which may still be continued
+            cut = len(lines) - 1
+            while cut >= 0 and (not lines[cut] or lines[cut][0] in " \t"):
+                cut -= 1
+            if cut > 0:
+                yield self._unfold_batch(lines[:cut], line_nr)
+                del lines[:cut]
+                line_nr += cut
+        if pending:
+            lines.append(pending.rstrip(b"\r").decode(encoding))
+        if lines:
+            yield self._unfold_batch(lines, line_nr)
+
+    def _unfold_batch(self, lines: List[str], line_nr: int) -> List[ContentLine]:
+        return list(
+            self.lines_to_contentlines(
+                (line_nr + nr, line) for nr, line in self.unfold_lines(lines)
+            )
+        )
+
+    async def stream_to_children(
+        self, stream: Stream, name: str, encoding: str = "utf-8"
+    ) -> AsyncIterator[ContainerItem]:
+        """
+        Incrementally parse `stream` (see `stream_to_contentlines`), which must contain exactly one top-level
+        container `name`, and yield the direct children of that container as soon as each is complete.
+        Child containers are built by `contentlines_to_container` once their END line was received.
+        """
+        child: List[
+            ContentLine
+        ] = []  # the lines of the current child container, starting with its BEGIN line
+        depth = 0
+        ended = False
+        async for batch in self.stream_to_contentlines(stream, encoding):
+            for line in batch:
+                if ended:
+                    raise ParseError(
+                        f"Expected no more content after END:{name}",
+                        line.line_nr,
+                        line=line.serialize(),
+                    )
+                if depth == 0:
+                    if line.name != "BEGIN" or line.value.upper() != name.upper():
+                        raise ParseError(
+                            f"Expected BEGIN:{name}",
+                            line.line_nr,
+                            line=line.serialize(),
+                        )
+                    depth = 1
+                    continue
+                if line.name == "BEGIN":
+                    depth += 1
+                elif line.name == "END":
+                    depth -= 1
+                if depth == 0:
+                    if line.value.upper() != name.upper():
+                        raise ParseError(f"Expected END:{name}, got END:{line.value}")
+                    ended = True
+                elif depth > 1 or child:
+                    child.append(line)
+                    if depth == 1:
+                        yield self.contentlines_to_container(
+                            child[0].value, iter(child[1:]), None, child[0].line_nr
+                        )
+                        child = []
+                else:
+                    yield line
+        if not ended:
+            raise ParseError(f"Missing {'END' if depth else 'BEGIN'}:{name}")
+
     def contentlines_to_containers(
-        self, tokenized_lines: Iterable[ContentLine]
+        self,
+        tokenized_lines: Iterable[ContentLine],
+        source: Optional[SourceText] = None,
     ) -> Iterator[ContainerItem]:
         # tokenized_lines must be an iterator, so that Container.parse can consume/steal lines
         if not isinstance(tokenized_lines, Iterator):
             tokenized_lines = iter(tokenized_lines)
         for line in tokenized_lines:
             if line.name == "BEGIN":
-                yield self.contentlines_to_container(line.value, tokenized_lines)
+                yield self.contentlines_to_container(
+                    line.value, tokenized_lines, source, line.line_nr
+                )
             else:
                 yield line
 
     def contentlines_to_container(
-        self, name: str, tokenized_lines: Iterable[ContentLine]
+        self,
+        name: str,
+        tokenized_lines: Iterable[ContentLine],
+        source: Optional[SourceText] = None,
+        begin_nr: int = -1,
     ) -> Container:
-        items: List[ContainerItem] = []
+        """
+        Build the container `name`, whose BEGIN line with number `begin_nr` was already consumed.
+        If the `source` text is given, the span of the container within it is stored in `Container.source`.
+        """
+        children = self.contentlines_to_children(name, tokenized_lines, source)
+        if source is None:
+            return Container(name, list(children))  # type: ignore[arg-type]
+        items = []
+        while True:
+            try:
+                items.append(next(children))
+            except StopIteration as stop:
+                end_nr = stop.value
+                break
+        container = Container(name, items)  # type: ignore[arg-type]
+        container.source = SourceSpan(source, begin_nr, end_nr)
+        return container
+
+    def contentlines_to_children(
+        self,
+        name: str,
+        tokenized_lines: Iterable[ContentLine],
+        source: Optional[SourceText] = None,
+    ) -> Generator[ContainerItem, None, int]:
+        """
+        Lazily yield the direct children of the container `name`, whose BEGIN line was already consumed,
+        until its matching END line is reached, and finally return the line number of the END line.
+        Nested containers are built completely before being yielded,
+        so only one direct child needs to be held in memory at once.
+        """
         if not name.isupper():
             warnings.warn(f"Container 'BEGIN:{name}' is not all-uppercase")
         for line in tokenized_lines:
             if line.name == "BEGIN":
-                items.append(
-                    self.contentlines_to_container(line.value, tokenized_lines)
+                yield self.contentlines_to_container(
+                    line.value, tokenized_lines, source, line.line_nr
                 )
             elif line.name == "END":
                 if line.value.upper() != name.upper():
                     raise ParseError(f"Expected END:{name}, got END:{line.value}")
                 if not name.isupper():
                     warnings.warn(f"Container 'END:{name}' is not all-uppercase")
-                break
+                return line.line_nr
             else:
-                items.append(line)
-        else:  # if break was not called
-            raise ParseError(f"Missing END:{name}")
-        return Container(name, items)  # type: ignore[arg-type]
+                yield line
+        raise ParseError(f"Missing END:{name}")
 
     def lines_to_contentlines(
         self, lines: Iterable[Union[Tuple[int, str], str]]
     ) -> Iterator[ContentLine]:
         clp = ContentLineParser()
+        parse = clp.parse_fast if self.fast_tokenizer else clp.parse
         for line in lines:
             if not isinstance(line, str):
                 nr, line = line
-                yield clp.parse(line, nr)
+                yield parse(line, nr)
             else:
-                yield clp.parse(line)
+                yield parse(line)
+
+
+async def iter_stream(stream: Stream) -> AsyncIterator[bytes]:
+    if isinstance(stream, asyncio.StreamReader):
+        # iterating a StreamReader yields single lines, reading larger chunks is faster
+        while True:
+            chunk = await stream.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        async for chunk in stream:
+            yield chunk
+
+
+def fast_unescape_param(string: str) -> str:
+    if "^" in string:
+        return unescape_param(string)
+    return string
 
 
 @attr.s(slots=True)
@@ -150,6 +385,54 @@ class ContentLineParser:
             assert self.delim.group() == ";"
             self.parse_param()
 
+    def parse_fast(self, line, line_nr=-1):
+        """
+        Tokenize `line` using a single match of a precompiled regular expression and only fall back to `parse`
+        for lines that would raise an error, so that both methods yield exactly the same results.
+        """
+        match = FAST_LINE.fullmatch(line)
+        if not match:
+            return self.parse(line, line_nr)
+        name, params_str, value = match.group("name", "params", "value")
+        params = ExtraParams(dict())
+        if Patterns.DQUOTE not in params_str:
+            # without quotes, there can't be any delimiters within the param values
+            unescape = "^" in params_str
+            for param in params_str.split(";")[1:]:
+                pname, _, pvals = param.partition("=")
+                if unescape:
+                    params[pname] = [fast_unescape_param(v) for v in pvals.split(",")]
+                else:
+                    params[pname] = pvals.split(",")
+        else:
+            # as the whole line matched, the params follow each other without any gaps
+            for param in FAST_PARAM.finditer(params_str):
+                pvals = param.group("pvals")
+                if Patterns.DQUOTE in pvals:
+                    params[param.group("pname")] = self.split_quoted_param_values(pvals)
+                else:
+                    params[param.group("pname")] = [
+                        fast_unescape_param(v) for v in pvals.split(",")
+                    ]
+        self.cl = ContentLine(name, params, value, line_nr)
+        if self.always_check:
+            self.check_parsed_line()
+        return self.cl
+
+    @staticmethod
+    def split_quoted_param_values(pvals: str) -> List[Union[str, QuotedParamValue]]:
+        param_values: List[Union[str, QuotedParamValue]] = []
+        pos = 0
+        while pos <= len(pvals):
+            pval = FAST_PVAL.match(pvals, pos)
+            quoted = pval.group("quoted")
+            if quoted is None:
+                param_values.append(fast_unescape_param(pval.group("raw")))
+            else:
+                param_values.append(QuotedParamValue(fast_unescape_param(quoted)))
+            pos = pval.end() + 1  # skip the comma
+        return param_values
+
     def parse_param(self):
         try:
             param_delim = self.line.index("=", self.delim.end())
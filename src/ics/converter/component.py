@@ -1,12 +1,19 @@
+import hashlib
 from collections import defaultdict
+from datetime import date, time, timedelta, tzinfo
+from types import MemberDescriptorType
 from typing import (
+    TYPE_CHECKING,
     Any,
     Callable,
     ClassVar,
     Dict,
+    FrozenSet,
     Iterable,
+    Iterator,
     List,
     Optional,
+    Set,
     Tuple,
     Type,
     cast,
@@ -15,11 +22,18 @@ from typing import (
 import attr
 from attr import Attribute
 
-from ics.component import Component
-from ics.contentline import Container
+from ics.component import Component, LazyComponentMixin
+from ics.contentline import Container, ContentLine, SerializerConfig
+from ics.contentline.container import SourceSpan, content_digest
 from ics.converter.base import AttributeConverter, GenericConverter, sort_converters
+from ics.converter.value import AttributeValueConverter
+from ics.timespan import Timespan
 from ics.types import ContainerItem, ContextDict
 from ics.utils import check_is_instance
+from ics.valuetype.datetime import DatetimeConverterMixin
+
+if TYPE_CHECKING:
+    from ics.timezone import Timezone
 
 
 @attr.s(frozen=True)
@@ -47,6 +61,14 @@ class MemberComponentConverter(AttributeConverter):
         return True
 
     def serialize(self, parent: Component, output: Container, context: ContextDict):
+        output.extend(self.serialize_iter(parent, context))
+
+    def serialize_iter(
+        self, parent: Component, context: ContextDict
+    ) -> Iterator[Container]:
+        """
+        Lazily serialize the values of the attribute one after another.
+        """
         extras = self.get_extra_params(parent)
         if extras:
             raise ValueError(
@@ -54,7 +76,84 @@ class MemberComponentConverter(AttributeConverter):
             )
         for value in self.get_value_list(parent):
             # don't force self.meta for serialization, but use the meta registered for the concrete type of value
-            output.append(value.to_container(context))
+            yield value.to_container(context)
+
+
+@attr.s(slots=True)
+class LazyProperties:
+    """
+    The raw `ContentLine`s of all attributes of a lazily populated component that were not converted yet,
+    by attribute name, together with the timezones that were available while populating the component.
+    """
+
+    lines: Dict[str, List[ContentLine]] = attr.ib(factory=dict)
+    available_tz: Dict[str, tzinfo] = attr.ib(factory=dict)
+
+    def iter_timezones(self) -> Iterator["Timezone"]:
+        for lines in self.lines.values():
+            for line in lines:
+                for tzid in line.params.get("TZID", ()):
+                    tz = resolve_timezone(self.available_tz, str(tzid))
+                    if tz is not None:
+                        yield tz
+
+
+@attr.s(slots=True, frozen=True)
+class ComponentSource:
+    """
+    The original text of a component that was parsed with `keep_source` (see `ComponentMeta`), together with
+    the digest of its mutable attribute values and the TZIDs its lines refer to when it was loaded.
+    """
+
+    name: str = attr.ib()
+    span: SourceSpan = attr.ib()
+    state: str = attr.ib()
+    tzids: FrozenSet[str] = attr.ib()
+    available_tz: Dict[str, tzinfo] = attr.ib()
+
+    def iter_timezones(self) -> Iterator["Timezone"]:
+        for tzid in self.tzids:
+            tz = resolve_timezone(self.available_tz, tzid)
+            if tz is not None:
+                yield tz
+
+
+def resolve_timezone(
+    available_tz: Dict[str, tzinfo], tzid: str
+) -> Optional["Timezone"]:
+    """
+    Get the `Timezone` a raw line with the TZID parameter `tzid` refers to,
+    in the same way as `DatetimeConverterMixin` would when converting its value.
+    As the raw line is serialized unchanged, the returned `Timezone` always has the given `tzid`.
+    """
+    from ics.timezone import Timezone
+
+    tz = available_tz.get(tzid)
+    if tz is None:
+        try:
+            resolved = Timezone.from_tzid(tzid)
+        except ValueError:
+            return None
+    else:
+        resolved = Timezone.from_tzinfo(tz)
+    if resolved is not None and resolved.tzid != tzid:
+        resolved = attr.evolve(resolved, tzid=tzid)
+    return resolved
+
+
+def collect_tzids(container: Container, tzids: Set[str]):
+    for item in container:
+        if isinstance(item, Container):
+            collect_tzids(item, tzids)
+        else:
+            tzids.update(map(str, item.params.get("TZID", ())))
+
+
+# types whose values can't be modified in-place, so that attributes of these types only change when they are assigned
+IMMUTABLE_VALUE_TYPES = (str, bytes, int, float, tuple, date, time, timedelta, Timespan)
+
+# canonical serialization of components for computing their digest, see `ComponentMeta.digest`
+DIGEST_SERIALIZER_CONFIG = SerializerConfig(line_ending="\n", fold=False)
 
 
 @attr.s(frozen=True)
@@ -63,9 +162,27 @@ class ComponentMeta:
     Meta information on how a subclass of `Component`, the `component_type`, needs to be parsed and serialized.
     All needed information is generated upon instantiation of this class and cached for later use.
     Existing instances can be looked up `BY_TYPE`.
+
+    If the context contains a truthy value for `CONTEXT_KEY_LAZY`, components are populated lazily:
+      the raw `ContentLine`s of all `lazy_converters` are only stored in the `LazyProperties` of the instance
+      and converted once the respective attribute is first accessed.
+      Lines of attributes that were never accessed are serialized again as they are, reusing the original text.
+      Note that the extra params of such an attribute are also only available once the attribute was accessed.
+      While lines are pending, the component is an instance of the `lazy_type` generated for `component_type`,
+      see `LazyComponentMixin`.
+
+    If the `Container` a component is populated from was parsed with `keep_source` (see `ParserClass.string_to_containers`),
+      the component keeps a `ComponentSource` referring to its original text. As long as no attribute of the component
+      or its sub-components is assigned, it is serialized as that text, without running any converters.
+      Values that can be modified in-place, i.e. `extra`, `extra_params` and all list attributes or values of a mutable type
+      (see `mutable_converters`), are recorded when the component is loaded and checked again before its text is reused,
+      so that in-place modifications are noticed by comparing the digests of both states (see `_value_state`).
     """
 
     BY_TYPE: ClassVar[Dict[Type, "ComponentMeta"]] = {}
+    CONTEXT_KEY_LAZY = "ComponentLazyPopulate"
+    # whether components can be serialized from their original text
+    KEEP_SOURCE: ClassVar[bool] = True
 
     component_type: Type[Component] = attr.ib()
 
@@ -74,6 +191,12 @@ class ComponentMeta:
     converter_lookup: Dict[str, Tuple[GenericConverter]]
     post_populate_hooks: Tuple[Callable]
     post_serialize_hooks: Tuple[Callable]
+    lazy_converters: Dict[str, AttributeValueConverter]
+    lazy_lookup: Dict[str, AttributeValueConverter]
+    lazy_type: Optional[Type[Component]]
+    # converters whose values are checked by `is_unmodified`, and whether their values are recorded by their repr
+    mutable_converters: Tuple[Tuple[AttributeConverter, bool], ...]
+    component_converters: Tuple[MemberComponentConverter, ...]
 
     def __attrs_post_init__(self):
         object.__setattr__(self, "converters", tuple(self.find_converters()))
@@ -101,6 +224,58 @@ class ComponentMeta:
         )
         object.__setattr__(self, "post_populate_hooks", tuple(post_populate_hooks))
         object.__setattr__(self, "post_serialize_hooks", tuple(post_serialize_hooks))
+        lazy_converters = {
+            conv.attribute.name: conv for conv in self.find_lazy_converters()
+        }
+        object.__setattr__(self, "lazy_converters", lazy_converters)
+        object.__setattr__(
+            self,
+            "lazy_lookup",
+            {conv.ics_name: conv for conv in lazy_converters.values()},
+        )
+        lazy_type = None
+        if lazy_converters:
+            lazy_type = type(
+                self.component_type.__name__,
+                (LazyComponentMixin, self.component_type),
+                {
+                    "__slots__": (),
+                    "__module__": self.component_type.__module__,
+                    "__qualname__": self.component_type.__qualname__,
+                    "__hash__": self.component_type.__hash__,
+                    "PLAIN_TYPE": self.component_type,
+                },
+            )
+            ComponentMeta.BY_TYPE[lazy_type] = self
+        object.__setattr__(self, "lazy_type", lazy_type)
+        object.__setattr__(
+            self,
+            "mutable_converters",
+            tuple(
+                (
+                    conv,
+                    all(t.__repr__ is not object.__repr__ for t in conv.value_types),
+                )
+                for conv in self.converters
+                if isinstance(conv, AttributeConverter)
+                and not isinstance(conv, MemberComponentConverter)
+                and (
+                    conv.is_multi_value
+                    or not all(
+                        issubclass(t, IMMUTABLE_VALUE_TYPES) for t in conv.value_types
+                    )
+                )
+            ),
+        )
+        object.__setattr__(
+            self,
+            "component_converters",
+            tuple(
+                conv
+                for conv in self.converters
+                if isinstance(conv, MemberComponentConverter)
+            ),
+        )
 
     def find_converters(self) -> Iterable[GenericConverter]:
         """
@@ -112,6 +287,62 @@ class ComponentMeta:
             for a in attr.fields(self.component_type)
         )
 
+    def find_lazy_converters(self) -> Iterable[AttributeValueConverter]:
+        """
+        Get all converters whose attribute can be populated lazily.
+        These are the plain `AttributeValueConverter`s of optional attributes that are stored in a slot,
+        as the conversion of their lines doesn't depend on any other lines and the slot can be left empty while they are pending.
+        """
+        for conv in self.converters:
+            if type(conv) is not AttributeValueConverter or conv.is_required:
+                continue
+            slot = self._find_slot(conv.attribute.name)[1]
+            if isinstance(slot, MemberDescriptorType):
+                yield conv
+
+    def _find_slot(self, name: str) -> Tuple[Optional[type], Any]:
+        for klass in self.component_type.__mro__:
+            if name in vars(klass):
+                return klass, vars(klass)[name]
+        return None, None
+
+    def load_lazy(self, instance: Component, name: str):
+        """
+        Convert the pending raw lines of attribute `name` of the lazily populated `instance`.
+        If the instance is unmodified, the state recorded in its `ComponentSource` is updated to include the new value.
+        """
+        lazy = instance._lazy
+        assert lazy is not None
+        source = instance._source
+        unmodified = source is not None and source.state == self._value_state(instance)
+        lines = lazy.lines.pop(name)
+        if not lazy.lines:
+            object.__setattr__(instance, "_lazy", None)
+        conv = self.lazy_converters[name]
+        default = conv.attribute.default
+        if isinstance(default, attr.Factory):  # type: ignore[arg-type]
+            default = default.factory(instance) if default.takes_self else default.factory()  # type: ignore[union-attr]
+        object.__setattr__(instance, name, default)
+        context = ContextDict(defaultdict(lambda: None))
+        context[DatetimeConverterMixin.CONTEXT_KEY_AVAILABLE_TZ] = lazy.available_tz
+        try:
+            for line in lines:
+                conv.populate(instance, line, context)
+            conv.post_populate(instance, context)
+        except Exception:
+            # keep the lines pending, so that the error is raised again on the next access
+            lazy.lines[name] = lines
+            object.__setattr__(instance, "_lazy", lazy)
+            object.__setattr__(instance, "_source", source)
+            object.__delattr__(instance, name)
+            raise
+        if not lazy.lines:
+            object.__setattr__(instance, "__class__", self.component_type)
+        if source is not None and unmodified:
+            # converting doesn't modify the component, but the new value and its extra params are part of its state
+            source = attr.evolve(source, state=self._value_state(instance))
+        object.__setattr__(instance, "_source", source)
+
     def __call__(self, attribute: Attribute) -> AttributeConverter:
         """
         Create a `AttributeConverter` for an `attribute` of type `component_type`.
@@ -146,26 +377,130 @@ class ComponentMeta:
 
         self._populate_attrs(instance, container, context)
 
+        if self.KEEP_SOURCE and container.source is not None:
+            tzids: Set[str] = set()
+            collect_tzids(container, tzids)
+            source = ComponentSource(
+                container.name,
+                container.source,
+                self._value_state(instance),
+                frozenset(tzids),
+                context.setdefault(DatetimeConverterMixin.CONTEXT_KEY_AVAILABLE_TZ, {}),
+            )
+            object.__setattr__(instance, "_source", source)
+
+    def _value_state(self, instance: Component) -> str:
+        """
+        Get a digest of all values of `instance` that could be modified in-place without assigning an attribute,
+        i.e. `extra`, `extra_params` and the already converted values of all `mutable_converters`,
+        which is used for noticing such modifications. The values are recorded by their repr,
+        except for values of types without a custom repr, which are serialized.
+        """
+        lazy = instance._lazy
+        state: List[Any] = [
+            Component.extra.peek(instance),  # type: ignore[attr-defined]
+            Component.extra_params.peek(instance),  # type: ignore[attr-defined]
+        ]
+        for conv, by_repr in self.mutable_converters:
+            if lazy is not None and conv.attribute.name in lazy.lines:
+                state.append(None)
+            elif by_repr:
+                state.append(conv.get_value(instance))
+            else:
+                output = Container(self.component_type.NAME)
+                conv.serialize(instance, output, ContextDict(defaultdict(lambda: None)))
+                state.append(output.serialize())
+        return hashlib.blake2b(repr(state).encode("utf-8"), digest_size=16).hexdigest()
+
+    def is_unmodified(
+        self, component: Component, parent: Optional[SourceSpan] = None
+    ) -> bool:
+        """
+        Check whether `component` still has its `ComponentSource` and whether it, and all its sub-components,
+        are unmodified since they were loaded (see the class documentation for the limitations).
+        """
+        source = component._source
+        if source is None or (parent is not None and not parent.contains(source.span)):
+            return False
+        if source.state != self._value_state(component):
+            return False
+        for conv in self.component_converters:
+            for value in conv.get_value_list(component):
+                if value is not None and not ComponentMeta.BY_TYPE[
+                    type(value)
+                ].is_unmodified(value, source.span):
+                    return False
+        return True
+
+    def digest(self, component: Component) -> str:
+        """
+        Get the `content_digest` of the original text of `component` if it is unmodified (see `is_unmodified`),
+        otherwise of its serialization. Neither converts the pending lines of lazily populated components.
+        """
+        source = component._source
+        if self.KEEP_SOURCE and source is not None and self.is_unmodified(component):
+            return content_digest(source.span.text())
+        container = self.serialize_toplevel(component)
+        return content_digest(container.serialize(config=DIGEST_SERIALIZER_CONFIG))
+
     def _populate_attrs(
         self, instance: Component, container: Container, context: ContextDict
     ):
-        for line in container:
-            consumed = False
-            for conv in self.converter_lookup.get(line.name, []):
-                if conv.populate(instance, line, context):
-                    consumed = True
-            if not consumed:
-                instance.extra.append(line)
+        if (
+            self.lazy_type is not None
+            and context[self.CONTEXT_KEY_LAZY]
+            and type(instance) is self.component_type
+        ):
+            lazy = LazyProperties(
+                available_tz=context.setdefault(
+                    DatetimeConverterMixin.CONTEXT_KEY_AVAILABLE_TZ, {}
+                )
+            )
+            for line in container:
+                conv = self.lazy_lookup.get(line.name)
+                if conv is None:
+                    self._populate_item(instance, line, context)
+                else:
+                    name = conv.attribute.name
+                    if name not in lazy.lines:
+                        # the slot is only empty while lines are pending, see `LazyComponentMixin`
+                        object.__delattr__(instance, name)
+                        lazy.lines[name] = []
+                    lazy.lines[name].append(line)
+            if lazy.lines:
+                object.__setattr__(instance, "_lazy", lazy)
+                object.__setattr__(instance, "__class__", self.lazy_type)
+        else:
+            for line in container:
+                self._populate_item(instance, line, context)
 
         for hook in self.post_populate_hooks:
             hook(instance, context)
 
+    def _populate_item(
+        self, instance: Component, line: ContainerItem, context: ContextDict
+    ):
+        consumed = False
+        for conv in self.converter_lookup.get(line.name, []):
+            if conv.populate(instance, line, context):
+                consumed = True
+        if not consumed:
+            instance.extra.append(line)
+
     def serialize_toplevel(
         self, component: Component, context: Optional[ContextDict] = None
     ):
         check_is_instance("instance", component, self.component_type)
         if not context:
             context = ContextDict(defaultdict(lambda: None))
+        source = component._source
+        if self.KEEP_SOURCE and source is not None and self.is_unmodified(component):
+            available_tz = context.setdefault(
+                DatetimeConverterMixin.CONTEXT_KEY_AVAILABLE_TZ, {}
+            )
+            for tz in source.iter_timezones():
+                available_tz.setdefault(tz.tzid, tz)
+            return Container.from_source(source.name, source.span)
         container = Container(
             component.extra.name
         )  # allow overwriting the name by setting the name of the extras
@@ -175,8 +510,23 @@ class ComponentMeta:
     def _serialize_attrs(
         self, component: Component, context: ContextDict, container: Container
     ):
-        for conv in self.converters:
-            conv.serialize(component, container, context)
+        lazy = component._lazy if self.lazy_converters else None
+        if lazy is None:
+            for conv in self.converters:
+                conv.serialize(component, container, context)
+        else:
+            for conv in self.converters:
+                attribute = getattr(conv, "attribute", None)
+                lines = lazy.lines.get(attribute.name) if attribute else None
+                if lines is None:
+                    conv.serialize(component, container, context)
+                else:
+                    container.extend(line.clone() for line in lines)
+            available_tz = context.setdefault(
+                DatetimeConverterMixin.CONTEXT_KEY_AVAILABLE_TZ, {}
+            )
+            for tz in lazy.iter_timezones():
+                available_tz.setdefault(tz.tzid, tz)
         container.extend(component.extra)
         for hook in self.post_serialize_hooks:
             hook(component, container, context)
@@ -187,8 +537,14 @@ class ImmutableComponentMeta(ComponentMeta):
     `ComponentMeta` for sublasses of `Component` that are should be immutable, i.e. with `@attr.s(frozen=True)`.
     To still allows easily populating these classes, a `MutablePseudoComponent` is populated instead of an instance.
     The constructor of the instance is then called with all attribute values collected by the `MutablePseudoComponent`.
+    Immutable components are always populated eagerly and serialized from their attributes.
     """
 
+    KEEP_SOURCE = False
+
+    def find_lazy_converters(self) -> Iterable[AttributeValueConverter]:
+        return ()
+
     def load_instance(
         self, container: Container, context: Optional[ContextDict] = None
     ):
@@ -1,22 +1,178 @@
+import asyncio
 import itertools
-from typing import Dict, List
+import re
+from bisect import bisect_right
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, tzinfo
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
+
+import attr
+from dateutil.tz import gettz
 
 from ics import Calendar
 from ics.component import Component
-from ics.contentline import Container
+from ics.contentline import (
+    BUFFER_TYPES,
+    Buffer,
+    Container,
+    ContentLine,
+    Parser,
+    Stream,
+    string_to_container,
+)
+from ics.contentline.container import SourceSpan, SourceText
 from ics.converter.base import GenericConverter, sort_converters
-from ics.converter.component import ComponentMeta
-from ics.timezone import Timezone
+from ics.converter.component import ComponentMeta, MemberComponentConverter
+from ics.timespan import Timespan
+from ics.timezone import Timezone, is_utc
 from ics.types import ContainerItem, ContextDict
+from ics.utils import check_is_instance
 from ics.valuetype.datetime import DatetimeConverterMixin
 
+# the available timezones of the calendar loaded by a worker process of `CalendarMeta`, see `init_member_worker`
+WORKER_TIMEZONES: Dict[str, tzinfo] = {}
+
+
+def init_member_worker(avail_tz: Dict[str, tzinfo]) -> None:
+    """Initialize a worker process of `CalendarMeta`, so that the timezones only need to be passed once."""
+    WORKER_TIMEZONES.clear()
+    WORKER_TIMEZONES.update(avail_tz)
+
+
+def load_member_components(
+    items: List[Tuple[Type[Component], Union[Container, str]]]
+) -> Tuple[List[Component], Dict[str, tzinfo]]:
+    """
+    Load the member components of a calendar, given as pairs of their type and `Container` or original text,
+    in a worker process of `CalendarMeta`.
+    The available timezones, including those that were looked up while loading, are returned together
+    with the components, so that the parent process can map them back to its own instances.
+    """
+    from ics import initialize_converters
+
+    initialize_converters()
+    context = ContextDict(defaultdict(lambda: None))
+    context[DatetimeConverterMixin.CONTEXT_KEY_AVAILABLE_TZ] = WORKER_TIMEZONES
+    components = []
+    for component_type, item in items:
+        container = string_to_container(item) if isinstance(item, str) else item
+        assert isinstance(container, Container)
+        components.append(
+            ComponentMeta.BY_TYPE[component_type].load_instance(container, context)
+        )
+    return components, WORKER_TIMEZONES
+
+
+def iter_timezones(component: Component) -> Iterator[tzinfo]:
+    """
+    Iterate over the `tzinfo`s of all datetimes within `component` and its sub-components, including the ones of timespans
+    and the timezones referred to by raw lines of lazily populated attributes, without converting them.
+    """
+    meta = ComponentMeta.BY_TYPE[type(component)]
+    source = component._source
+    if source is not None and meta.KEEP_SOURCE and meta.is_unmodified(component):
+        yield from source.iter_timezones()
+        return
+    lazy = component._lazy
+    if lazy is not None:
+        yield from lazy.iter_timezones()
+    for field in attr.fields(type(component)):
+        if lazy is not None and field.name in lazy.lines:
+            continue
+        value = getattr(component, field.name)
+        if isinstance(value, datetime):
+            if value.tzinfo is not None:
+                yield value.tzinfo
+        elif isinstance(value, Timespan):
+            for dt in (value.begin_time, value.end_time):
+                if dt is not None and dt.tzinfo is not None:
+                    yield dt.tzinfo
+        elif isinstance(value, Component):
+            yield from iter_timezones(value)
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, Component):
+                    yield from iter_timezones(item)
+
+
+def relink_timezones(component: Component, timezones: Dict[int, tzinfo]) -> None:
+    """
+    Replace the `tzinfo` of all datetimes within the attributes of `component` (and its sub-components) in-place,
+    using the mapping from the `id` of the old `tzinfo` to its replacement given in `timezones`.
+    As `component` was just unpickled, the lists and `attr` classes within it aren't shared with anything else
+    and are also modified in-place, see `relink_value`.
+    """
+    for conv in ComponentMeta.BY_TYPE[type(component)].converters:
+        field = getattr(conv, "attribute", None)
+        if field is None:
+            continue
+        value = getattr(component, field.name)
+        if value is None or isinstance(value, str):
+            continue
+        new_value = relink_value(value, timezones)
+        if new_value is not value:
+            # bypass RuntimeAttrValidation, the value was already validated when loading
+            object.__setattr__(component, field.name, new_value)
+
+
+def relink_value(value, timezones: Dict[int, tzinfo]):
+    """
+    Get `value` with all contained `tzinfo`s replaced according to `timezones`, see `relink_timezones`.
+    Components, lists and instances of `attr` classes are modified in-place, bypassing their validators,
+    while datetimes, timezones and tuples are replaced.
+    """
+    if isinstance(value, datetime):
+        new_tz = timezones.get(id(value.tzinfo))
+        return value if new_tz is None else value.replace(tzinfo=new_tz)
+    if isinstance(value, (str, int, float, bytes)) or value is None:
+        return value
+    if isinstance(value, tzinfo):
+        return timezones.get(id(value), value)
+    if isinstance(value, Component):
+        relink_timezones(value, timezones)
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            new_item = relink_value(item, timezones)
+            if new_item is not item:
+                value[index] = new_item
+    elif type(value) is tuple:
+        items = tuple(relink_value(item, timezones) for item in value)
+        if any(new is not old for new, old in zip(items, value)):
+            return items
+    elif attr.has(type(value)):
+        for field in attr.fields(type(value)):
+            item = getattr(value, field.name)
+            new_item = relink_value(item, timezones)
+            if new_item is not item:
+                object.__setattr__(value, field.name, new_item)
+    return value
+
 
 class CalendarMeta(ComponentMeta):
     """
     Slightly modified meta class for Calendars that makes sure that `Timezone`s are always loaded first
       and that all contained timezones are serialized.
+    If the context contains a number of processes for `CONTEXT_KEY_POPULATE_WORKERS`,
+      the member components (i.e. `Event` and `Todo`) are loaded in parallel by that many worker processes.
     """
 
+    CONTEXT_KEY_POPULATE_WORKERS = "CalendarPopulateWorkers"
+    KEEP_SOURCE = False
+    # number of member components each worker process loads at once
+    POPULATE_BATCH_SIZE = 500
+
     def find_converters(self):
         return sort_converters(
             itertools.chain(super().find_converters(), (CalendarTimezoneConverter(),))
@@ -26,15 +182,308 @@ class CalendarMeta(ComponentMeta):
         self, instance: Component, container: Container, context: ContextDict
     ):
         assert isinstance(instance, Calendar)
-        avail_tz: Dict[str, Timezone] = context.setdefault(
+        avail_tz = self._load_timezones(container, context)
+
+        workers = context[self.CONTEXT_KEY_POPULATE_WORKERS]
+        if not workers:
+            super()._populate_attrs(instance, container, context)
+            return
+
+        members: Dict[int, MemberComponentConverter] = {}
+        for nr, child in enumerate(container):
+            if isinstance(child, Container):
+                for conv in self.converter_lookup.get(child.name, []):
+                    if isinstance(conv, MemberComponentConverter):
+                        members[nr] = conv
+        loaded = iter(
+            self._load_members_parallel(container, members, avail_tz, workers)
+        )
+        for nr, child in enumerate(container):
+            if nr in members:
+                members[nr].set_or_append_value(instance, next(loaded))
+            else:
+                self._populate_item(instance, child, context)
+
+        for hook in self.post_populate_hooks:
+            hook(instance, context)
+
+    def _load_timezones(
+        self, container: Container, context: ContextDict
+    ) -> Dict[str, tzinfo]:
+        avail_tz: Dict[str, tzinfo] = context.setdefault(
             DatetimeConverterMixin.CONTEXT_KEY_AVAILABLE_TZ, {}
         )
         for child in container:
             if child.name == Timezone.NAME and isinstance(child, Container):
                 tz = Timezone.from_container(child)
                 avail_tz.setdefault(tz.tzid, tz)
+        return avail_tz
+
+    async def populate_async(
+        self,
+        instance: Component,
+        stream: Stream,
+        encoding: str = "utf-8",
+        context: Optional[ContextDict] = None,
+    ):
+        """
+        Populate the calendar `instance` from the raw bytes received from `stream`, see `ParserClass.stream_to_children`.
+        The children of the calendar are parsed while the data arrives. As the timezones may follow the entries
+        referring to them, the children are only populated once the whole calendar was received,
+        returning control to the event loop after each sub-component.
+        """
+        check_is_instance("instance", instance, self.component_type)
+        if not context:
+            context = ContextDict(defaultdict(lambda: None))
+        container = Container(self.component_type.NAME)
+        async for child in Parser.stream_to_children(stream, container.name, encoding):
+            container.append(child)
+        self._load_timezones(container, context)
+        await asyncio.sleep(0)
+        for child in container:
+            self._populate_item(instance, child, context)
+            if isinstance(child, Container):
+                await asyncio.sleep(0)
+        for hook in self.post_populate_hooks:
+            hook(instance, context)
+
+    def split_containers(
+        self, text: Union[str, Buffer], encoding: str = "utf-8"
+    ) -> Iterator[ContainerItem]:
+        """
+        Parse the top-level items of `text` like `ParserClass.string_to_containers`, but without tokenizing
+        the lines of member components (i.e. `Event` and `Todo`). Instead, only their BEGIN and END lines
+        are searched for and they are created using `Container.from_source`, so that `_load_members_parallel`
+        can pass their original text to the worker processes, which tokenize it in parallel.
+        """
+        members = sorted(
+            name
+            for name, convs in self.converter_lookup.items()
+            if any(isinstance(conv, MemberComponentConverter) for conv in convs)
+        )
+        # lines are matched together with the preceding line break, which is much faster than a lookbehind
+        pattern = r"[\r\n](BEGIN|END):(%s)(?=[\r\n]|\Z)" % "|".join(members)
+        if isinstance(text, str):
+            boundaries = re.compile(pattern, re.IGNORECASE)
+        else:
+            boundaries = re.compile(pattern.encode("ascii"), re.IGNORECASE)
+        source = SourceText.from_text(text, encoding)
+
+        spans: List[Tuple[int, int, str]] = []
+        current, first, depth = "", 0, 0
+        for match in boundaries.finditer(text):  # type: ignore[call-overload]
+            kind, name = (
+                group.upper() if isinstance(group, str) else group.decode().upper()
+                for group in match.groups()
+            )
+            nr = bisect_right(source.line_starts, match.start() + 1) - 1
+            if source.is_continuation(nr + 1):
+                continue  # the line is longer than it looks
+            if not depth:
+                if kind == "BEGIN":
+                    current, first, depth = name, nr, 1
+            elif name == current:
+                depth += 1 if kind == "BEGIN" else -1
+                if not depth:
+                    spans.append((first, nr, current))
+
+        def tokenize(first: int, last: int) -> Iterator[ContentLine]:
+            lines = Parser.unfold_lines(
+                Parser.string_to_lines(source.lines(first, last))
+            )
+            return Parser.lines_to_contentlines(
+                (first + nr, line) for nr, line in lines
+            )
+
+        def items() -> Iterator[Union[ContentLine, Container]]:
+            next_line = 0
+            for first, last, name in spans:
+                if next_line < first:
+                    yield from tokenize(next_line, first - 1)
+                yield Container.from_source(name, SourceSpan(source, first, last))
+                next_line = last + 1
+            if next_line < len(source.line_starts) - 1:
+                yield from tokenize(next_line, len(source.line_starts) - 2)
+
+        # the parser passes the containers of the member components through as children of the calendar
+        return Parser.contentlines_to_containers(items())  # type: ignore[arg-type]
+
+    def _load_members_parallel(
+        self,
+        container: Container,
+        members: Dict[int, MemberComponentConverter],
+        avail_tz: Dict[str, tzinfo],
+        workers: int,
+    ) -> Iterator[Component]:
+        """
+        Load the member components at the given indices of `container` in `workers` processes,
+        yielding them in their original order.
+        Components that weren't tokenized yet (see `split_containers`) are passed to the workers as their
+        original text, which is much cheaper to pickle than a `Container`.
+        As the components are passed back from the workers by pickling, their datetimes would refer to copies
+        of the timezones, so each batch is re-linked to the instances from `avail_tz` (and thereby also to
+        the process-wide timezone cache) using `relink_timezones`. Timezones first looked up by a worker are
+        added to `avail_tz`, in the same way as when loading sequentially.
+        """
+        items: List[Tuple[Type[Component], Union[Container, str]]] = []
+        for nr, conv in members.items():
+            child = container[nr]
+            assert isinstance(child, Container)
+            if child.source is not None and Container.data.peek(child) is None:  # type: ignore[attr-defined]
+                items.append((conv.meta.component_type, child.source.text()))
+            else:
+                items.append((conv.meta.component_type, child))
+        batches = [
+            items[start : start + self.POPULATE_BATCH_SIZE]
+            for start in range(0, len(items), self.POPULATE_BATCH_SIZE)
+        ]
+        with ProcessPoolExecutor(
+            workers, initializer=init_member_worker, initargs=(avail_tz,)
+        ) as executor:
+            for components, worker_tz in executor.map(load_member_components, batches):
+                timezones: Dict[int, tzinfo] = {}
+                for tzid, tz in worker_tz.items():
+                    local_tz = avail_tz.get(tzid)
+                    if local_tz is None:
+                        local_tz = avail_tz[tzid] = self._resolve_timezone(tzid, tz)
+                    timezones[id(tz)] = local_tz
+                for component in components:
+                    relink_timezones(component, timezones)
+                    yield component
+
+    @staticmethod
+    def _resolve_timezone(tzid: str, copy: tzinfo) -> tzinfo:
+        """
+        Find the instance of the timezone `tzid` in this process, given a `copy` from a worker process.
+        """
+        if isinstance(copy, Timezone):
+            try:
+                return Timezone.from_tzid(tzid)
+            except ValueError:
+                return copy
+        else:
+            return gettz(tzid) or copy
+
+    def iter_entries(
+        self,
+        file_or_lines: Union[str, Buffer, Iterable[str]],
+        context: Optional[ContextDict] = None,
+    ) -> Iterator[Component]:
+        """
+        Incrementally parse a single calendar, yielding every contained member component (i.e. `Event` and `Todo`)
+        as soon as it is fully populated, without ever building the `Container` of the whole calendar.
+        If `file_or_lines` can be re-read (i.e. it is a string, a buffer, a sequence or a seekable file), all `Timezone`s are
+        loaded in a first pass, otherwise they are only available to the entries following their definition.
+        """
+        if not context:
+            context = ContextDict(defaultdict(lambda: None))
+        for meta, child in self.iter_entry_containers(file_or_lines, context):
+            yield meta.load_instance(child, context)
+
+    def iter_entry_containers(
+        self,
+        file_or_lines: Union[str, Buffer, Iterable[str]],
+        context: ContextDict,
+    ) -> Iterator[Tuple[ComponentMeta, Container]]:
+        """
+        Incrementally parse a single calendar like `iter_entries`, but yield the `Container` of each member component
+        together with the `ComponentMeta` that would load it, instead of loading it.
+        All `Timezone`s are loaded into the available timezones of `context`.
+        """
+        avail_tz: Dict[str, tzinfo] = context.setdefault(
+            DatetimeConverterMixin.CONTEXT_KEY_AVAILABLE_TZ, {}
+        )
+        if isinstance(file_or_lines, str):
+            file_or_lines = Parser.string_to_lines(file_or_lines)
+
+        prescan = isinstance(file_or_lines, (Sequence, *BUFFER_TYPES))
+        if not prescan and callable(getattr(file_or_lines, "seekable", None)):
+            prescan = file_or_lines.seekable()  # type: ignore[union-attr]
+        if prescan:
+            start = getattr(file_or_lines, "tell", lambda: None)()
+            for child in self._iter_children(file_or_lines):
+                if child.name == Timezone.NAME and isinstance(child, Container):
+                    tz = Timezone.from_container(child)
+                    avail_tz.setdefault(tz.tzid, tz)
+            if start is not None:
+                file_or_lines.seek(start)  # type: ignore[union-attr]
+
+        for child in self._iter_children(file_or_lines):
+            if not isinstance(child, Container):
+                continue  # calendar properties are not needed for loading the entries
+            if child.name == Timezone.NAME:
+                if not prescan:
+                    tz = Timezone.from_container(child)
+                    avail_tz.setdefault(tz.tzid, tz)
+                continue
+            for conv in self.converter_lookup.get(child.name, []):
+                if isinstance(conv, MemberComponentConverter):
+                    yield conv.meta, child
+
+    def _iter_children(
+        self, lines: Union[Buffer, Iterable[str]]
+    ) -> Iterator[ContainerItem]:
+        if isinstance(lines, BUFFER_TYPES):
+            unfolded = Parser.unfold_buffer(lines)
+        else:
+            unfolded = Parser.unfold_lines(lines)
+        tokenized_lines = Parser.lines_to_contentlines(unfolded)
+        line = next(tokenized_lines, None)
+        if line is None:
+            raise ValueError("string didn't contain any ics data")
+        if line.name != "BEGIN":
+            raise ValueError(f"can't populate from {type(line)}")
+        if line.value.upper() != Calendar.NAME:
+            raise ValueError(f"container {line.value} is no {Calendar.NAME}")
+        yield from Parser.contentlines_to_children(line.value, tokenized_lines)
+        if next(tokenized_lines, None) is not None:
+            raise ValueError(
+                "Multiple calendars in one file are not supported by this method."
+                "Use ics.Calendar.parse_multiple()"
+            )
+
+    def serialize_iter(
+        self, component: Component, context: Optional[ContextDict] = None
+    ) -> Iterator[ContainerItem]:
+        """
+        Serialize `component` one top-level item after another, only creating the `Container` of each member component
+        (i.e. `Event` and `Todo`) right before it is yielded. The items are the same as the ones of `serialize_toplevel`.
+        As all used `Timezone`s need to be known before the first member component, they are collected from
+        the datetimes of all components beforehand.
+        Post-serialize hooks need to see the whole `Container`, so if there are any, it is created at once instead.
+        """
+        check_is_instance("instance", component, self.component_type)
+        if not context:
+            context = ContextDict(defaultdict(lambda: None))
+        if self.post_serialize_hooks:
+            yield from self.serialize_toplevel(component, context)
+            return
+
+        avail_tz = context.setdefault(
+            DatetimeConverterMixin.CONTEXT_KEY_AVAILABLE_TZ, {}
+        )
+        seen: Set[int] = set()
+        for used_tz in iter_timezones(component):
+            if id(used_tz) in seen:
+                continue
+            seen.add(id(used_tz))
+            if not is_utc(used_tz):
+                tz = Timezone.from_tzinfo(used_tz, context)
+                if tz is not None:
+                    avail_tz.setdefault(tz.tzid, tz)
 
-        super()._populate_attrs(instance, container, context)
+        output = Container(component.extra.name)
+        for conv in self.converters:
+            if isinstance(conv, CalendarTimezoneConverter):
+                for tz in list(avail_tz.values()):
+                    yield tz.to_container()
+            elif isinstance(conv, MemberComponentConverter):
+                yield from conv.serialize_iter(component, context)
+            else:
+                conv.serialize(component, output, context)
+                yield from output
+                output.clear()
+        yield from component.extra
 
     def _serialize_attrs(
         self, component: Component, context: ContextDict, container: Container
@@ -0,0 +1,60 @@
+from typing import Dict, List
+
+from ics.component import Component
+from ics.contentline import Container, ContentLine
+from ics.converter.base import AttributeConverter
+from ics.freebusy import FBTYPE_BUSY, BusyPeriod
+from ics.types import ContainerItem, ContextDict, ExtraParams, copy_extra_params
+from ics.valuetype.datetime import PeriodConverter
+
+
+class FreeBusyConverter(AttributeConverter):
+    """
+    Converts a list of `BusyPeriod`s from and to FREEBUSY lines, using `PeriodConverter` for the single periods.
+    All periods of the same FBTYPE are serialized as one comma-separated line.
+    Parsed periods are sorted, other parameters than FBTYPE and TZID are dropped.
+    """
+
+    @property
+    def filter_ics_names(self) -> List[str]:
+        return ["FREEBUSY"]
+
+    def populate(
+        self, component: Component, item: ContainerItem, context: ContextDict
+    ) -> bool:
+        assert isinstance(item, ContentLine)
+        params = copy_extra_params(item.params)
+        fbtypes = params.pop("FBTYPE", [FBTYPE_BUSY])
+        if len(fbtypes) != 1:
+            raise ValueError(f"multiple FBTYPE definitions in {item}")
+        for value in PeriodConverter.split_value_list(item.value):
+            period = PeriodConverter.parse(value, copy_extra_params(params), context)
+            end = period.get_effective_end()
+            assert period.begin_time is not None and end is not None
+            self.set_or_append_value(
+                component, BusyPeriod(period.begin_time, end, str(fbtypes[0]))
+            )
+        return True
+
+    def post_populate(self, component: Component, context: ContextDict):
+        self.get_value(component).sort()
+
+    def serialize(self, component: Component, output: Container, context: ContextDict):
+        values: Dict[str, List[str]] = {}
+        for period in self.get_value_list(component):
+            # the periods are in UTC, so no TZID params are needed
+            params: ExtraParams = ExtraParams({})
+            values.setdefault(period.fbtype, []).append(
+                PeriodConverter.serialize(period.timespan, params, context)
+            )
+        for fbtype, periods in values.items():
+            output.append(
+                ContentLine(
+                    "FREEBUSY",
+                    ExtraParams({"FBTYPE": [fbtype]}),
+                    PeriodConverter.join_value_list(periods),
+                )
+            )
+
+
+AttributeConverter.BY_TYPE[BusyPeriod] = FreeBusyConverter
@@ -51,7 +51,7 @@ def deterministic_event_data(
         default_dtstamp_factory.reset(dtstamp_token)
 
 
-@attr.s(eq=True, order=False)
+@attr.s(eq=True, order=False, slots=True)
 class CalendarEntryAttrs(Component):
     timespan: Timespan = attr.ib()
     summary: Optional[str] = attr.ib(default=None)
@@ -79,6 +79,12 @@ class CalendarEntryAttrs(Component):
             if child_cmp != parent_cmp:
                 raise TypeError(f"{child_cmp} may not overwrite {parent_cmp}")
 
+    def _attribute_assigned(self, key: str):
+        super()._attribute_assigned(key)
+        if key == "timespan":
+            # invalidates the Timeline index of the calendars containing this entry
+            self._notify_owners()
+
     @timespan.validator
     def validate_timespan(self, attr, value):
         check_is_instance(attr, value, self._TIMESPAN_TYPE)
@@ -248,7 +254,9 @@ class CalendarEntryAttrs(Component):
         return self.timespan.is_included_in(get_timespan_if_calendar_entry(second))
 
 
-@attr.s(eq=True, order=False)  # order methods are provided by CalendarEntryAttrs
+@attr.s(
+    eq=True, order=False, slots=True
+)  # order methods are provided by CalendarEntryAttrs
 class EventAttrs(CalendarEntryAttrs):
     classification: Optional[str] = attr.ib(
         default=None, validator=v_optional(instance_of(str))
@@ -283,6 +291,9 @@ class Event(EventAttrs):
     :class:`ics.parse.ContentLine` to `.extra`
     """
 
+    # allow setting arbitrary attributes, the `__dict__` is only created when that is actually done
+    __slots__ = ("__dict__",)
+
     NAME = "VEVENT"
     _TIMESPAN_TYPE: ClassVar[Type[Timespan]] = EventTimespan
 
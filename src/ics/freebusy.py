@@ -0,0 +1,189 @@
+import itertools
+from datetime import datetime, timedelta, tzinfo
+from operator import itemgetter
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Tuple
+
+import attr
+from attr.validators import instance_of
+from attr.validators import optional as v_optional
+
+from ics.attendee import Attendee, Organizer
+from ics.component import Component
+from ics.event import Event, default_dtstamp_factory, default_uid_factory
+from ics.timeline import Timeline
+from ics.timespan import Timespan
+from ics.timezone import UTC, ensure_utc
+from ics.types import DatetimeLike
+from ics.utils import ensure_datetime, validate_not_none
+
+if TYPE_CHECKING:
+    from ics.icalendar import Calendar
+
+__all__ = [
+    "FBTYPE_BUSY",
+    "FBTYPE_BUSY_TENTATIVE",
+    "FBTYPE_BUSY_UNAVAILABLE",
+    "FBTYPE_FREE",
+    "BusyPeriod",
+    "FreeBusy",
+    "busy_type",
+    "iter_busy_periods",
+    "merge_busy_periods",
+]
+
+FBTYPE_FREE = "FREE"
+FBTYPE_BUSY = "BUSY"
+FBTYPE_BUSY_TENTATIVE = "BUSY-TENTATIVE"
+FBTYPE_BUSY_UNAVAILABLE = "BUSY-UNAVAILABLE"
+# busy types from weakest to strongest, the strongest one wins where busy periods overlap
+FBTYPE_RANKS = {
+    fbtype: rank
+    for rank, fbtype in enumerate(
+        (FBTYPE_BUSY_TENTATIVE, FBTYPE_BUSY, FBTYPE_BUSY_UNAVAILABLE)
+    )
+}
+FBTYPES_BY_RANK = sorted(FBTYPE_RANKS, key=FBTYPE_RANKS.__getitem__)
+# queries are widened by this, so that floating times are found in any timezone
+MAX_UTC_OFFSET = timedelta(days=1)
+
+
+@attr.s(frozen=True, slots=True, order=True)
+class BusyPeriod:
+    """
+    A period between `begin` and `end` (both in UTC) of the free/busy type `fbtype`, as stored in a FREEBUSY property.
+    """
+
+    begin: datetime = attr.ib(converter=ensure_utc)  # type: ignore[misc]
+    end: datetime = attr.ib(converter=ensure_utc)  # type: ignore[misc]
+    fbtype: str = attr.ib(default=FBTYPE_BUSY, validator=instance_of(str))
+
+    @end.validator
+    def _validate_end(self, attribute, value):
+        if value < self.begin:
+            raise ValueError(f"BusyPeriod end {value} is before its begin {self.begin}")
+
+    @property
+    def timespan(self) -> Timespan:
+        return Timespan(begin_time=self.begin, end_time=self.end)
+
+
+def busy_type(event: Event) -> Optional[str]:
+    """
+    Get the free/busy type of the time taken by `event`, or None if it doesn't take any time,
+    i.e. if it is transparent (TRANSP:TRANSPARENT) or cancelled.
+    """
+    if event.transparent or event.status == "CANCELLED":
+        return None
+    if event.status == "TENTATIVE":
+        return FBTYPE_BUSY_TENTATIVE
+    return FBTYPE_BUSY
+
+
+def localize(value: datetime, tz: tzinfo) -> datetime:
+    return value.replace(tzinfo=tz) if value.tzinfo is None else value
+
+
+def iter_busy_periods(
+    calendars: Iterable["Calendar"],
+    start: DatetimeLike,
+    stop: DatetimeLike,
+    tz: tzinfo = UTC,
+) -> Iterator[BusyPeriod]:
+    """
+    Yield a `BusyPeriod` for each event (and each occurrence of recurring events) of `calendars`
+    that takes time between `start` and `stop`, clipped to that range.
+    Floating times, all-day events and a naive `start` or `stop` are interpreted in the timezone `tz`.
+    The periods are neither sorted nor merged, see `merge_busy_periods`.
+    """
+    start = localize(ensure_datetime(start), tz)
+    stop = localize(ensure_datetime(stop), tz)
+    for calendar in calendars:
+        timeline = Timeline(calendar, None, expand_recurrences=True)
+        for event in timeline.overlapping(
+            start - MAX_UTC_OFFSET, stop + MAX_UTC_OFFSET
+        ):
+            fbtype = busy_type(event)
+            if fbtype is None:
+                continue
+            timespan = event.timespan
+            begin, end = timespan.get_begin(), timespan.get_effective_end()
+            if begin is None:
+                continue
+            if end is None:
+                end = begin + timedelta(days=1 if timespan.is_all_day() else 0)
+            begin, end = max(localize(begin, tz), start), min(localize(end, tz), stop)
+            if begin < end:
+                yield BusyPeriod(begin, end, fbtype)
+
+
+def merge_busy_periods(periods: Iterable[BusyPeriod]) -> List[BusyPeriod]:
+    """
+    Merge overlapping and adjacent `periods` into a sorted list of disjoint periods,
+    using a sweep over the sorted begins and ends in O(n log n).
+    Where periods of different types overlap, the strongest type wins (see `FBTYPE_RANKS`).
+    FREE periods are ignored, unknown types are treated as BUSY as required by RFC 5545.
+    """
+    points: List[Tuple[datetime, int, int]] = []
+    for period in periods:
+        if period.fbtype == FBTYPE_FREE or period.begin >= period.end:
+            continue
+        rank = FBTYPE_RANKS.get(period.fbtype, FBTYPE_RANKS[FBTYPE_BUSY])
+        points.append((period.begin, rank, 1))
+        points.append((period.end, rank, -1))
+    points.sort(key=itemgetter(0))
+
+    active = [0] * len(FBTYPE_RANKS)
+    merged: List[BusyPeriod] = []
+    current: Optional[Tuple[datetime, int]] = None  # begin and rank of the open period
+    for instant, changes in itertools.groupby(points, key=itemgetter(0)):
+        for _, rank, delta in changes:
+            active[rank] += delta
+        top = max((rank for rank, count in enumerate(active) if count), default=None)
+        if current is not None:
+            if current[1] == top:
+                continue
+            merged.append(BusyPeriod(current[0], instant, FBTYPES_BY_RANK[current[1]]))
+        current = None if top is None else (instant, top)
+    return merged
+
+
+@attr.s(slots=True)
+class FreeBusy(Component):
+    """
+    A VFREEBUSY component, listing the `busy` periods of the `attendees` between `begin` and `end`.
+    Use `from_calendars` to compute it from the events of one or many calendars.
+    """
+
+    NAME = "VFREEBUSY"
+
+    uid: str = attr.ib(factory=lambda: default_uid_factory.get()())
+    dtstamp: datetime = attr.ib(factory=lambda: default_dtstamp_factory.get()(), converter=ensure_utc, validator=validate_not_none)  # type: ignore[misc]
+    begin: Optional[datetime] = attr.ib(default=None, converter=ensure_utc, metadata={"ics_name": "DTSTART"})  # type: ignore[misc]
+    end: Optional[datetime] = attr.ib(default=None, converter=ensure_utc, metadata={"ics_name": "DTEND"})  # type: ignore[misc]
+    organizer: Optional[Organizer] = attr.ib(
+        default=None, validator=v_optional(instance_of(Organizer))
+    )
+    attendees: List[Attendee] = attr.ib(
+        factory=list, converter=list, metadata={"ics_name": "ATTENDEE"}
+    )
+    busy: List[BusyPeriod] = attr.ib(
+        factory=list, converter=list, metadata={"ics_name": "FREEBUSY"}
+    )
+
+    @classmethod
+    def from_calendars(
+        cls,
+        calendars: Iterable["Calendar"],
+        start: DatetimeLike,
+        stop: DatetimeLike,
+        tz: tzinfo = UTC,
+        **kwargs,
+    ) -> "FreeBusy":
+        """
+        Get the merged busy periods of all events of `calendars` between `start` and `stop`,
+        see `iter_busy_periods` and `merge_busy_periods`. All other arguments are passed to the constructor.
+        """
+        start = localize(ensure_datetime(start), tz)
+        stop = localize(ensure_datetime(stop), tz)
+        busy = merge_busy_periods(iter_busy_periods(calendars, start, stop, tz))
+        return cls(begin=start, end=stop, busy=busy, **kwargs)
@@ -1,15 +1,139 @@
+import asyncio
+import hashlib
+import io
+import itertools
+import os
+import re
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from datetime import tzinfo
-from typing import ClassVar, Iterable, Iterator, List, Optional, Union, overload
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    ClassVar,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    overload,
+)
 
 import attr
 from attr.validators import instance_of
 
 from ics.component import Component
-from ics.contentline import Container, lines_to_containers, string_to_containers
+from ics.contentline import (
+    BUFFER_TYPES,
+    Buffer,
+    Container,
+    SerializerConfig,
+    Stream,
+    buffer_to_containers,
+    lines_to_containers,
+    string_to_containers,
+)
+from ics.contentline.container import default_serializer_config
 from ics.event import Event
 from ics.timeline import Timeline
 from ics.timespan import Normalization, NormalizationAction
 from ics.todo import Todo
+from ics.types import ContextDict, VersionedList
+
+if TYPE_CHECKING:
+    from ics.table import EventTable
+
+CALENDAR_BOUNDARY = re.compile(r"^BEGIN:VCALENDAR\r?$", re.IGNORECASE | re.MULTILINE)
+BYTES_CALENDAR_BOUNDARY = re.compile(
+    CALENDAR_BOUNDARY.pattern.encode("ascii"), CALENDAR_BOUNDARY.flags & ~re.UNICODE
+)
+
+
+def split_calendars(source: Union[str, bytes]) -> List[Union[str, bytes]]:
+    """
+    Split raw ics data into chunks that each contain one top-level VCALENDAR.
+    As VCALENDARs can't be nested, every BEGIN:VCALENDAR line starts a new chunk.
+    """
+    if isinstance(source, str):
+        boundary = CALENDAR_BOUNDARY
+    elif isinstance(source, bytes):
+        boundary = BYTES_CALENDAR_BOUNDARY
+    else:
+        raise TypeError(f"can't split {type(source)}, expected str or bytes")
+    starts = [m.start() for m in boundary.finditer(source)]
+    if not starts:
+        return [source]
+    starts[0] = 0
+    ends = starts[1:] + [len(source)]
+    return [source[start:end] for start, end in zip(starts, ends)]
+
+
+@attr.s(frozen=True)
+class CalendarParseResult:
+    """
+    Result of parsing one of the calendars contained in the source with index `source` passed to `Calendar.parse_many`.
+    `position` is the index of the calendar within its source.
+    Either `calendar` is the parsed calendar or `error` is the exception that occurred while parsing it.
+    """
+
+    source: int = attr.ib()
+    position: int = attr.ib()
+    calendar: Optional["Calendar"] = attr.ib(default=None)
+    error: Optional[BaseException] = attr.ib(default=None)
+
+
+def parse_calendar(
+    cls: Type["Calendar"], source: int, position: int, chunk: Union[str, bytes]
+) -> CalendarParseResult:
+    """
+    Worker function of `Calendar.parse_many`.
+    Exceptions are caught in the worker and returned as part of the result, as some of them
+    (e.g. the frozen :class:`ics.contentline.ParseError`) can't be passed back with their traceback.
+    """
+    try:
+        return CalendarParseResult(source, position, cls(chunk))
+    except Exception as e:
+        return CalendarParseResult(source, position, error=e)
+
+
+@attr.s(frozen=True)
+class CalendarDiff:
+    """
+    Result of `Calendar.diff`: the UIDs of the events and todos that were `added`, `removed` or `changed`.
+    """
+
+    added: FrozenSet[str] = attr.ib(factory=frozenset)
+    removed: FrozenSet[str] = attr.ib(factory=frozenset)
+    changed: FrozenSet[str] = attr.ib(factory=frozenset)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+def uid_digests(components: Iterable[Union[Event, Todo]]) -> Dict[str, str]:
+    """
+    Map the UID of each component to its `Component.digest`.
+    Components sharing a UID (e.g. modified instances of a recurring event) are combined into one digest,
+    which doesn't depend on their order.
+    """
+    digests: Dict[str, str] = {}
+    shared: Dict[str, List[str]] = {}
+    for component in components:
+        uid, digest = component.uid, component.digest()
+        if uid in shared:
+            shared[uid].append(digest)
+        elif uid in digests:
+            shared[uid] = [digests[uid], digest]
+        else:
+            digests[uid] = digest
+    for uid, values in shared.items():
+        combined = "".join(sorted(values)).encode("ascii")
+        digests[uid] = hashlib.blake2b(combined, digest_size=16).hexdigest()
+    return digests
 
 
 @attr.s
@@ -25,7 +149,7 @@ class CalendarAttrs(Component):
     # CalendarTimezoneConverter has priority 600
 
     events: List[Event] = attr.ib(
-        factory=list, converter=list, metadata={"ics_priority": -100}
+        factory=VersionedList, converter=VersionedList, metadata={"ics_priority": -100}
     )
     todos: List[Todo] = attr.ib(
         factory=list, converter=list, metadata={"ics_priority": -200}
@@ -47,22 +171,38 @@ class Calendar(CalendarAttrs):
     NAME = "VCALENDAR"
     DEFAULT_VERSION: ClassVar[str] = "2.0"
     DEFAULT_PRODID: ClassVar[str] = "ics.py 0.8.0.dev0 - http://git.io/lLljaA"
+    PARSE_MANY_PENDING_PER_WORKER: ClassVar[int] = 2
 
     def __init__(
         self,
-        imports: Union[str, Container, None] = None,
+        imports: Union[str, Buffer, Container, None] = None,
         events: Optional[Iterable[Event]] = None,
         todos: Optional[Iterable[Todo]] = None,
         creator: str = None,
+        workers: Optional[int] = None,
+        lazy: bool = False,
+        keep_source: bool = False,
         **kwargs,
     ):
         """Initializes a new Calendar.
 
         Args:
             imports (**str**): data to be imported into the Calendar,
+                can also be the raw bytes of an ics file, e.g. a memory-mapped `mmap.mmap`
             events (**Iterable[Event]**): `Event` to be added to the calendar
             todos (**Iterable[Todo]**): `Todo` to be added to the calendar
             creator (**string**): uid of the creator program.
+            workers (**int**): number of processes used for tokenizing and loading the events and todos of `imports`
+                in parallel, which is experimental. The current process still needs to find the entries in `imports`
+                and to unpickle and re-link the loaded ones, which took about 19% of the time of loading 20000 events
+                sequentially, so that at most a speed-up of about 5x is possible. With a single worker, loading took
+                8% longer than sequentially. By default, everything is loaded in the current process.
+            lazy (**bool**): only convert the simple properties of events and todos once they are first accessed,
+                and serialize the ones that were never accessed as they were read, see `ComponentMeta`.
+                Doesn't apply to entries loaded by `workers`.
+            keep_source (**bool**): keep the original text of the events and todos in `imports` (if they are
+                a string or buffer) and serialize the ones that were not modified exactly as they were read,
+                see `ComponentMeta` for how modifications are detected.
         """
         if events is None:
             events = tuple()
@@ -76,18 +216,39 @@ class Calendar(CalendarAttrs):
         self.timeline = Timeline(self, None)
 
         if imports is not None:
+            context = None
+            if workers or lazy:
+                from ics import initialize_converters
+
+                initialize_converters()
+                from ics.converter.component import ComponentMeta
+                from ics.converter.types.calendar import CalendarMeta
+
+                context = ContextDict(defaultdict(lambda: None))
+                context[CalendarMeta.CONTEXT_KEY_POPULATE_WORKERS] = workers
+                context[CalendarMeta.CONTEXT_KEY_LAZY] = lazy
             if isinstance(imports, Container):
-                self.populate(imports)
+                self.populate(imports, context)
             else:
-                if isinstance(imports, str):
-                    containers = iter(string_to_containers(imports))
+                if workers and isinstance(imports, (str, *BUFFER_TYPES)):
+                    # only tokenize the entries in the worker processes
+                    meta = ComponentMeta.BY_TYPE[Calendar]
+                    containers = iter(meta.split_containers(imports))  # type: ignore[attr-defined]
+                elif isinstance(imports, str):
+                    containers = iter(
+                        string_to_containers(imports, keep_source=keep_source)
+                    )
+                elif isinstance(imports, BUFFER_TYPES):
+                    containers = iter(
+                        buffer_to_containers(imports, keep_source=keep_source)
+                    )
                 else:
                     containers = iter(lines_to_containers(imports))
                 try:
                     container = next(containers)
                     if not isinstance(container, Container):
                         raise ValueError(f"can't populate from {type(container)}")
-                    self.populate(container)
+                    self.populate(container, context)
                 except StopIteration:
                     raise ValueError("string didn't contain any ics data")
                 try:
@@ -107,6 +268,15 @@ class Calendar(CalendarAttrs):
     def creator(self, value: str):
         self.prodid = value
 
+    def to_table(self) -> "EventTable":
+        """
+        Get a columnar :class:`ics.table.EventTable` of all events in this Calendar.
+        Use :meth:`ics.table.EventTable.parse` to build the table directly from a file without creating any events.
+        """
+        from ics.table import EventTable
+
+        return EventTable.from_events(self.events)
+
     @classmethod
     def parse_multiple(cls, string):
         """ "
@@ -116,8 +286,136 @@ class Calendar(CalendarAttrs):
         containers = string_to_containers(string)
         return [cls(imports=c) for c in containers]
 
+    @classmethod
+    def parse_many(
+        cls,
+        sources: Iterable[Union[str, bytes]],
+        workers: Optional[int] = None,
+        ordered: bool = True,
+    ) -> Iterator[CalendarParseResult]:
+        """
+        Parses many sources, each containing one or more calendars, in parallel using a pool of `workers` processes
+        (by default, one per CPU) and yields a :class:`CalendarParseResult` for every calendar.
+        Results are yielded in the order of the sources and the calendars within them,
+        or in the order they become available if `ordered` is False.
+        Errors are reported in the respective result instead of being raised, so that one broken source doesn't fail all others.
+        At most `PARSE_MANY_PENDING_PER_WORKER` calendars per worker are submitted to the pool at once,
+        so that `sources` may also be a lazy iterable over more data than fits into memory.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        max_pending = cls.PARSE_MANY_PENDING_PER_WORKER * workers
+        pending: Dict[Future, Tuple[int, int]] = {}
+
+        def collect() -> Iterator[CalendarParseResult]:
+            if ordered:
+                done: Iterable[Future] = [next(iter(pending))]
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                source_nr, position = pending.pop(future)
+                try:
+                    yield future.result()
+                except Exception as e:
+                    yield CalendarParseResult(source_nr, position, error=e)
+
+        with ProcessPoolExecutor(workers) as executor:
+            for source_nr, source in enumerate(sources):
+                try:
+                    chunks = split_calendars(source)
+                except Exception as e:
+                    failed: Future = Future()
+                    failed.set_result(CalendarParseResult(source_nr, 0, error=e))
+                    pending[failed] = (source_nr, 0)
+                    continue
+                for position, chunk in enumerate(chunks):
+                    while len(pending) >= max_pending:
+                        yield from collect()
+                    future = executor.submit(
+                        parse_calendar, cls, source_nr, position, chunk
+                    )
+                    pending[future] = (source_nr, position)
+            while pending:
+                yield from collect()
+
+    @classmethod
+    async def load_async(
+        cls,
+        stream: Stream,
+        encoding: str = "utf-8",
+        lazy: bool = False,
+        **kwargs,
+    ) -> "Calendar":
+        """
+        Asynchronously load a single calendar from the raw bytes received from `stream`,
+        an `asyncio.StreamReader` or any async iterable of byte chunks.
+        The data is parsed while it arrives and control is returned to the event loop after loading each
+        event, todo or timezone, so that loading a huge calendar doesn't block other tasks.
+        `lazy` and all other arguments are the same as for the constructor.
+        """
+        from ics import initialize_converters
+
+        initialize_converters()
+        from ics.converter.component import ComponentMeta
+
+        calendar = cls(**kwargs)
+        context = ContextDict(defaultdict(lambda: None))
+        context[ComponentMeta.CONTEXT_KEY_LAZY] = lazy
+        await ComponentMeta.BY_TYPE[cls].populate_async(  # type: ignore[attr-defined]
+            calendar, stream, encoding, context
+        )
+        return calendar
+
+    @classmethod
+    def iter_events(
+        cls,
+        file_or_lines: Union[str, Buffer, Iterable[str]],
+        context: Optional[ContextDict] = None,
+        lazy: bool = False,
+    ) -> Iterator[Union[Event, Todo]]:
+        """
+        Incrementally parses a single calendar from a string, a text file object or any other iterable of lines,
+        or from the raw bytes of an ics file (e.g. a memory-mapped `mmap.mmap`)
+        and yields every contained :class:`ics.event.Event` and :class:`ics.todo.Todo` once it is fully populated.
+
+        In contrast to the constructor, the whole calendar is never held in memory at once,
+        so memory usage is bounded by the largest single component.
+        All properties of the calendar itself are skipped.
+        If the input is seekable, all `VTIMEZONE` definitions are read in a first pass,
+        otherwise they only apply to the entries following them.
+        With `lazy`, simple properties are only converted once they are accessed, see `Calendar.__init__`.
+        """
+        from ics import initialize_converters
+
+        initialize_converters()
+        from ics.converter.component import ComponentMeta
+
+        if lazy:
+            if not context:
+                context = ContextDict(defaultdict(lambda: None))
+            context[ComponentMeta.CONTEXT_KEY_LAZY] = True
+        return ComponentMeta.BY_TYPE[cls].iter_entries(file_or_lines, context)  # type: ignore[attr-defined]
+
+    def diff(self, other: "Calendar") -> CalendarDiff:
+        """
+        Compare the events and todos of this calendar with those of `other` (e.g. a newer version of the same feed)
+        by their UID and return which were added to, removed from or changed in `other`.
+        Entries are compared by their `Component.digest`, so this takes linear time and never compares
+        any properties one by one. Parse both calendars with `keep_source` and `lazy` to also avoid converting
+        the properties of unchanged entries at all.
+        """
+        old = uid_digests(itertools.chain(self.events, self.todos))
+        new = uid_digests(itertools.chain(other.events, other.todos))
+        return CalendarDiff(
+            added=frozenset(new.keys() - old.keys()),
+            removed=frozenset(old.keys() - new.keys()),
+            changed=frozenset(
+                uid for uid, digest in new.items() if old.get(uid, digest) != digest
+            ),
+        )
+
     @overload
-    def normalize(self, normalization: Normalization):
+    def normalize(self, normalization: Normalization, *, in_place: bool = False):
         ...
 
     @overload
@@ -126,10 +424,18 @@ class Calendar(CalendarAttrs):
         value: tzinfo,
         normalize_floating: NormalizationAction,
         normalize_with_tz: NormalizationAction,
+        *,
+        in_place: bool = False,
     ):
         ...
 
-    def normalize(self, normalization, *args, **kwargs):
+    def normalize(self, normalization, *args, in_place=False, **kwargs):
+        """
+        Normalize the timespans of all events and todos, see `Normalization.normalize_timespans`.
+        All-day entries are left unchanged.
+        If `in_place` is set, the existing timespans are modified without creating and validating new ones,
+        which is considerably faster for large calendars.
+        """
         if isinstance(normalization, Normalization):
             if args or kwargs:
                 raise ValueError(
@@ -137,12 +443,17 @@ class Calendar(CalendarAttrs):
                 )
         else:
             normalization = Normalization(normalization, *args, **kwargs)
-        self.events = [
-            e if e.all_day else normalization.normalize(e) for e in self.events
-        ]
-        self.todos = [
-            e if e.all_day else normalization.normalize(e) for e in self.todos
-        ]
+        for entries in (self.events, self.todos):
+            timespans = normalization.normalize_timespans(
+                (e.timespan for e in entries), in_place=in_place
+            )
+            if not in_place:
+                for entry, timespan in zip(entries, timespans):
+                    entry.timespan = timespan
+            else:
+                # the timespans changed without being assigned, so invalidate the indices manually
+                for entry in entries:
+                    entry._notify_owners()
 
     def __str__(self) -> str:
         return "<Calendar with {} event{} and {} todo{}>".format(
@@ -152,6 +463,67 @@ class Calendar(CalendarAttrs):
             "" if len(self.todos) == 1 else "s",
         )
 
+    def serialize_iter(
+        self,
+        context: Optional[ContextDict] = None,
+        config: Optional[SerializerConfig] = None,
+    ) -> Iterator[str]:
+        """
+        Lazily serializes the calendar, yielding one string per top-level property or component.
+        Joined together, these are the same as the output of `serialize`,
+        but the whole calendar is never held in memory at once.
+        """
+        from ics import initialize_converters
+
+        initialize_converters()
+        from ics.converter.component import ComponentMeta
+
+        meta = ComponentMeta.BY_TYPE[type(self)]
+        if config is None:
+            config = default_serializer_config.get()
+        line_ending = "\r\n" if config is None else config.line_ending
+        yield f"BEGIN:{self.extra.name}{line_ending}"
+        for item in meta.serialize_iter(self, context):  # type: ignore[attr-defined]
+            yield "".join(item.serialize_iter(newline=True, config=config))
+        yield f"END:{self.extra.name}"
+
+    def dump(
+        self,
+        fp: IO,
+        context: Optional[ContextDict] = None,
+        encoding: str = "utf-8",
+        config: Optional[SerializerConfig] = None,
+    ):
+        """
+        Serializes the calendar directly to the writable text or binary file object `fp`,
+        without building the whole serialized string in memory first (see `serialize_iter`).
+        Binary files are written using `encoding`.
+        """
+        binary = isinstance(fp, (io.RawIOBase, io.BufferedIOBase)) or "b" in getattr(
+            fp, "mode", ""
+        )
+        for chunk in self.serialize_iter(context, config):
+            fp.write(chunk.encode(encoding) if binary else chunk)
+
+    async def dump_async(
+        self,
+        writer: asyncio.StreamWriter,
+        context: Optional[ContextDict] = None,
+        encoding: str = "utf-8",
+        config: Optional[SerializerConfig] = None,
+    ):
+        """
+        Asynchronously serialize the calendar to `writer`, an `asyncio.StreamWriter` or any other object
+        with a `write(bytes)` method and an awaitable `drain()` method.
+        Each chunk of `serialize_iter` is written using `encoding` and followed by `await writer.drain()`,
+        so that writing waits while the transport's buffer is full, and control is returned to the event loop
+        after every top-level property or component.
+        """
+        for chunk in self.serialize_iter(context, config):
+            writer.write(chunk.encode(encoding))
+            await writer.drain()
+            await asyncio.sleep(0)
+
     def __iter__(self) -> Iterator[str]:
         """Returns:
         iterable: an iterable version of __str__, line per line
@@ -163,4 +535,5 @@ class Calendar(CalendarAttrs):
             >>> c = Calendar(); c.events.append(Event(summary="My cool event"))
             >>> open('my.ics', 'w').writelines(c)
         """
-        return iter(self.serialize().splitlines(keepends=True))
+        for chunk in self.serialize_iter():
+            yield from chunk.splitlines(keepends=True)
@@ -0,0 +1,437 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import attr
+
+from ics.contentline import Buffer, Container
+from ics.event import Event
+from ics.timespan import CMP_NORMALIZATION, EventTimespan, Timespan
+from ics.timezone import UTC
+from ics.types import ContextDict, DatetimeLike
+from ics.utils import ensure_datetime
+
+if TYPE_CHECKING:
+    from ics.converter.base import AttributeConverter
+
+try:
+    import numpy
+except ImportError:
+    numpy = None  # type: ignore[assignment]
+
+__all__ = ["NULL_TIME", "StringColumn", "EventTable", "to_epoch_us", "from_epoch_us"]
+
+# value of the time columns for events without begin or end, smaller than all other values
+NULL_TIME = -(2**63)
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+ONE_US = timedelta(microseconds=1)
+
+
+def to_epoch_us(instant: Optional[datetime]) -> int:
+    """
+    Convert `instant` to microseconds since the epoch, treating floating times as local times like `Timeline` does.
+    `None` is converted to `NULL_TIME`.
+    """
+    if instant is None:
+        return NULL_TIME
+    return (CMP_NORMALIZATION.normalize(instant) - EPOCH) // ONE_US
+
+
+def from_epoch_us(value: int) -> Optional[datetime]:
+    """Convert microseconds since the epoch back to an UTC `datetime`, or `None` for `NULL_TIME`."""
+    if value == NULL_TIME:
+        return None
+    return EPOCH + timedelta(microseconds=value)
+
+
+@attr.s(slots=True, repr=False)
+class StringColumn:
+    """
+    Dictionary-encoded column of optional strings.
+    Every distinct string is only stored once in `values`, rows store the index of their value in `codes`.
+    The code 0 always represents `None`.
+    """
+
+    codes: array = attr.ib(factory=lambda: array("l"))
+    values: List[Optional[str]] = attr.ib(factory=lambda: [None])
+    _lookup: Dict[Optional[str], int] = attr.ib(init=False, eq=False)
+
+    @_lookup.default
+    def _make_lookup(self):
+        return {value: code for code, value in enumerate(self.values)}
+
+    def code_of(self, value: Optional[str]) -> int:
+        """Get the code of `value`, adding it to the dictionary if it is new."""
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def append(self, value: Optional[str]):
+        self.codes.append(self.code_of(value))
+
+    def take(self, indices: Iterable[int]) -> "StringColumn":
+        """Create a column containing the rows at `indices`, sharing the dictionary of values."""
+        codes = self.codes
+        return StringColumn(array("l", [codes[i] for i in indices]), self.values)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        return self.values[self.codes[index]]
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        values = self.values
+        return (values[code] for code in self.codes)
+
+    def __repr__(self):
+        return f"StringColumn({list(self)!r})"
+
+
+class EventRowLoader:
+    """
+    Loads only the properties of a VEVENT `Container` that are stored in an `EventTable`,
+    using the same `AttributeConverter`s as `Event`, but without creating `Event` instances.
+    """
+
+    _TIMESPAN_TYPE = EventTimespan
+
+    def __init__(self, attributes: Iterable[str]):
+        from ics import initialize_converters
+
+        initialize_converters()
+        from ics.converter.component import ComponentMeta
+
+        meta = ComponentMeta.BY_TYPE[Event]
+        attributes = set(attributes)
+        self.converters: List["AttributeConverter"] = [
+            conv
+            for conv in meta.converters
+            if getattr(conv, "attribute", None) is not None
+            and conv.attribute.name in attributes
+        ]
+        self.lookup: Dict[str, List["AttributeConverter"]] = defaultdict(list)
+        for conv in self.converters:
+            for name in conv.filter_ics_names:
+                self.lookup[name].append(conv)
+
+    def load(self, container: Container, context: ContextDict) -> Dict[str, Any]:
+        """Get the values of the loaded attributes of the event in `container`, keyed by attribute name."""
+        row = EventRow()
+        for line in container:
+            for conv in self.lookup.get(line.name, ()):
+                conv.populate(row, line, context)  # type: ignore[arg-type]
+        for conv in self.converters:
+            conv.post_populate(row, context)  # type: ignore[arg-type]
+            converter = conv.attribute.converter
+            value = getattr(row, conv.attribute.name, None)
+            if converter is not None and value is not None:
+                setattr(row, conv.attribute.name, converter(value))
+        return row.__dict__
+
+
+class EventRow:
+    """Stand-in for an `Event`, on which the `AttributeConverter`s of `EventRowLoader` store their values."""
+
+    _TIMESPAN_TYPE = EventTimespan
+
+    def __init__(self):
+        self.extra_params: Dict[str, Any] = {}
+
+
+@attr.s(slots=True, repr=False)
+class EventTable:
+    """
+    Columnar representation of many events for analytic workloads.
+
+    The begin and (effective) end of each event are stored as 64-bit integer microseconds since the epoch
+    (see `to_epoch_us`, `NULL_TIME` marks missing values) in `array`s, all other columns are `StringColumn`s.
+    Filtering, sorting and grouping work on these columns directly and return the indices of the matching rows
+    in ascending order, without creating any `Event`. Use `take` to create a table containing only these rows.
+    The query methods follow the semantics of the respective `Timeline` methods,
+    events without begin or end never match.
+    They use vectorized comparisons if NumPy is installed. Otherwise, the rows with matching begin are looked up
+    by bisecting the begins in `begin_order`, so that only these rows need to be checked one by one.
+    With NumPy installed, `to_numpy` provides all columns as NumPy arrays without copying the time columns.
+    """
+
+    STRING_COLUMNS = ("uid", "summary", "location", "status")
+
+    begin: array = attr.ib(factory=lambda: array("q"))
+    end: array = attr.ib(factory=lambda: array("q"))
+    uid: StringColumn = attr.ib(factory=StringColumn)
+    summary: StringColumn = attr.ib(factory=StringColumn)
+    location: StringColumn = attr.ib(factory=StringColumn)
+    status: StringColumn = attr.ib(factory=StringColumn)
+    _begin_order: Optional[Tuple[int, array, array, int]] = attr.ib(
+        default=None, init=False, eq=False
+    )
+
+    @classmethod
+    def from_events(cls, events: Iterable[Event]) -> "EventTable":
+        table = cls()
+        for event in events:
+            table.append(
+                event.timespan,
+                event.uid,
+                event.summary,
+                event.location,
+                event.status,
+            )
+        return table
+
+    @classmethod
+    def parse(
+        cls,
+        file_or_lines: Union[str, Buffer, Iterable[str]],
+        context: Optional[ContextDict] = None,
+    ) -> "EventTable":
+        """
+        Build a table from the events of a single serialized calendar, parsed incrementally like `Calendar.iter_events`.
+        Only the properties stored in the table are converted, no `Event` instances are created.
+        """
+        from ics import Calendar
+        from ics.converter.component import ComponentMeta
+
+        loader = EventRowLoader(("timespan",) + cls.STRING_COLUMNS)
+        if not context:
+            context = ContextDict(defaultdict(lambda: None))
+        table = cls()
+        calendar_meta = ComponentMeta.BY_TYPE[Calendar]
+        for meta, container in calendar_meta.iter_entry_containers(  # type: ignore[attr-defined]
+            file_or_lines, context
+        ):
+            if meta.component_type is not Event:
+                continue
+            row = loader.load(container, context)
+            table.append(
+                row["timespan"],
+                *(row.get(column) for column in cls.STRING_COLUMNS),
+            )
+        return table
+
+    def append(
+        self,
+        timespan: Timespan,
+        uid: Optional[str] = None,
+        summary: Optional[str] = None,
+        location: Optional[str] = None,
+        status: Optional[str] = None,
+    ):
+        self.begin.append(to_epoch_us(timespan.get_begin()))
+        self.end.append(to_epoch_us(timespan.get_effective_end()))
+        self.uid.append(uid)
+        self.summary.append(summary)
+        self.location.append(location)
+        self.status.append(status)
+
+    def __len__(self):
+        return len(self.begin)
+
+    def __repr__(self):
+        return f"<EventTable with {len(self)} rows>"
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Get the values of all columns of a single row, with begin and end converted to UTC datetimes."""
+        values: Dict[str, Any] = {
+            "begin": from_epoch_us(self.begin[index]),
+            "end": from_epoch_us(self.end[index]),
+        }
+        for column in self.STRING_COLUMNS:
+            values[column] = getattr(self, column)[index]
+        return values
+
+    def take(self, indices: Iterable[int]) -> "EventTable":
+        """Create a table containing the rows at `indices`, in that order."""
+        indices = list(indices)
+        begin, end = self.begin, self.end
+        return EventTable(
+            array("q", [begin[i] for i in indices]),
+            array("q", [end[i] for i in indices]),
+            *(getattr(self, column).take(indices) for column in self.STRING_COLUMNS),
+        )
+
+    def begin_order(self) -> Tuple[array, array]:
+        """
+        Get the indices of all rows with a begin ordered by begin, together with their begins in that order.
+        This is computed on first use and again after rows were appended, but not if the columns are modified directly.
+        """
+        order = self.__begin_order()
+        return order[1], order[2]
+
+    def __begin_order(self) -> Tuple[int, array, array, int]:
+        # additionally stores the longest duration, so that the queries can also bound the begin
+        # of the events ending after some instant
+        size = len(self.begin)
+        if self._begin_order is None or self._begin_order[0] != size:
+            begin, end = self.begin, self.end
+            order = sorted(
+                (i for i in range(size) if begin[i] != NULL_TIME), key=begin.__getitem__
+            )
+            longest = max(
+                (end[i] - begin[i] for i in order if end[i] != NULL_TIME), default=0
+            )
+            self._begin_order = (
+                size,
+                array("l", order),
+                array("q", [begin[i] for i in order]),
+                longest,
+            )
+        return self._begin_order
+
+    def __numpy_columns(self):
+        begin = numpy.frombuffer(self.begin, dtype=numpy.int64)
+        end = numpy.frombuffer(self.end, dtype=numpy.int64)
+        return begin, end, (begin != NULL_TIME) & (end != NULL_TIME)
+
+    @staticmethod
+    def __nonzero(mask) -> array:
+        return array("l", numpy.flatnonzero(mask).tolist())
+
+    def overlapping(self, start: DatetimeLike, stop: DatetimeLike) -> array:
+        """Get the indices of all events intersecting the interval from `start` to `stop`."""
+        qb, qe = to_epoch_us(ensure_datetime(start)), to_epoch_us(ensure_datetime(stop))
+        if numpy is not None:
+            b, e, valid = self.__numpy_columns()
+            return self.__nonzero(
+                valid
+                & (
+                    ((qb <= b) & (b < qe))
+                    | ((qb <= e) & (e < qe))
+                    | ((b <= qb) & (qb < e))
+                    | ((b <= qe) & (qe < e))
+                )
+            )
+        # events beginning after the interval or ending before it, i.e. beginning more than the
+        # longest duration before it, can't match
+        _, order, begins, longest = self.__begin_order()
+        lo, hi = bisect_left(begins, min(qb, qe) - longest), bisect_right(begins, qe)
+        rows = order[lo:hi]
+        matches = [
+            i
+            for i, b, e in zip(rows, begins[lo:hi], map(self.end.__getitem__, rows))
+            if e != NULL_TIME
+            and (qb <= b < qe or qb <= e < qe or b <= qb < e or b <= qe < e)
+        ]
+        return array("l", sorted(matches))
+
+    def included(self, start: DatetimeLike, stop: DatetimeLike) -> array:
+        """Get the indices of all events that are fully included in the interval from `start` to `stop`."""
+        qb, qe = to_epoch_us(ensure_datetime(start)), to_epoch_us(ensure_datetime(stop))
+        if numpy is not None:
+            b, e, valid = self.__numpy_columns()
+            return self.__nonzero(valid & (qb <= b) & (e < qe))
+        order, begins = self.begin_order()
+        rows = order[bisect_left(begins, qb) : bisect_left(begins, qe)]
+        end = self.end
+        return array(
+            "l", sorted(i for i in rows if end[i] != NULL_TIME and end[i] < qe)
+        )
+
+    def at(self, instant: DatetimeLike) -> array:
+        """Get the indices of all events that are happening at `instant`."""
+        t = to_epoch_us(ensure_datetime(instant))
+        if numpy is not None:
+            b, e, valid = self.__numpy_columns()
+            return self.__nonzero(valid & (b <= t) & (t < e))
+        _, order, begins, longest = self.__begin_order()
+        rows = order[bisect_left(begins, t - longest) : bisect_right(begins, t)]
+        end = self.end
+        # events without end never match, as `NULL_TIME` is smaller than any instant
+        return array("l", sorted(i for i in rows if t < end[i]))
+
+    def start_after(self, instant: DatetimeLike) -> array:
+        """Get the indices of all events that begin after `instant`."""
+        t = to_epoch_us(ensure_datetime(instant))
+        if numpy is not None:
+            b, e, valid = self.__numpy_columns()
+            return self.__nonzero(valid & (b > t))
+        order, begins = self.begin_order()
+        end = self.end
+        rows = order[bisect_right(begins, t) :]
+        return array("l", sorted(i for i in rows if end[i] != NULL_TIME))
+
+    def argsort(self, *columns: str, reverse: bool = False) -> array:
+        """
+        Get the row indices ordered by the given columns (by default begin and end).
+        String columns are ordered by their value, with missing values first.
+        """
+        keys: List[Any] = []
+        for column in columns or ("begin", "end"):
+            if column in self.STRING_COLUMNS:
+                string_column: StringColumn = getattr(self, column)
+                # rank the distinct values once instead of comparing the strings of all rows
+                ranks = [0] * len(string_column.values)
+                distinct = sorted(range(1, len(ranks)), key=string_column.values.__getitem__)  # type: ignore[arg-type]
+                for rank, code in enumerate(distinct, 1):
+                    ranks[code] = rank
+                keys.append([ranks[code] for code in string_column.codes])
+            else:
+                keys.append(getattr(self, column))
+        if len(keys) == 1:
+            key = keys[0].__getitem__
+        else:
+            rows = list(zip(*keys))
+            key = rows.__getitem__
+        return array("l", sorted(range(len(self)), key=key, reverse=reverse))
+
+    def sort(self, *columns: str, reverse: bool = False) -> "EventTable":
+        """Create a table with all rows ordered by the given columns, see `argsort`."""
+        return self.take(self.argsort(*columns, reverse=reverse))
+
+    def group_by(self, column: str) -> Dict[Optional[str], array]:
+        """Get the indices of all rows for each distinct value of the string column `column`."""
+        string_column: StringColumn = getattr(self, column)
+        groups: Dict[int, array] = {}
+        for index, code in enumerate(string_column.codes):
+            group = groups.get(code)
+            if group is None:
+                group = groups[code] = array("l")
+            group.append(index)
+        return {string_column.values[code]: group for code, group in groups.items()}
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        Get all columns as NumPy arrays. The time columns are int64 arrays sharing the memory of this table,
+        string columns are converted to object arrays.
+        """
+        try:
+            import numpy
+        except ImportError as e:
+            raise ImportError("EventTable.to_numpy() requires NumPy") from e
+
+        columns = {
+            "begin": numpy.frombuffer(self.begin, dtype=numpy.int64),
+            "end": numpy.frombuffer(self.end, dtype=numpy.int64),
+        }
+        for column in self.STRING_COLUMNS:
+            string_column: StringColumn = getattr(self, column)
+            values = numpy.array(string_column.values, dtype=object)
+            columns[column] = values[
+                numpy.frombuffer(
+                    string_column.codes, dtype=f"i{string_column.codes.itemsize}"
+                )
+            ]
+        return columns
+
+    def iter_rows(self) -> Iterator[Tuple[Any, ...]]:
+        """Iterate over the raw values of all rows, in the order begin, end, followed by `STRING_COLUMNS`."""
+        return zip(
+            self.begin,
+            self.end,
+            *(getattr(self, column) for column in self.STRING_COLUMNS),
+        )
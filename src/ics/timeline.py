@@ -1,12 +1,37 @@
 import heapq
+import itertools
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
 from datetime import date, datetime, timedelta
-from typing import TYPE_CHECKING, Iterable, Iterator, Optional, Tuple
+from operator import attrgetter
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
 import attr
+import dateutil.rrule
+from dateutil.tz import tzlocal
 
+from ics.contentline import ContentLine
 from ics.event import Event
-from ics.timespan import Normalization, Timespan
-from ics.types import DatetimeLike, OptionalDatetimeLike, TimespanOrBegin
+from ics.timespan import CMP_NORMALIZATION, Normalization, Timespan
+from ics.timezone import Timezone
+from ics.types import (
+    ContextDict,
+    DatetimeLike,
+    OptionalDatetimeLike,
+    TimespanOrBegin,
+    VersionedList,
+    copy_extra_params,
+)
 from ics.utils import (
     ceil_datetime_to_midnight,
     ensure_datetime,
@@ -17,15 +42,288 @@ if TYPE_CHECKING:
     from ics.icalendar import Calendar
 
 
+def get_timezone(event: Event) -> Optional[Timezone]:
+    begin = event.timespan.begin_time
+    if begin is not None and isinstance(begin.tzinfo, Timezone):
+        return begin.tzinfo
+    return None
+
+
+def parse_recurrence_instants(
+    line: ContentLine, tzinfo: Optional[Timezone] = None
+) -> Iterator[datetime]:
+    """
+    Parse the (possibly multiple) instants of an RDATE, EXDATE or RECURRENCE-ID line.
+    For PERIOD values, only the start of the period is returned.
+    """
+    from ics.valuetype.datetime import (
+        DateConverter,
+        DatetimeConverter,
+        DatetimeConverterMixin,
+    )
+
+    context = ContextDict(defaultdict(lambda: None))
+    if tzinfo is not None:
+        context[DatetimeConverterMixin.CONTEXT_KEY_AVAILABLE_TZ] = {tzinfo.tzid: tzinfo}
+    value_type = (line.params.get("VALUE") or ["DATE-TIME"])[0].upper()
+    converter = DateConverter if value_type == "DATE" else DatetimeConverter
+    for value in line.value.split(","):
+        if value_type == "PERIOD":
+            value = value.partition("/")[0]
+        yield ensure_datetime(
+            converter.parse(value, copy_extra_params(line.params), context)
+        )
+
+
+@attr.s(slots=True, frozen=True)
+class TimelineRecurrence:
+    """
+    The occurrences of a recurring event, as given by its RRULE, RDATE, EXRULE and EXDATE properties.
+    As `Event` has no attributes for these properties, they are read from `Event.extra`.
+    Following RFC 5545, the begin of the event is always its first occurrence.
+    """
+
+    event: Event = attr.ib()
+    rruleset: dateutil.rrule.rruleset = attr.ib()
+
+    @classmethod
+    def from_event(
+        cls, event: Event, overridden: Iterable[datetime] = ()
+    ) -> Optional["TimelineRecurrence"]:
+        """
+        Build the recurrence of `event`, excluding all `overridden` occurrences,
+        or return None if the event doesn't recur.
+        """
+        dtstart = event.timespan.begin_time
+        lines = [
+            line
+            for line in event.extra
+            if isinstance(line, ContentLine)
+            and line.name in ("RRULE", "RDATE", "EXRULE", "EXDATE")
+        ]
+        if dtstart is None or not any(
+            line.name in ("RRULE", "RDATE") for line in lines
+        ):
+            return None
+
+        tzinfo = get_timezone(event)
+        rruleset = dateutil.rrule.rruleset()
+        rruleset.rdate(dtstart)
+        for line in lines:
+            if line.name == "RRULE":
+                rruleset.rrule(dateutil.rrule.rrulestr(line.value, dtstart=dtstart))
+            elif line.name == "EXRULE":
+                rruleset.exrule(dateutil.rrule.rrulestr(line.value, dtstart=dtstart))
+            elif line.name == "RDATE":
+                for instant in parse_recurrence_instants(line, tzinfo):
+                    rruleset.rdate(instant)
+            else:
+                for instant in parse_recurrence_instants(line, tzinfo):
+                    rruleset.exdate(instant)
+        for instant in overridden:
+            rruleset.exdate(instant)
+        return cls(event, rruleset)
+
+    def occurrences(
+        self, after: Optional[datetime] = None, before: Optional[datetime] = None
+    ) -> Iterator[Event]:
+        """
+        Lazily iterate in chronological order over all occurrences that end at or after `after`
+        and begin at or before `before`. Occurrences after `before` are never generated.
+        The first occurrence is the event itself, all others are copies with a shifted timespan.
+        """
+        timespan = self.event.timespan
+        dtstart = timespan.begin_time
+        assert dtstart is not None
+        if after is None:
+            begins = iter(self.rruleset)
+        else:
+            duration = timespan.get_effective_duration() or timedelta(0)
+            begins = self.rruleset.xafter(
+                align_datetime(after, dtstart) - duration, inc=True
+            )
+        if before is not None:
+            before = align_datetime(before, dtstart)
+        for begin in begins:
+            if before is not None and begin > before:
+                return
+            if begin == dtstart:
+                yield self.event
+                continue
+            end = timespan.end_time
+            if end is not None:
+                end = begin + (end - dtstart)
+            yield attr.evolve(
+                self.event, timespan=timespan.replace(begin_time=begin, end_time=end)
+            )
+
+
+def align_datetime(instant: datetime, like: datetime) -> datetime:
+    """
+    Convert `instant` to a floating datetime if `like` is floating and to an aware one otherwise,
+    interpreting floating datetimes in the local timezone (see `CMP_NORMALIZATION`).
+    """
+    if like.tzinfo is None and instant.tzinfo is not None:
+        return instant.astimezone(tzlocal()).replace(tzinfo=None)
+    elif like.tzinfo is not None and instant.tzinfo is None:
+        return instant.replace(tzinfo=tzlocal())
+    else:
+        return instant
+
+
+@attr.s(slots=True, frozen=True)
+class TimelineIndex:
+    """
+    Index of all events of a calendar in chronological order, allowing a `Timeline` to answer queries in
+    O(log n + k) instead of sorting all n events again for every query.
+
+    Besides the lists of normalized timespans and events sorted by `Timespan` order, the begin and end
+    `Timespan.cmp_tuple` of each entry is stored for bisection. Additionally, the maximum end of every
+    subtree of an implicit binary tree over the entries is stored in `max_ends` (a so-called segment tree),
+    so that all entries that end after a certain instant can be found without looking at the others.
+
+    If recurrences are expanded, recurring events are not part of the entries and are instead
+    stored as `TimelineRecurrence` in `recurrences`.
+
+    To cheaply detect whether the index is outdated, the `VersionedList.version` of the indexed event list
+    at the time of building is stored in `version`. As events increment the version of the lists containing them
+    when their timespan is re-assigned, this also covers changes to the events.
+    """
+
+    events: List[Event] = attr.ib()
+    timespans: List[Timespan] = attr.ib()
+    entries: List[Tuple[Timespan, Event]] = attr.ib()
+    begins: List[datetime] = attr.ib()
+    ends: List[datetime] = attr.ib()
+    max_ends: List[Optional[datetime]] = attr.ib()
+    recurrences: List[TimelineRecurrence] = attr.ib(factory=list)
+    source: Optional[List[Event]] = attr.ib(default=None, eq=False, repr=False)
+    version: Optional[int] = attr.ib(default=None)
+
+    @classmethod
+    def build(
+        cls,
+        events: List[Event],
+        normalize: Callable[[Timespan], Timespan],
+        expand_recurrences: bool = False,
+    ) -> "TimelineIndex":
+        single = events
+        recurrences: List[TimelineRecurrence] = []
+        if expand_recurrences:
+            single, recurrences = cls.split_recurrences(events)
+        entries = [(normalize(e.timespan), e) for e in single]
+        entries = sorted(t for t in entries if t[0])
+        begins, ends = [], []
+        for timespan, _ in entries:
+            begin, end = timespan.cmp_tuple()
+            begins.append(begin)
+            ends.append(end)
+
+        size = 1
+        while size < len(ends):
+            size *= 2
+        max_ends: List[Optional[datetime]] = [None] * size + ends
+        max_ends += [None] * (2 * size - len(max_ends))
+        for node in reversed(range(1, size)):
+            left, right = max_ends[2 * node], max_ends[2 * node + 1]
+            if left is None or (right is not None and right > left):
+                max_ends[node] = right
+            else:
+                max_ends[node] = left
+
+        return cls(
+            list(events),
+            list(map(attrgetter("timespan"), events)),
+            entries,
+            begins,
+            ends,
+            max_ends,
+            recurrences,
+            events,
+            cls.version_of(events),
+        )
+
+    @staticmethod
+    def split_recurrences(
+        events: List[Event],
+    ) -> Tuple[List[Event], List[TimelineRecurrence]]:
+        """
+        Split `events` into single events and the recurrences of recurring events.
+        Events with a RECURRENCE-ID are single events that replace one occurrence of the recurring event with the same UID.
+        """
+        overridden: Dict[str, Set[datetime]] = defaultdict(set)
+        for event in events:
+            for line in event.extra:
+                if isinstance(line, ContentLine) and line.name == "RECURRENCE-ID":
+                    overridden[event.uid].update(
+                        parse_recurrence_instants(line, get_timezone(event))
+                    )
+
+        single: List[Event] = []
+        recurrences: List[TimelineRecurrence] = []
+        for event in events:
+            recurrence = TimelineRecurrence.from_event(
+                event, overridden.get(event.uid, ())
+            )
+            if recurrence is None:
+                single.append(event)
+            else:
+                recurrences.append(recurrence)
+        return single, recurrences
+
+    @staticmethod
+    def version_of(events: List[Event]) -> Optional[int]:
+        if isinstance(events, VersionedList):
+            return events.version
+        return None
+
+    def is_valid_for(self, events: List[Event]) -> bool:
+        """
+        Check whether neither `events` nor their timespans changed since this index was built.
+        For a `VersionedList` of events, this only needs to compare the version counters, otherwise
+        it is linear in the number of events, but only needs to compare object identities.
+        """
+        if self.version is not None and events is self.source:
+            return self.version == self.version_of(events)
+        return self.events == events and self.timespans == list(
+            map(attrgetter("timespan"), events)
+        )
+
+    def ending_after(self, stop: int, instant: datetime) -> Iterator[int]:
+        """
+        Iterate in ascending order over the indices of all entries before `stop` that end at or after `instant`.
+        """
+        size = len(self.max_ends) // 2
+        stack = [(1, 0, size)]
+        while stack:
+            node, lo, hi = stack.pop()
+            max_end = self.max_ends[node]
+            if lo >= stop or max_end is None or max_end < instant:
+                continue
+            if node >= size:
+                yield lo
+            else:
+                mid = (lo + hi) // 2
+                stack.append((2 * node + 1, mid, hi))
+                stack.append((2 * node, lo, mid))
+
+
 @attr.s
 class Timeline:
     """
     `Timeline`s allow iterating all event from a `Calendar` in chronological order, optionally also filtering events
     according to their timestamps.
+
+    If `expand_recurrences` is set, every occurrence of recurring events is returned separately (see `TimelineRecurrence`).
+    Occurrences are generated lazily and only within the queried timespan.
     """
 
     _calendar: "Calendar" = attr.ib()
     _normalization: Optional[Normalization] = attr.ib()
+    _expand_recurrences: bool = attr.ib(default=False)
+    _index: Optional[TimelineIndex] = attr.ib(
+        default=None, init=False, eq=False, repr=False
+    )
 
     def __normalize_datetime(self, instant: DatetimeLike) -> datetime:
         """
@@ -53,6 +351,19 @@ class Timeline:
             timespan = self._normalization.normalize(timespan)
         return timespan
 
+    def index(self) -> TimelineIndex:
+        """
+        Get the `TimelineIndex` of all events from the :class:`ics.icalendar.Calendar`.
+        The index is built on first use and rebuilt whenever the events or their timespans change.
+        Note that changes to the recurrence properties in `Event.extra` are not detected.
+        """
+        events = self._calendar.events
+        if self._index is None or not self._index.is_valid_for(events):
+            self._index = TimelineIndex.build(
+                events, self.__normalize_timespan, self._expand_recurrences
+            )
+        return self._index
+
     def iterator(self) -> Iterator[Tuple[Timespan, Event]]:
         """
         Iterates on every event from the :class:`ics.icalendar.Calendar` in chronological order
@@ -61,16 +372,37 @@ class Timeline:
             - chronological order is defined by the comparison operators in :class:`ics.timespan.Timespan`
             - Events with no `begin` will not appear here. (To list all events in a `Calendar` use `Calendar.events`)
         """
-        # Using a heap is faster than sorting if the number of events (n) is
-        # much bigger than the number of events we extract from the iterator (k).
-        # Complexity: O(n + k log n).
-        heap: Iterable[Tuple[Timespan, Event]] = (
-            (self.__normalize_timespan(e.timespan), e) for e in self._calendar.events
-        )
-        heap = [t for t in heap if t[0]]
-        heapq.heapify(heap)
-        while heap:
-            yield heapq.heappop(heap)
+        index = self.index()
+        yield from self.__with_occurrences(index, index.entries)
+
+    def __candidates(
+        self, indices: Iterable[int], index: TimelineIndex
+    ) -> Iterator[Tuple[Timespan, Event]]:
+        for i in indices:
+            yield index.entries[i]
+
+    def __with_occurrences(
+        self,
+        index: TimelineIndex,
+        candidates: Iterable[Tuple[Timespan, Event]],
+        after: Optional[datetime] = None,
+        before: Optional[datetime] = None,
+    ) -> Iterable[Tuple[Timespan, Event]]:
+        """
+        Merge the occurrences of all recurring events of `index` that end at or after `after` and begin
+        at or before `before` into the chronologically ordered `candidates` taken from the same `index`.
+        """
+        recurrences = index.recurrences
+        if not recurrences:
+            return candidates
+        streams = [
+            (
+                (self.__normalize_timespan(e.timespan), e)
+                for e in recurrence.occurrences(after, before)
+            )
+            for recurrence in recurrences
+        ]
+        return heapq.merge(candidates, *streams)
 
     def __iter__(self) -> Iterator[Event]:
         """
@@ -91,7 +423,19 @@ class Timeline:
         Alternatively, this method can be called directly with a single timespan as parameter.
         """
         query = self.__normalize_timespan(start, stop)
-        for timespan, event in self.iterator():
+        index = self.index()
+        candidates: Iterable[Tuple[Timespan, Event]] = index.entries
+        begin, end = query.timespan_tuple(normalization=CMP_NORMALIZATION)
+        if begin is not None and end is not None:
+            # all included events need to begin within the query
+            indices = range(
+                bisect_left(index.begins, begin), bisect_left(index.begins, end)
+            )
+            candidates = self.__candidates(indices, index)
+        candidates = self.__with_occurrences(
+            index, candidates, query.begin_time, query.get_effective_end()
+        )
+        for timespan, event in candidates:
             if timespan.is_included_in(query):
                 yield event
 
@@ -103,18 +447,106 @@ class Timeline:
         Alternatively, this method can be called directly with a single timespan as parameter.
         """
         query = self.__normalize_timespan(start, stop)
-        for timespan, event in self.iterator():
+        index = self.index()
+        candidates: Iterable[Tuple[Timespan, Event]] = index.entries
+        begin, end = query.timespan_tuple(normalization=CMP_NORMALIZATION)
+        if begin is not None and end is not None:
+            # all overlapping events either begin before the query and end within or after it,
+            # or they begin within the query
+            split = bisect_left(index.begins, begin)
+            indices = itertools.chain(
+                index.ending_after(split, begin),
+                range(split, bisect_right(index.begins, end)),
+            )
+            candidates = self.__candidates(indices, index)
+        candidates = self.__with_occurrences(
+            index, candidates, query.begin_time, query.get_effective_end()
+        )
+        for timespan, event in candidates:
             if timespan.intersects(query):
                 yield event
 
+    def __sweep(
+        self, start: Optional[TimespanOrBegin], stop: OptionalDatetimeLike
+    ) -> Iterator[Tuple[datetime, datetime, Event]]:
+        """
+        Iterate in chronological order over the comparable begin and end of every event,
+        or only of those overlapping the timespan between `start` and `stop` if given.
+        Events without a begin are skipped, events without an end are treated as an instant at their begin.
+        """
+        if start is None:
+            if stop is not None:
+                raise ValueError("can't specify a stop time without a start time")
+            entries: Iterable[Tuple[Timespan, Event]] = self.iterator()
+        else:
+            entries = (
+                (self.__normalize_timespan(e.timespan), e)
+                for e in self.overlapping(start, stop)
+            )
+        for timespan, event in entries:
+            if timespan.get_begin() is None:
+                continue
+            begin, end = timespan.cmp_tuple()
+            yield begin, max(begin, end), event
+
+    def overlapping_pairs(
+        self, start: Optional[TimespanOrBegin] = None, stop: OptionalDatetimeLike = None
+    ) -> Iterator[Tuple[Event, Event]]:
+        """
+        Iterates over all pairs of events that share some time, e.g. to find double bookings.
+        Every pair is returned once, with the event that begins first (in chronological order) first.
+        Unlike `Event.intersects`, events that only touch, i.e. where one ends when the other begins, don't overlap.
+        Alternatively to all events, only pairs of events overlapping the timespan between `start` and `stop`
+        are returned, which is required for recurring events without an end if recurrences are expanded.
+
+        Instead of comparing every pair, this sweeps over the events in chronological order while keeping
+        a heap of the events that didn't end yet, which takes O(n log n + k) for n events and k pairs.
+        """
+        active: List[Tuple[datetime, int, Event]] = []
+        for nr, (begin, end, event) in enumerate(self.__sweep(start, stop)):
+            while active and active[0][0] <= begin:
+                heapq.heappop(active)
+            # all remaining events began before this one and end after its begin
+            for _, _, other in active:
+                yield other, event
+            heapq.heappush(active, (end, nr, event))
+
+    def overlapping_clusters(
+        self, start: Optional[TimespanOrBegin] = None, stop: OptionalDatetimeLike = None
+    ) -> Iterator[List[Event]]:
+        """
+        Iterates over all groups of at least two events that are connected by overlaps (see `overlapping_pairs`),
+        i.e. every event of a group overlaps at least one other event of the group, but none outside the group.
+        The groups and their events are in chronological order. This also takes a single sweep in O(n log n).
+        """
+        cluster: List[Event] = []
+        cluster_end: Optional[datetime] = None
+        for begin, end, event in self.__sweep(start, stop):
+            if cluster_end is not None and begin >= cluster_end:
+                if len(cluster) > 1:
+                    yield cluster
+                cluster = []
+                cluster_end = None
+            cluster.append(event)
+            if cluster_end is None or end > cluster_end:
+                cluster_end = end
+        if len(cluster) > 1:
+            yield cluster
+
     def start_after(self, instant: DatetimeLike) -> Iterator[Event]:
         """
         Iterates (in chronological order) on every event from the :class:`ics.icalendar.Calendar` in chronological order.
         The first event of the iteration has a starting date greater (later) than `instant`.
         """
         instant = self.__normalize_datetime(instant)
-        for timespan, event in self.iterator():
-            if timespan.begin_time is not None and timespan.begin_time > instant:
+        index = self.index()
+        cmp_instant = CMP_NORMALIZATION.normalize(instant)
+        first = bisect_left(index.begins, cmp_instant)
+        candidates = self.__with_occurrences(index, index.entries[first:], instant)
+        for timespan, event in candidates:
+            begin = timespan.begin_time
+            # compare like the index does, so that floating and timezone-aware begins can be mixed
+            if begin is not None and CMP_NORMALIZATION.normalize(begin) > cmp_instant:
                 yield event
 
     def at(self, instant: DatetimeLike) -> Iterator[Event]:
@@ -122,7 +554,15 @@ class Timeline:
         Iterates (in chronological order) over all events that are occuring during `instant`.
         """
         instant = self.__normalize_datetime(instant)
-        for timespan, event in self.iterator():
+        index = self.index()
+        cmp_instant = CMP_NORMALIZATION.normalize(instant)
+        indices = index.ending_after(
+            bisect_right(index.begins, cmp_instant), cmp_instant
+        )
+        candidates = self.__with_occurrences(
+            index, self.__candidates(indices, index), instant, instant
+        )
+        for timespan, event in candidates:
             if timespan.includes(instant):
                 yield event
 
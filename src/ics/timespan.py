@@ -1,13 +1,18 @@
 import warnings
 from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
 from datetime import tzinfo as TZInfo
 from enum import IntEnum
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
+    Dict,
+    Iterable,
+    List,
     NamedTuple,
     Optional,
+    Tuple,
     TypeVar,
     Union,
     cast,
@@ -19,6 +24,7 @@ from attr.validators import instance_of
 from attr.validators import optional as v_optional
 from dateutil.tz import tzlocal
 
+from ics.timezone import is_utc
 from ics.types import DatetimeLike
 from ics.utils import (
     TIMEDELTA_CACHE,
@@ -38,6 +44,23 @@ if TYPE_CHECKING:
     # noinspection PyUnresolvedReferences
     from ics.event import CalendarEntryAttrs
 
+FLOATING_CONVERSION_WARNING = (
+    "interpreting missing timezone of timezone-naive floating timespan as local time for conversion, "
+    "use replace_timezone for deterministic results"
+)
+
+
+def get_fixed_utcoffset(tz: Optional[TZInfo]) -> Optional[timedelta]:
+    """
+    Get the UTC offset of `tz` if it is the same for all datetimes, or None if it may vary or is unknown.
+    """
+    if isinstance(tz, dt_timezone):
+        return tz.utcoffset(None)
+    if tz is not None and is_utc(tz):
+        return TIMEDELTA_ZERO
+    return None
+
+
 CalendarEntryT = TypeVar("CalendarEntryT", bound="CalendarEntryAttrs")
 
 
@@ -131,6 +154,83 @@ class Normalization:
             replacement = replacement()
         return action(value, replacement)
 
+    def normalize_timespans(
+        self, timespans: Iterable["Timespan"], in_place: bool = False
+    ) -> List["Timespan"]:
+        """
+        Normalize many timespans at once, with the same result as calling `normalize` on each of them.
+        The actions and the replacement timezone are only determined once. Conversions to timezones with a fixed
+        offset (like UTC) are done by plain arithmetic, all others are cached per timezone and local time,
+        so that the many events sharing the same wall-clock times only need a single slow conversion.
+        All-day timespans are returned unchanged.
+
+        If `in_place` is set, the begin and end of the given timespans are overwritten instead of creating
+        (and validating) new timespans. Normalization keeps valid timespans valid, but note that this
+        also affects all other holders of the timespans, which otherwise are immutable.
+        """
+        replacement = self.replacement
+        if callable(replacement):
+            replacement = replacement()
+        fixed_offset = get_fixed_utcoffset(replacement)
+        # timezones aren't necessarily hashable, so use their id and keep them alive alongside the result
+        converted: Dict[
+            Tuple[int, datetime, int], Tuple[Optional[TZInfo], datetime]
+        ] = {}
+
+        def convert(value: datetime) -> datetime:
+            if fixed_offset is not None:
+                offset = value.utcoffset()
+                if offset is not None:
+                    # no need for the (slow) generic `tzinfo.fromutc` of the replacement
+                    return value.replace(tzinfo=replacement) + (fixed_offset - offset)
+            key = (id(value.tzinfo), value.replace(tzinfo=None), value.fold)
+            cached = converted.get(key)
+            if cached is None:
+                cached = converted[key] = (value.tzinfo, value.astimezone(replacement))
+            return cached[1]
+
+        def replace(value: datetime) -> datetime:
+            return value.replace(tzinfo=replacement)
+
+        actions: Dict[bool, Optional[Callable[[datetime], datetime]]] = {}
+        for floating, action in (
+            (True, self.normalize_floating),
+            (False, self.normalize_with_tz),
+        ):
+            if not action:
+                actions[floating] = None
+            elif action is NormalizationAction.REPLACE:
+                actions[floating] = replace
+            else:
+                actions[floating] = convert
+
+        normalized = []
+        warn_floating = actions[True] is convert
+        for timespan in timespans:
+            begin, end = timespan.begin_time, timespan.end_time
+            if timespan.precision == "day":
+                normalized.append(timespan)
+                continue
+            floating = timespan.is_floating()
+            action = actions[floating]
+            if action is None:
+                normalized.append(timespan)
+                continue
+            if floating and warn_floating:
+                warnings.warn(FLOATING_CONVERSION_WARNING)
+                warn_floating = False
+            if begin is not None:
+                begin = action(begin)
+            if end is not None:
+                end = action(end)
+            if in_place:
+                object.__setattr__(timespan, "begin_time", begin)
+                object.__setattr__(timespan, "end_time", end)
+            else:
+                timespan = timespan.replace(begin_time=begin, end_time=end)
+            normalized.append(timespan)
+        return normalized
+
 
 # using datetime.min might lead to problems when doing timezone conversions / comparisions (e.g. by subtracting an 1 hour offset)
 CMP_DATETIME_NONE_DEFAULT = datetime(1900, 1, 1, 0, 0)
@@ -210,10 +310,7 @@ class Timespan:
         if self.is_all_day():
             raise ValueError("can't convert timezone of all-day timespan")
         if self.is_floating():
-            warnings.warn(
-                "interpreting missing timezone of timezone-naive floating timespan as local time for conversion, "
-                "use replace_timezone for deterministic results"
-            )
+            warnings.warn(FLOATING_CONVERSION_WARNING)
         begin = self.get_begin()
         if begin is not None:
             begin = begin.astimezone(tzinfo)
@@ -1,7 +1,8 @@
 import datetime
 import functools
 import warnings
-from typing import ClassVar, List, Optional, cast, overload
+from bisect import bisect_right
+from typing import ClassVar, List, Optional, Tuple, cast, overload
 
 import attr
 import dateutil
@@ -22,6 +23,7 @@ __all__ = [
     "TimezoneObservance",
     "TimezoneStandardObservance",
     "TimezoneDaylightObservance",
+    "TimezoneTransitions",
     "Timezone",
     "RRULE_EPOCH_START",
     "UTC",
@@ -124,6 +126,87 @@ class TimezoneDaylightObservance(TimezoneObservance):
     is_dst: ClassVar[bool] = True
 
 
+@attr.s(slots=True, frozen=True)
+class TimezoneTransitions:
+    """
+    Precomputed onsets of all observances of a `Timezone` between `start` and `end`, sorted by their local time.
+    Looking up the observance in effect at some local time using bisection yields the same results
+    as evaluating the recurrence rules of all observances in `Timezone._find_observance_cachable`.
+    """
+
+    start: datetime.datetime = attr.ib()
+    end: datetime.datetime = attr.ib()
+    keys: Tuple[List[datetime.datetime], List[datetime.datetime]] = attr.ib()
+    observances: Tuple[List[TimezoneObservance], List[TimezoneObservance]] = attr.ib()
+    default: TimezoneObservance = attr.ib()
+
+    @classmethod
+    def build(
+        cls, observances: List[TimezoneObservance], start_year: int, end_year: int
+    ) -> "TimezoneTransitions":
+        start = datetime.datetime(start_year, 1, 1)
+        end = datetime.datetime(end_year, 1, 1)
+        onsets = []
+        for nr, comp in enumerate(observances):
+            before = comp.rrule.before(start)
+            if before:
+                onsets.append((before, nr, comp))
+            # the additional day includes all onsets that are relevant for fold=1 lookups before end
+            for onset in comp.rrule.between(
+                start, end + datetime.timedelta(days=1), inc=True
+            ):
+                onsets.append((onset, nr, comp))
+
+        default = observances[0]
+        for comp in observances:
+            if not comp.is_dst:
+                default = comp
+                break
+
+        keys, found = [], []
+        for fold in (0, 1):
+            # for fold=1, the onset of observances that turn back the clock is shifted to the first occurrence of the ambiguous time
+            table = sorted(
+                (
+                    onset + comp.tzoffsetdiff
+                    if fold and comp.tzoffsetdiff < TIMEDELTA_ZERO
+                    else onset,
+                    onset,
+                    nr,
+                    comp,
+                )
+                for onset, nr, comp in onsets
+            )
+            # the observance in effect is the one with the latest onset, the first one of them in case of a tie
+            fold_keys, fold_found = [], []
+            best = None
+            for key, onset, nr, comp in table:
+                if best is None or (best[0], -best[1]) < (onset, -nr):
+                    best = (onset, nr, comp)
+                fold_keys.append(key)
+                fold_found.append(best[2])
+            keys.append(fold_keys)
+            found.append(fold_found)
+        return cls(start, end, (keys[0], keys[1]), (found[0], found[1]), default)
+
+    def find_observance(self, dt: datetime.datetime) -> Optional[TimezoneObservance]:
+        """
+        Find the observance in effect at the naive local time `dt` or return None if `dt` is out of range.
+        """
+        if not self.start <= dt < self.end:
+            return None
+        fold = dt.fold
+        pos = bisect_right(self.keys[fold], dt)
+        if pos == 0:
+            return self.default
+        return self.observances[fold][pos - 1]
+
+
+def _new_timezone(cls):
+    # tzinfo.__new__ refuses to create instances of subclasses that also inherit from other classes
+    return object.__new__(cls)
+
+
 @attr.s(frozen=True, repr=False)
 class Timezone(Component, _tzinfo):
     NAME = "VTIMEZONE"
@@ -133,6 +216,10 @@ class Timezone(Component, _tzinfo):
     tzurl: Optional[URL] = attr.ib(default=None)
     last_modified: Optional[datetime.datetime] = attr.ib(default=None, converter=ensure_utc)  # type: ignore[misc]
 
+    # range of years (end exclusive) for which the onsets of all observances are precomputed,
+    # datetimes outside this range are looked up by evaluating the recurrence rules of the observances
+    TRANSITION_YEARS: ClassVar[Tuple[int, int]] = (1900, 2100)
+
     @classmethod
     def from_tzid(cls, tzid: str) -> "Timezone":
         from ics.timezone.converters import Timezone_from_tzid
@@ -168,11 +255,27 @@ class Timezone(Component, _tzinfo):
 
     def __attrs_post_init__(self):
         super().__attrs_post_init__()
+        self.__init_observance_cache()
+
+    def __init_observance_cache(self):
         if len(self.observances) >= 2:
             # one lru cache per Timezone instance, so no Timezone hashing is needed
             func = functools.lru_cache(10)(self._find_observance_cachable)
             object.__setattr__(self, "_find_observance_cachable", func)
 
+    def __reduce__(self):
+        # datetime.tzinfo.__reduce__ would call __init__ without arguments and the lru cache can't be pickled
+        state = dict(self.__dict__)
+        state.pop("_find_observance_cachable", None)
+        # these are stored in the slots of Component
+        state.update(extra=self.extra, extra_params=self.extra_params)
+        return _new_timezone, (type(self),), state
+
+    def __setstate__(self, state):
+        for key, value in state.items():
+            object.__setattr__(self, key, value)
+        self.__init_observance_cache()
+
     def __str__(self):
         return self.tzid
 
@@ -182,11 +285,25 @@ class Timezone(Component, _tzinfo):
         else:
             return f"Timezone({self.tzid!r}, observances={self.observances!r})"
 
+    @functools.cached_property
+    def _transitions(self) -> Optional[TimezoneTransitions]:
+        try:
+            return TimezoneTransitions.build(self.observances, *self.TRANSITION_YEARS)
+        except (TypeError, ValueError, OverflowError):
+            # e.g. observances with timezone-aware onsets can't be compared to naive local times
+            return None
+
     def _find_observance(self, dt):
         if len(self.observances) < 2:
             return self.observances[0]
 
-        return self._find_observance_cachable(dt.replace(tzinfo=None))
+        dt = dt.replace(tzinfo=None)
+        transitions = self._transitions
+        if transitions is not None:
+            comp = transitions.find_observance(dt)
+            if comp is not None:
+                return comp
+        return self._find_observance_cachable(dt)
 
     def _find_observance_cachable(self, dt):
         # adapted from dateutil.tz.tz._tzicalvtz._find_comp
@@ -1,6 +1,8 @@
 import datetime
+import threading
+from collections import OrderedDict
 from enum import Enum
-from typing import Any, Dict, Optional, Union, cast
+from typing import Any, Dict, NamedTuple, Optional, Union, cast
 
 import dateutil
 
@@ -16,6 +18,9 @@ from ics.types import ContextDict, UTCOffset
 from ics.utils import TIMEDELTA_ZERO, one
 
 __all__ = [
+    "TimezoneCacheInfo",
+    "TimezoneCache",
+    "TIMEZONE_CACHE",
     "TimezoneResult",
     "Timezone_from_offset",
     "Timezone_from_builtin",
@@ -32,9 +37,72 @@ class TimezoneResult(Enum):
     NOT_IMPLEMENTED = 4
 
 
+class TimezoneCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class TimezoneCache:
+    """
+    Thread-safe cache of the built-in `Timezone`s loaded by `Timezone_from_tzid`, shared by the whole process.
+    Each timezone is stored under every tzid it was requested with (e.g. its Windows alias) and its vTimezone.ics file,
+    so that all of them resolve to the same instance, which thus must not be modified.
+    At most `maxsize` keys are kept, evicting the least recently used ones.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._timezones: "OrderedDict[str, Timezone]" = OrderedDict()
+        self._hits = self._misses = 0
+
+    def get(self, key: str, count: bool = True) -> Optional[Timezone]:
+        with self._lock:
+            tz = self._timezones.get(key, None)
+            if tz is not None:
+                self._timezones.move_to_end(key)
+            if count:
+                if tz is None:
+                    self._misses += 1
+                else:
+                    self._hits += 1
+            return tz
+
+    def put(self, key: str, tz: Timezone) -> Timezone:
+        """
+        Store `tz` under `key`, returning the already cached instance if another thread was faster.
+        """
+        with self._lock:
+            tz = self._timezones.setdefault(key, tz)
+            self._timezones.move_to_end(key)
+            while len(self._timezones) > self.maxsize:
+                self._timezones.popitem(last=False)
+            return tz
+
+    def info(self) -> TimezoneCacheInfo:
+        with self._lock:
+            return TimezoneCacheInfo(
+                self._hits, self._misses, self.maxsize, len(self._timezones)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._timezones.clear()
+            self._hits = self._misses = 0
+
+
+TIMEZONE_CACHE = TimezoneCache()
+
+
 def Timezone_from_tzid(tzid: str) -> Timezone:
     import ics_vtimezones  # type: ignore
 
+    tz = TIMEZONE_CACHE.get(tzid)
+    if tz is not None:
+        return tz
+
     tz_ics = ics_vtimezones.find_vtimezone_ics_file(tzid)
     if not tz_ics:
         olson_tzid = ics_vtimezones.windows_to_olson(tzid)
@@ -42,10 +110,13 @@ def Timezone_from_tzid(tzid: str) -> Timezone:
             tz_ics = ics_vtimezones.find_vtimezone_ics_file(olson_tzid)
     if not tz_ics:
         raise ValueError(f"no vTimezone.ics file found for {tzid}")
-    ics_cal = one(string_to_containers(tz_ics.read_text()))
-    if not (len(ics_cal) == 3 and ics_cal[2].name == "VTIMEZONE"):
-        raise ValueError(f"vTimezone.ics file {tz_ics} has invalid content")
-    return Timezone.from_container(ics_cal[2])
+    tz = TIMEZONE_CACHE.get(str(tz_ics), count=False)
+    if tz is None:
+        ics_cal = one(string_to_containers(tz_ics.read_text()))
+        if not (len(ics_cal) == 3 and ics_cal[2].name == "VTIMEZONE"):
+            raise ValueError(f"vTimezone.ics file {tz_ics} has invalid content")
+        tz = TIMEZONE_CACHE.put(str(tz_ics), Timezone.from_container(ics_cal[2]))
+    return TIMEZONE_CACHE.put(tzid, tz)
 
 
 def Timezone_from_tzinfo(
@@ -59,7 +130,9 @@ def Timezone_from_tzinfo(
     cache: Dict[Union[int, datetime.tzinfo], Optional[Timezone]] = {}
     the_id: Any = 0
     if context is not None:
-        context.setdefault("tzinfo_CACHE", cache)
+        stored_cache = context.setdefault("tzinfo_CACHE", cache)
+        if stored_cache is not None:  # None for EmptyContext
+            cache = stored_cache
         try:
             hash(tzinfo)
         except TypeError:
@@ -18,7 +18,9 @@ MAX_PERCENT = 100
 MAX_PRIORITY = 9
 
 
-@attr.s(eq=True, order=False)  # order methods are provided by CalendarEntryAttrs
+@attr.s(
+    eq=True, order=False, slots=True
+)  # order methods are provided by CalendarEntryAttrs
 class TodoAttrs(CalendarEntryAttrs):
     percent: Optional[int] = attr.ib(
         default=None, validator=v_optional(in_(range(0, MAX_PERCENT + 1)))
@@ -36,6 +38,9 @@ class Todo(TodoAttrs):
     or only start or due time.
     """
 
+    # allow setting arbitrary attributes, the `__dict__` is only created when that is actually done
+    __slots__ = ("__dict__",)
+
     NAME = "VTODO"
     _TIMESPAN_TYPE: ClassVar[Type[Timespan]] = TodoTimespan
 
@@ -3,13 +3,16 @@ from datetime import date, datetime, timedelta
 from typing import (
     TYPE_CHECKING,
     Any,
+    Callable,
     Dict,
+    Iterable,
     Iterator,
     List,
     MutableMapping,
     NewType,
     Optional,
     Tuple,
+    TypeVar,
     Union,
     cast,
     overload,
@@ -47,12 +50,14 @@ __all__ = [
     "CalendarEntryOrTimespanOrInstant",
     "get_timespan_if_calendar_entry",
     "RuntimeAttrValidation",
+    "LazySlot",
     "EmptyDict",
     "ExtraParams",
     "EmptyParams",
     "ContextDict",
     "EmptyContext",
     "copy_extra_params",
+    "VersionedList",
 ]
 
 ContainerItem = Union["ContentLine", "Container"]
@@ -109,7 +114,6 @@ def get_timespan_if_calendar_entry(value):
         return value
 
 
-@attr.s
 class RuntimeAttrValidation:
     """
     Mixin that automatically calls the converters and validators of `attr` attributes.
@@ -118,13 +122,22 @@ class RuntimeAttrValidation:
     is handled by `__setattr__`. This makes setting attributes as versatile as specifying
     them as init parameters and also ensures that the guarantees of validators are
     preserved even after creation of the object, at a small runtime cost.
+
+    Validation is only skipped while `__init__` is running. Instances restored without calling
+    `__init__` (e.g. by `pickle` or `copy`) are validated, as they never have the flag set.
+    The mixin only has a slot for that flag, so that it can be used as base of slotted `attr` classes.
     """
 
+    __slots__ = ("__post_init__",)
+
+    def __attrs_pre_init__(self):
+        object.__setattr__(self, "__post_init__", False)
+
     def __attrs_post_init__(self):
         object.__setattr__(self, "__post_init__", True)
 
     def __setattr__(self, key, value):
-        if getattr(self, "__post_init__", None):
+        if getattr(self, "__post_init__", True):
             cls = self.__class__  # type: Any
             if not getattr(cls, "__attr_fields__", None):
                 cls.__attr_fields__ = attr.fields_dict(cls)
@@ -137,7 +150,50 @@ class RuntimeAttrValidation:
                     value = field.converter(value)
                 if field.validator is not None:
                     field.validator(self, field, value)
-        super().__setattr__(key, value)
+            super().__setattr__(key, value)
+            self._attribute_assigned(key)
+        else:
+            super().__setattr__(key, value)
+
+    def _attribute_assigned(self, key: str):
+        """Called after attribute `key` was assigned outside of `__init__`, e.g. for tracking modifications."""
+
+
+class LazySlot:
+    """
+    Descriptor wrapping the `slot` descriptor of a slotted class, so that the value of the slot
+    is only created by calling `factory(instance)` once it is first read.
+    This saves memory for attributes that are rarely used, but need to be present on every instance.
+    """
+
+    __slots__ = ("slot", "factory")
+
+    def __init__(self, slot, factory: Callable[[Any], Any]):
+        self.slot = slot
+        self.factory = factory
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return self.slot.__get__(instance, owner)
+        except AttributeError:
+            value = self.factory(instance)
+            self.slot.__set__(instance, value)
+            return value
+
+    def __set__(self, instance, value):
+        self.slot.__set__(instance, value)
+
+    def __delete__(self, instance):
+        self.slot.__delete__(instance)
+
+    def peek(self, instance, default=None):
+        """Get the value of the slot of `instance` without creating it, or `default` if it wasn't created yet."""
+        try:
+            return self.slot.__get__(instance, type(instance))
+        except AttributeError:
+            return default
 
 
 class EmptyDictType(MutableMapping[Any, None]):
@@ -184,3 +240,89 @@ def copy_extra_params(old: Optional[ExtraParams]) -> ExtraParams:
                 )
             )
     return new
+
+
+T = TypeVar("T")
+
+
+class VersionedList(List[T]):
+    """
+    A list that counts its modifications in `version`.
+    Caches derived from the content of the list can store the version they were built for
+    and cheaply detect whether they are still valid.
+    Modifications of the items themselves are only tracked for items that have an `_added_to` method,
+    which is called with the list whenever the item is added, so that the item can later increment
+    the `version` of all lists it was added to (see `ics.component.ParsedComponentMixin._notify_owners`).
+    """
+
+    version: int = 0
+
+    def __init__(self, *args) -> None:
+        super().__init__(*args)
+        self._adopt(self)
+
+    def _adopt(self, items: Iterable[T]) -> None:
+        for item in items:
+            added_to = getattr(item, "_added_to", None)
+            if added_to is not None:
+                added_to(self)
+
+    def __setitem__(self, key, value):
+        self.version += 1
+        if isinstance(key, slice):
+            value = list(value)
+            self._adopt(value)
+        else:
+            self._adopt((value,))
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.version += 1
+        super().__delitem__(key)
+
+    def __iadd__(self, other):
+        self.version += 1
+        start = len(self)
+        result = super().__iadd__(other)
+        self._adopt(self[start:])
+        return result
+
+    def __imul__(self, other):
+        self.version += 1
+        return super().__imul__(other)
+
+    def append(self, item: T) -> None:
+        self.version += 1
+        self._adopt((item,))
+        super().append(item)
+
+    def extend(self, items) -> None:
+        self.version += 1
+        start = len(self)
+        super().extend(items)
+        self._adopt(self[start:])
+
+    def insert(self, index, item: T) -> None:
+        self.version += 1
+        self._adopt((item,))
+        super().insert(index, item)
+
+    def pop(self, index=-1) -> T:
+        self.version += 1
+        return super().pop(index)
+
+    def remove(self, item: T) -> None:
+        self.version += 1
+        super().remove(item)
+
+    def clear(self) -> None:
+        self.version += 1
+        super().clear()
+
+    def sort(self, *args, **kwargs) -> None:
+        self.version += 1
+        super().sort(*args, **kwargs)
+
+    def reverse(self) -> None:
+        self.version += 1
+        super().reverse()
@@ -1,7 +1,8 @@
+import functools
 import re
 import warnings
-from datetime import date, datetime, time, timedelta
-from typing import List, Optional, Type, cast
+from datetime import date, datetime, time, timedelta, tzinfo
+from typing import List, Optional, Tuple, Type, cast
 
 from dateutil.tz import UTC as dateutil_tzutc
 from dateutil.tz import gettz
@@ -29,9 +30,81 @@ __all__ = [
 ]
 
 
+# formats that `parse_fixed_width` can handle
+FIXED_WIDTH_FORMATS = ("%Y%m%d", "%Y%m%dT%H%M%S")
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_fixed_width(value: str) -> Optional[datetime]:
+    """
+    Parse the fixed-width forms ``YYYYMMDD`` and ``YYYYMMDDTHHMMSS`` into a naive datetime by slicing,
+    which is a lot faster than `datetime.strptime`.
+    Returns None for any other input, so that the caller can fall back to `strptime` and its error messages.
+    The results are cached, as the same timestamps (e.g. DTSTAMPs) tend to repeat within one file.
+    """
+    if not value.isascii():
+        return None
+    try:
+        if len(value) == 8 and value.isdigit():
+            return datetime(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+        elif (
+            len(value) == 15
+            and value[8] in "Tt"
+            and value[0:8].isdigit()
+            and value[9:15].isdigit()
+        ):
+            return datetime(
+                int(value[0:4]),
+                int(value[4:6]),
+                int(value[6:8]),
+                int(value[9:11]),
+                int(value[11:13]),
+                int(value[13:15]),
+            )
+    except ValueError:
+        pass
+    return None
+
+
+TWO_DIGITS = tuple(f"{i:02d}" for i in range(100))
+# strftime formats that `format_date_time` can replace, mapped to the suffix it needs to append
+FAST_STRFTIME_FORMATS = {"%Y%m%dT%H%M%SZ": "Z", "%Y%m%dT%H%M%S": ""}
+
+
+def format_date_time(value: datetime, suffix: str = "") -> str:
+    """
+    Same as ``value.strftime("%Y%m%dT%H%M%S") + suffix`` for years from 1000 on,
+    but several times faster as it only looks up pre-formatted digits.
+    """
+    return (
+        f"{value.year}{TWO_DIGITS[value.month]}{TWO_DIGITS[value.day]}"
+        f"T{TWO_DIGITS[value.hour]}{TWO_DIGITS[value.minute]}{TWO_DIGITS[value.second]}{suffix}"
+    )
+
+
 class DatetimeConverterMixin:
     FORMATS = {6: "%Y%m", 8: "%Y%m%d"}
     CONTEXT_KEY_AVAILABLE_TZ = "DatetimeAvailableTimezones"
+    CONTEXT_KEY_SERIALIZED_TZ = "DatetimeSerializedTimezones"
+
+    def _serialize_tz(
+        self, value: tzinfo, context: ContextDict
+    ) -> Tuple[bool, Optional[Timezone]]:
+        """
+        Get whether `value` is UTC and otherwise the `Timezone` it is serialized as, if any.
+        As `is_utc` and `Timezone.from_tzinfo` are expensive, the result is memoized per `tzinfo` instance in the context.
+        """
+        memo = context.setdefault(self.CONTEXT_KEY_SERIALIZED_TZ, {})
+        if memo is not None:
+            entry = memo.get(id(value))
+            if entry is not None and entry[0] is value:
+                return entry[1], entry[2]
+        utc = is_utc(value)
+        tz = None if utc else Timezone.from_tzinfo(value, context)
+        if memo is not None:
+            # keep a reference to value so that its id isn't reused
+            memo[id(value)] = (value, utc, tz)
+        return utc, tz
 
     def _serialize_dt(
         self,
@@ -41,16 +114,24 @@ class DatetimeConverterMixin:
         utc_fmt="%Y%m%dT%H%M%SZ",
         nonutc_fmt="%Y%m%dT%H%M%S",
     ) -> str:
-        if is_utc(value):
-            return value.strftime(utc_fmt)
-
+        utc, tz = False, None
         if value.tzinfo is not None:
-            tz = Timezone.from_tzinfo(value.tzinfo, context)
+            utc, tz = self._serialize_tz(value.tzinfo, context)
+
+        if utc:
+            fmt = utc_fmt
+        else:
             if tz is not None:
                 params["TZID"] = [tz.tzid]
                 available_tz = context.setdefault(self.CONTEXT_KEY_AVAILABLE_TZ, {})
                 available_tz.setdefault(tz.tzid, tz)
-        return value.strftime(nonutc_fmt)
+            fmt = nonutc_fmt
+
+        suffix = FAST_STRFTIME_FORMATS.get(fmt)
+        # strftime doesn't zero-pad years before 1000 on all platforms, so leave them to it
+        if suffix is not None and value.year >= 1000:
+            return format_date_time(value, suffix)
+        return value.strftime(fmt)
 
     def _parse_dt(
         self,
@@ -75,17 +156,22 @@ class DatetimeConverterMixin:
             )
         fixed_utc = value[-1].upper() == "Z"
 
-        tr_value = value.translate(
-            {ord("/"): "", ord("-"): "", ord("Z"): "", ord("z"): ""}
-        )
-        try:
-            format = self.FORMATS[len(tr_value)]
-        except KeyError:
-            raise ValueError(
-                "couldn't find format matching %r (%s chars), tried %s"
-                % (tr_value, len(tr_value), self.FORMATS)
+        dt = None
+        raw_value = value[:-1] if fixed_utc else value
+        if self.FORMATS.get(len(raw_value)) in FIXED_WIDTH_FORMATS:
+            dt = parse_fixed_width(raw_value)
+        if dt is None:
+            tr_value = value.translate(
+                {ord("/"): "", ord("-"): "", ord("Z"): "", ord("z"): ""}
             )
-        dt = datetime.strptime(tr_value, format)
+            try:
+                format = self.FORMATS[len(tr_value)]
+            except KeyError:
+                raise ValueError(
+                    "couldn't find format matching %r (%s chars), tried %s"
+                    % (tr_value, len(tr_value), self.FORMATS)
+                )
+            dt = datetime.strptime(tr_value, format)
 
         if fixed_utc:
             if param_tz:
@@ -343,37 +429,46 @@ class DurationConverterClass(ValueConverter[timedelta]):
         params: ExtraParams = EmptyParams,
         context: ContextDict = EmptyContext,
     ) -> str:
-        ONE_DAY_IN_SECS = 3600 * 24
-        total = abs(int(value.total_seconds()))
-        days = total // ONE_DAY_IN_SECS
-        seconds = total % ONE_DAY_IN_SECS
-
-        res = ""
-        if days:
-            res += str(days) + "D"
+        return format_duration(value)
+
+
+@functools.lru_cache(maxsize=256)
+def format_duration(value: timedelta) -> str:
+    """
+    Format `value` as DURATION, ignoring fractions of seconds.
+    The results are cached, as most files only use a handful of different durations.
+    """
+    total_seconds = value.total_seconds()
+    days, seconds = divmod(abs(int(total_seconds)), 3600 * 24)
+
+    parts = []
+    if days:
+        parts.append(f"{days}D")
+    if seconds:
+        parts.append("T")
+        hours, seconds = divmod(seconds, 3600)
+        minutes, seconds = divmod(seconds, 60)
+        if hours:
+            parts.append(f"{hours}H")
+        if minutes:
+            parts.append(f"{minutes}M")
         if seconds:
-            res += "T"
-            if seconds // 3600:
-                res += str(seconds // 3600) + "H"
-                seconds %= 3600
-            if seconds // 60:
-                res += str(seconds // 60) + "M"
-                seconds %= 60
-            if seconds:
-                res += str(seconds) + "S"
-
-        if not res:
-            res = "T0S"
-        if value.total_seconds() >= 0:
-            return "P" + res
-        else:
-            return f"-P{res}"
+            parts.append(f"{seconds}S")
+
+    res = "".join(parts) or "T0S"
+    if total_seconds >= 0:
+        return "P" + res
+    else:
+        return f"-P{res}"
 
 
 DurationConverter = DurationConverterClass()
 
 
 class PeriodConverterClass(DatetimeConverterMixin, ValueConverter[Timespan]):
+    # periods always consist of DATE-TIME values
+    FORMATS = DatetimeConverterClass.FORMATS
+
     @property
     def ics_type(self) -> str:
         return "PERIOD"
@@ -1,6 +1,6 @@
 import re
 import warnings
-from typing import Iterable, Iterator, Type
+from typing import Iterable, Iterator, Match, Type
 
 from ics.types import ContextDict, EmptyContext, EmptyParams, ExtraParams
 from ics.utils import next_after_str_escape
@@ -8,6 +8,18 @@ from ics.valuetype.base import ValueConverter
 
 __all__ = ["TextConverter", "RawTextConverter"]
 
+# an escape sequence (possibly cut off at the end of the value) or a character that should have been escaped
+ESCAPE_OR_SPECIAL_CHAR = re.compile(r"\\(.?)|[;,\n\r]", re.DOTALL)
+UNESCAPED_CHARS = {
+    ";": ";",
+    ",": ",",
+    "n": "\n",
+    "N": "\n",
+    "r": "\r",
+    "R": "\r",
+    "\\": "\\",
+}
+
 
 class RawTextConverterClass(ValueConverter[str]):
     @property
@@ -64,16 +76,17 @@ class TextConverterClass(ValueConverter[str]):
         return self.escape_text(value)
 
     def split_value_list(self, values: str) -> Iterable[str]:
-        it = iter(values.split(","))
+        segments = values.split(",")
+        if "\\" not in values:
+            return segments
+        items = []
+        it = iter(segments)
         for val in it:
-            while True:
-                m = re.search(r"\\+$", val)  # find any trailing backslash
-                if m and (m.end() - m.start()) % 2 == 1:
-                    # odd number of trailing backslashes => comma was escaped, include next segment
-                    val += "," + next_after_str_escape(it, full_str=values)
-                else:
-                    break
-            yield val
+            while val.endswith("\\") and (len(val) - len(val.rstrip("\\"))) % 2 == 1:
+                # odd number of trailing backslashes => comma was escaped, include next segment
+                val += "," + next_after_str_escape(it, full_str=values)
+            items.append(val)
+        return items
 
     def join_value_list(self, values: Iterable[str]) -> str:
         def checked_iter():
@@ -99,7 +112,33 @@ class TextConverterClass(ValueConverter[str]):
 
     @classmethod
     def unescape_text(cls, string: str) -> str:
-        return "".join(cls.unescape_text_iter(string))
+        """
+        Unescape a TEXT value, raising the same errors as `unescape_text_iter` for the first invalid character,
+        but using a regex instead of looking at every single character.
+        """
+        if not (
+            "\\" in string
+            or ";" in string
+            or "," in string
+            or "\n" in string
+            or "\r" in string
+        ):
+            return string  # nothing to unescape, checking with "in" is a lot faster than any regex
+
+        def unescape(match: Match[str]) -> str:
+            escaped = match.group(1)
+            if escaped is None:
+                raise ValueError(f"unescaped character '{match.group()}' in TEXT value")
+            elif not escaped:
+                raise ValueError(
+                    f"value '{string}' may not end with an escape sequence"
+                )
+            try:
+                return UNESCAPED_CHARS[escaped]
+            except KeyError:
+                raise ValueError(f"can't handle escaped character '{escaped}'")
+
+        return ESCAPE_OR_SPECIAL_CHAR.sub(unescape, string)
 
     @classmethod
     def unescape_text_iter(cls, string: str) -> Iterator[str]:
@@ -0,0 +1,86 @@
+from argparse import ArgumentTypeError
+
+import pytest
+
+from benchmarks.generate import CalendarSpec, generate_calendar
+from benchmarks.run import (
+    BENCHMARKS,
+    BenchmarkResult,
+    compare,
+    main,
+    parse_spec,
+    run_benchmarks,
+)
+from ics import Calendar
+
+
+def test_generate_calendar():
+    spec = CalendarSpec(50, "full", recurring=0.5, timezones=2)
+    calendar = generate_calendar(spec)
+    assert len(calendar.events) == 50
+    assert calendar.serialize() == generate_calendar(spec).serialize()
+    assert Calendar(calendar.serialize()).serialize() == calendar.serialize()
+    assert sum("RRULE" in e.extra.serialize() for e in calendar.events) > 0
+    assert len({e.begin.tzinfo.tzid for e in calendar.events if not e.all_day}) == 2
+
+
+def test_run_benchmarks(tmp_path, monkeypatch):
+    monkeypatch.setattr("benchmarks.run.MIN_SAMPLE_SECONDS", 0)
+    results = run_benchmarks([CalendarSpec(20, "full", 0.2, 2)], repeat=1)
+    assert [r.name.partition("[")[0] for r in results] == list(BENCHMARKS)
+    for result in results:
+        assert result.items > 0 and result.seconds > 0
+        assert result.peak_memory is not None
+
+    baseline = tmp_path / "baseline.json"
+    assert (
+        main(
+            [
+                "-s",
+                "10",
+                "-k",
+                "calendar.parse",
+                "-r",
+                "1",
+                "--baseline",
+                str(baseline),
+                "--save",
+            ]
+        )
+        == 0
+    )
+    assert baseline.exists()
+    assert (
+        main(
+            [
+                "-s",
+                "10",
+                "-k",
+                "calendar.parse",
+                "-r",
+                "1",
+                "--baseline",
+                str(baseline),
+                "--tolerance",
+                "100",
+            ]
+        )
+        == 0
+    )
+
+
+def test_compare():
+    baseline = {"a": BenchmarkResult("a", 1.0, 10, 1000)}
+    assert compare(BenchmarkResult("a", 1.1, 10, 1000), baseline, 0.25) == []
+    assert compare(BenchmarkResult("a", 1.5, 10, 2000), baseline, 0.25) == [
+        "time +50%",
+        "memory +100%",
+    ]
+    assert compare(BenchmarkResult("b", 100.0, 10), baseline, 0.25) == []
+
+
+def test_parse_spec():
+    assert parse_spec("500,minimal,0.5,3") == CalendarSpec(500, "minimal", 0.5, 3)
+    assert parse_spec("20") == CalendarSpec(20)
+    with pytest.raises(ArgumentTypeError):
+        parse_spec("20,unknown")
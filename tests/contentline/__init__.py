@@ -1,6 +1,7 @@
 import re
 import sys
 from datetime import timedelta
+from textwrap import TextWrapper
 
 import lipsum
 import pytest
@@ -9,7 +10,14 @@ from hypothesis.core import Example
 from hypothesis.strategies import characters, text
 
 from ics.contentline import *
-from ics.contentline.container import DEFAULT_LINE_WRAP, Patterns, escape_param
+from ics.contentline.container import (
+    DEFAULT_LINE_WRAP,
+    Patterns,
+    contentline_set_wrap,
+    escape_param,
+    fold_line,
+    fold_line_octets,
+)
 from ics.contentline.parser import ContentLineParser
 from tests.contentline.examples import CONTENTLINE_EXAMPLES
 
@@ -139,12 +147,19 @@ def test_trailing_escape_param():
     )
 
 
+def expected_fold(raw):
+    # folded like TextWrapper does, unless that results in lines that are too long in UTF-8
+    width = DEFAULT_LINE_WRAP.width
+    lines = DEFAULT_LINE_WRAP.wrap(raw)
+    if any(len(line.encode("utf-8")) > width for line in lines):
+        return fold_line_octets(raw, width)
+    return lines
+
+
 def assert_parses_to(raw, cl):
     assert parse_contentline(raw).serialize(wrap=None) == raw
     assert unfold_str(parse_contentline(raw).serialize()) == raw
-    assert parse_contentline(raw).serialize() == "\r\n".join(
-        DEFAULT_LINE_WRAP.wrap(raw)
-    )
+    assert parse_contentline(raw).serialize() == "\r\n".join(expected_fold(raw))
 
     assert parse_contentline(cl.serialize(wrap=None)) == cl
     assert parse_contentline(cl.serialize()) == cl
@@ -153,7 +168,7 @@ def assert_parses_to(raw, cl):
     assert cl.serialize(wrap=None) == raw
 
     for line in Parser.string_to_lines(cl.serialize()):
-        assert len(line) <= DEFAULT_LINE_WRAP.width
+        assert len(line.encode("utf-8")) <= DEFAULT_LINE_WRAP.width
 
 
 @given(name=NAME, value=VALUE)
@@ -425,3 +440,163 @@ for i in range(20):
     test_linefold.hypothesis_explicit_examples.append(
         Example(tuple(), dict(inp=EMOJI + " " * i + EMOJI * 100))
     )
+
+
+def parse_contentline_result(parse, line):
+    try:
+        return parse(line, 1)
+    except ParseError as e:
+        # the state contains object addresses that differ between runs
+        return e.msg, e.line_nr, e.col, e.line
+    except ValueError as e:
+        return str(e)
+    except AssertionError:  # raised by ContentLineParser.check_parsed_line
+        return AssertionError
+
+
+@given(line=text(alphabet="aB-;:,=\"^n' \t"))
+@example(line='TEST;P1="A";P2=B;P3=C,"D",E,"F":"VAL"')
+@example(line="TEST;P=,a,,b:VAL")
+@example(line="TEST;P=a,:VAL")
+@example(line='TEST;P="a"b:VAL')
+@example(line="TEST;P=a^:VAL")
+def test_fast_parse_equivalence(line):
+    slow = parse_contentline_result(ContentLineParser().parse, line)
+    fast = parse_contentline_result(ContentLineParser().parse_fast, line)
+    assert slow == fast
+    if isinstance(slow, ContentLine):
+        for pname, pvals in slow.params.items():
+            assert [type(v) for v in pvals] == [type(v) for v in fast.params[pname]]
+
+
+@given(inp=text(alphabet=["a", "ä", "\U0001f61c", ":", " ", "\t", "\r", "\n"]))
+@example(inp="A:b\r\n c\n\n d\r e")
+@example(inp=" A:b")
+def test_unfold_buffer(inp):
+    def unfold(func):
+        try:
+            return list(func())
+        except ParseError as e:
+            return str(e)
+
+    assert unfold(lambda: Parser.unfold_lines(Parser.string_to_lines(inp))) == unfold(
+        lambda: Parser.unfold_buffer(inp.encode("utf-8"))
+    )
+
+
+def test_unfold_buffer_multibyte_fold():
+    # folding may happen between the octets of a multi-octet character
+    raw = "TEST:abcädef".encode("utf-8")
+    folded = raw[:9] + b"\r\n " + raw[9:]
+    assert list(Parser.buffer_to_containers(bytearray(folded))) == [
+        ContentLine("TEST", value="abcädef", line_nr=0)
+    ]
+
+
+@pytest.mark.parametrize("width", [5, 10, 13, 75])
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "DESCRIPTION:" + "ä" * 100,
+        "SUMMARY:" + "a" * 40 + "€" * 40 + "🎉" * 20,
+        "SUMMARY:short",
+    ],
+)
+def test_fold_line_octets(raw, width):
+    folded = fold_line(raw, TextWrapper(width=width, subsequent_indent=" "), True)
+    for nr, line in enumerate(folded):
+        assert len(line.encode("utf-8")) <= width
+        if nr > 0:
+            assert line.startswith(" ")
+    assert unfold_str("\r\n".join(folded)) == raw
+    if len(raw.encode("utf-8")) <= width:
+        assert folded == [raw]
+    elif width == 75:
+        # all but the last line are filled as far as possible
+        assert all(len(line.encode("utf-8")) > 70 for line in folded[:-1])
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "Überprüfung der Änderungen für das nächste Quartal " * 4,
+        "ä" * 100,
+        "会議室の予約について " * 10,
+        EMOJI * 10,
+        "x" * 30 + "é" * 30,
+    ],
+)
+def test_fold_default_octets(value):
+    cl = ContentLine("DESCRIPTION", value=value)
+    serialized = cl.serialize()
+    for line in serialized.split("\r\n"):
+        assert len(line.encode("utf-8")) <= 75
+    assert unfold_str(serialized) == cl.serialize(wrap=None)
+    assert parse_contentline(serialized) == cl
+    # ASCII lines are still folded exactly like TextWrapper does
+    ascii = ContentLine("DESCRIPTION", value=lipsum.generate_paragraphs(1))
+    assert ascii.serialize() == "\r\n".join(
+        DEFAULT_LINE_WRAP.wrap(ascii.serialize(wrap=None))
+    )
+
+
+def test_serializer_config():
+    cl = ContentLine("DESCRIPTION", value="ä" * 60)
+    assert cl.serialize(config=SerializerConfig()) == cl.serialize()
+    octets = cl.serialize(config=SerializerConfig(width=40, octets=True))
+    assert all(len(line.encode("utf-8")) <= 40 for line in octets.split("\r\n"))
+    assert unfold_str(octets) == cl.serialize(wrap=None)
+    assert cl.serialize(config=SerializerConfig(fold=False)) == cl.serialize(wrap=None)
+    unix = SerializerConfig(width=30, line_ending="\n")
+    assert "\r" not in cl.serialize(newline=True, config=unix)
+    assert cl.serialize(newline=True, config=unix).endswith("\n")
+
+    container = Container("VEVENT", [cl, ContentLine("SUMMARY", value="x")])
+    assert container.serialize(config=SerializerConfig()) == container.serialize()
+    assert "".join(container.serialize_iter(config=unix)) == (
+        "BEGIN:VEVENT\n"
+        + cl.serialize(newline=True, config=unix)
+        + "SUMMARY:x\nEND:VEVENT"
+    )
+    with pytest.raises(ValueError):
+        SerializerConfig(width=0)
+
+
+def test_contentline_set_wrap_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    from threading import Barrier
+
+    cl = ContentLine("DESCRIPTION", value="x" * 200)
+    barrier = Barrier(2)
+
+    def serialize(width):
+        with contentline_set_wrap(width):
+            barrier.wait()
+            results = {cl.serialize() for _ in range(100)}
+            barrier.wait()
+        return results
+
+    with ThreadPoolExecutor(2) as executor:
+        narrow, wide = executor.map(serialize, [20, 100])
+    assert narrow == {cl.serialize(config=SerializerConfig(width=20))}
+    assert wide == {cl.serialize(config=SerializerConfig(width=100))}
+    assert cl.serialize() == cl.serialize(config=SerializerConfig())
+    with contentline_set_wrap(0):
+        assert cl.serialize() == cl.serialize(wrap=None)
+
+
+def test_explicit_arguments_override_context():
+    cl = ContentLine("DESCRIPTION", value="x" * 200)
+    container = Container("VEVENT", [cl])
+    with contentline_set_wrap(20):
+        assert cl.serialize(wrap=None) == "DESCRIPTION:" + "x" * 200
+        assert cl.serialize(wrap=DEFAULT_LINE_WRAP) == cl.serialize(
+            config=SerializerConfig()
+        )
+        assert cl.serialize(config=SerializerConfig(width=100)) != cl.serialize()
+        assert container.serialize(wrap=None) == (
+            "BEGIN:VEVENT\r\nDESCRIPTION:" + "x" * 200 + "\r\nEND:VEVENT"
+        )
+        assert cl.serialize() == cl.serialize(config=SerializerConfig(width=20))
+    with contentline_set_wrap(0):
+        assert cl.serialize(wrap=DEFAULT_LINE_WRAP) != cl.serialize()
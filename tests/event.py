@@ -1,9 +1,11 @@
+import copy
+import pickle
 from datetime import date, datetime, timedelta
 
 import pytest
 
-from ics import Calendar, Event, Timezone, Todo
-from ics.event import deterministic_event_data
+from ics import Calendar, Container, ContentLine, Event, Timezone, Todo
+from ics.event import EventAttrs, deterministic_event_data
 from ics.timezone import UTC
 
 SUMMARY = "test summary"
@@ -128,3 +130,28 @@ def test_within_and_includes() -> None:
 )
 def test_intersects(event1: Event, event2: Event, expect_intersects: bool) -> None:
     assert event2.intersects(event1) == expect_intersects
+
+
+def test_slots_and_lazy_extras() -> None:
+    event = Event(SUMMARY, begin=datetime(2022, 9, 16, 12, tzinfo=UTC))
+    assert "extra" not in getattr(event, "__dict__", {})
+    assert not hasattr(EventAttrs(timespan=event.timespan), "__dict__")
+    assert event.extra == Container("VEVENT")
+    assert event.extra is event.extra
+    assert event.extra_params == {}
+
+    # validation still applies after init, but not within __init__
+    with pytest.raises(TypeError):
+        event.timespan = None
+    event.extra.append(ContentLine("X-TEST", value="1"))
+    for copied in (
+        copy.copy(event),
+        copy.deepcopy(event),
+        pickle.loads(pickle.dumps(event)),
+    ):
+        assert copied == event
+        assert copied.extra == event.extra
+        with pytest.raises(TypeError):
+            copied.timespan = None
+    cal = Calendar(events=[event], todos=[Todo()])
+    assert pickle.loads(pickle.dumps(cal)) == cal
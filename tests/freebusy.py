@@ -0,0 +1,157 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from ics import Attendee, BusyPeriod, Calendar, ContentLine, Event, FreeBusy
+from ics.contentline import string_to_container
+from ics.freebusy import (
+    FBTYPE_BUSY,
+    FBTYPE_BUSY_TENTATIVE,
+    FBTYPE_BUSY_UNAVAILABLE,
+    FBTYPE_FREE,
+    FBTYPE_RANKS,
+    merge_busy_periods,
+)
+from ics.timezone import UTC, Timezone
+
+BASE = datetime(2021, 3, 1, tzinfo=UTC)
+
+
+def period(begin: int, end: int, fbtype: str = FBTYPE_BUSY) -> BusyPeriod:
+    return BusyPeriod(
+        BASE + timedelta(minutes=begin), BASE + timedelta(minutes=end), fbtype
+    )
+
+
+@pytest.mark.parametrize(
+    "periods, expected",
+    [
+        ([], []),
+        ([period(0, 10), period(5, 20), period(20, 30)], [period(0, 30)]),
+        ([period(0, 10), period(11, 20)], [period(0, 10), period(11, 20)]),
+        (
+            [period(0, 30, FBTYPE_BUSY_TENTATIVE), period(10, 20)],
+            [
+                period(0, 10, FBTYPE_BUSY_TENTATIVE),
+                period(10, 20),
+                period(20, 30, FBTYPE_BUSY_TENTATIVE),
+            ],
+        ),
+        ([period(0, 30), period(10, 20, FBTYPE_BUSY_TENTATIVE)], [period(0, 30)]),
+        ([period(0, 10, FBTYPE_FREE), period(5, 5)], []),
+        ([period(0, 10, "X-OUT-OF-OFFICE"), period(5, 15)], [period(0, 15)]),
+    ],
+)
+def test_merge_busy_periods(periods, expected):
+    assert merge_busy_periods(periods) == expected
+    assert merge_busy_periods(reversed(periods)) == expected
+
+
+@given(
+    st.lists(
+        st.tuples(
+            st.integers(0, 50), st.integers(0, 20), st.sampled_from(list(FBTYPE_RANKS))
+        )
+    )
+)
+def test_merge_matches_brute_force(specs):
+    periods = [period(begin, begin + length, fbtype) for begin, length, fbtype in specs]
+    merged = merge_busy_periods(periods)
+    for minute in range(80):
+        instant = BASE + timedelta(minutes=minute)
+        covering = [p.fbtype for p in periods if p.begin <= instant < p.end]
+        expected = max(covering, key=FBTYPE_RANKS.__getitem__, default=None)
+        actual = [p.fbtype for p in merged if p.begin <= instant < p.end]
+        assert actual == ([expected] if expected else [])
+    # the merged periods are sorted, disjoint and never adjacent with the same type
+    for first, second in zip(merged, merged[1:]):
+        assert first.end <= second.begin
+        assert first.end < second.begin or first.fbtype != second.fbtype
+
+
+def test_from_calendars():
+    berlin = Timezone.from_tzid("Europe/Berlin")
+    recurring = Event(begin=BASE + timedelta(hours=15), duration=timedelta(hours=1))
+    recurring.extra.append(ContentLine("RRULE", value="FREQ=DAILY;COUNT=5"))
+    all_day = Event(begin=date(2021, 3, 2))
+    all_day.make_all_day()
+    first = Calendar(
+        events=[
+            Event(
+                begin=datetime(2021, 3, 1, 9, tzinfo=berlin),
+                duration=timedelta(hours=1),
+            ),
+            Event(
+                begin=datetime(2021, 3, 1, 9, 30, tzinfo=berlin),
+                duration=timedelta(hours=1),
+                status="TENTATIVE",
+            ),
+            Event(
+                begin=BASE + timedelta(hours=12),
+                duration=timedelta(hours=1),
+                transparent=True,
+            ),
+            Event(
+                begin=BASE + timedelta(hours=13),
+                duration=timedelta(hours=1),
+                status="CANCELLED",
+            ),
+            # floating, interpreted in the given timezone
+            Event(begin=datetime(2021, 3, 1, 23), duration=timedelta(hours=2)),
+        ]
+    )
+    second = Calendar(events=[recurring, all_day])
+
+    freebusy = FreeBusy.from_calendars(
+        [first, second],
+        datetime(2021, 3, 1),
+        datetime(2021, 3, 3),
+        tz=berlin,
+        attendees=[Attendee("team@example.com")],
+    )
+    hour = timedelta(hours=1)
+    assert freebusy.begin == BASE - hour and freebusy.end == BASE + 47 * hour
+    assert freebusy.busy == [
+        BusyPeriod(BASE + 8 * hour, BASE + 9 * hour, FBTYPE_BUSY),
+        BusyPeriod(BASE + 9 * hour, BASE + 9.5 * hour, FBTYPE_BUSY_TENTATIVE),
+        BusyPeriod(BASE + 15 * hour, BASE + 16 * hour, FBTYPE_BUSY),
+        # the floating event and the all-day event in Berlin time, then the clipped occurrence of the next day
+        BusyPeriod(BASE + 22 * hour, BASE + 47 * hour, FBTYPE_BUSY),
+    ]
+
+
+def test_serialize_round_trip():
+    freebusy = FreeBusy(
+        uid="fb@example.org",
+        dtstamp=BASE,
+        begin=BASE,
+        end=BASE + timedelta(days=1),
+        busy=[
+            period(0, 60),
+            period(60, 90, FBTYPE_BUSY_TENTATIVE),
+            period(120, 180),
+            period(200, 210, FBTYPE_BUSY_UNAVAILABLE),
+        ],
+    )
+    serialized = freebusy.serialize()
+    assert serialized.splitlines()[5:] == [
+        "FREEBUSY;FBTYPE=BUSY:20210301T000000Z/20210301T010000Z,20210301T020000Z/202",
+        " 10301T030000Z",
+        "FREEBUSY;FBTYPE=BUSY-TENTATIVE:20210301T010000Z/20210301T013000Z",
+        "FREEBUSY;FBTYPE=BUSY-UNAVAILABLE:20210301T032000Z/20210301T033000Z",
+        "END:VFREEBUSY",
+    ]
+    assert FreeBusy.from_container(string_to_container(serialized)) == freebusy
+
+    parsed = FreeBusy.from_container(
+        string_to_container(
+            "BEGIN:VFREEBUSY\r\n"
+            "UID:fb@example.org\r\n"
+            "DTSTAMP:20210301T000000Z\r\n"
+            "FREEBUSY:20210301T020000Z/PT1H,20210301T000000Z/PT1H\r\n"
+            "END:VFREEBUSY"
+        )
+    )
+    assert parsed.busy == [period(0, 60), period(120, 180)]
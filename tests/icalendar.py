@@ -0,0 +1,551 @@
+import asyncio
+import copy
+import io
+import mmap
+import pickle
+from datetime import datetime, timedelta
+from types import MemberDescriptorType
+
+import pytest
+from dateutil.tz import gettz
+
+from ics import Calendar, Event, Todo
+from ics.contentline import ContentLine, ParseError, SerializerConfig
+from ics.timezone import UTC, Timezone
+
+CALENDAR = """
+BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//ics.py//test//EN
+BEGIN:VEVENT
+UID:first@example.org
+DTSTAMP:20210818T113251Z
+DTSTART;TZID=X-Custom/Zone:20210719T090000
+DTEND;TZID=X-Custom/Zone:20210719T100000
+SUMMARY:First
+END:VEVENT
+BEGIN:VTODO
+UID:todo@example.org
+DTSTAMP:20210818T113251Z
+SUMMARY:Todo
+END:VTODO
+BEGIN:VEVENT
+UID:second@example.org
+DTSTAMP:20210818T113251Z
+DTSTART:20210720T090000Z
+DURATION:PT1H
+SUMMARY:Second
+END:VEVENT
+BEGIN:VTIMEZONE
+TZID:X-Custom/Zone
+BEGIN:STANDARD
+DTSTART:19700101T000000
+TZOFFSETFROM:+0300
+TZOFFSETTO:+0300
+TZNAME:CST
+END:STANDARD
+END:VTIMEZONE
+END:VCALENDAR
+""".strip()
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        lambda: CALENDAR,
+        lambda: CALENDAR.splitlines(),
+        lambda: io.StringIO(CALENDAR),
+    ],
+)
+def test_iter_events(source):
+    cal = Calendar(CALENDAR)
+    entries = list(Calendar.iter_events(source()))
+    assert [type(e) for e in entries] == [Event, Todo, Event]
+    assert entries == [cal.events[0], cal.todos[0], cal.events[1]]
+    # the timezone defined after the event was resolved in the first pass
+    assert entries[0].begin.tzinfo.tzid == "X-Custom/Zone"
+    assert entries[0].begin.utcoffset().total_seconds() == 3 * 3600
+
+
+def test_iter_events_unseekable():
+    entries = Calendar.iter_events(iter(CALENDAR.splitlines()))
+    with pytest.raises(ValueError, match="X-Custom/Zone is unknown"):
+        next(entries)
+
+
+def test_iter_events_errors():
+    with pytest.raises(ValueError, match="didn't contain any ics data"):
+        list(Calendar.iter_events(""))
+    with pytest.raises(ValueError, match="Multiple calendars"):
+        list(Calendar.iter_events(CALENDAR + "\n" + CALENDAR))
+
+
+def test_mmap(tmp_path):
+    path = tmp_path / "calendar.ics"
+    path.write_bytes(CALENDAR.replace("\n", "\r\n").encode("utf-8"))
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            assert Calendar(m) == Calendar(CALENDAR)
+            assert list(Calendar.iter_events(m)) == list(Calendar.iter_events(CALENDAR))
+
+
+def test_parse_many():
+    other = CALENDAR.replace("first@example.org", "other@example.org")
+    sources = [
+        CALENDAR,
+        (other + "\r\n" + CALENDAR).encode("utf-8"),
+        "BEGIN:VCALENDAR\nEND:VCALENDAR",
+        None,
+        'BEGIN:VCALENDAR\nX;P="a"b:c\nEND:VCALENDAR',
+        CALENDAR,
+    ]
+    results = list(Calendar.parse_many(sources, workers=2))
+    assert [(r.source, r.position) for r in results] == [
+        (0, 0),
+        (1, 0),
+        (1, 1),
+        (2, 0),
+        (3, 0),
+        (4, 0),
+        (5, 0),
+    ]
+    assert results[0].calendar == Calendar(CALENDAR)
+    assert results[1].calendar == Calendar(other)
+    assert results[2].calendar == Calendar(CALENDAR)
+    assert results[0].error is None
+    assert results[3].calendar is None
+    assert isinstance(results[3].error, ValueError)
+    assert isinstance(results[4].error, TypeError)
+    assert isinstance(results[5].error, ParseError)
+    assert results[5].error.line == 'X;P="a"b:c'
+    assert results[6].calendar == Calendar(CALENDAR)
+
+    unordered = Calendar.parse_many(sources, workers=2, ordered=False)
+    assert sorted((r.source, r.position, r.calendar) for r in unordered) == [
+        (r.source, r.position, r.calendar) for r in results
+    ]
+
+
+def test_parallel_populate(monkeypatch):
+    cal = Calendar(CALENDAR, workers=2)
+    assert cal == Calendar(CALENDAR)
+    assert Calendar(CALENDAR.encode(), workers=2) == cal
+    assert cal.events[0].begin.tzinfo.tzid == "X-Custom/Zone"
+
+    # load every component in its own batch, the timezones must still be shared
+    monkeypatch.setattr(
+        "ics.converter.types.calendar.CalendarMeta.POPULATE_BATCH_SIZE", 1
+    )
+    source = CALENDAR.replace(
+        "END:VCALENDAR",
+        "BEGIN:VEVENT\nUID:third@example.org\nDTSTAMP:20210818T113251Z\n"
+        "DTSTART;TZID=X-Custom/Zone:20210721T090000\nEND:VEVENT\n"
+        "BEGIN:VEVENT\nUID:fourth@example.org\nDTSTAMP:20210818T113251Z\n"
+        "DTSTART;TZID=Europe/Berlin:20210721T090000\nEND:VEVENT\n"
+        "END:VCALENDAR",
+    )
+    cal = Calendar(source, workers=2)
+    assert cal == Calendar(source)
+    assert cal.events[0].begin.tzinfo is cal.events[2].begin.tzinfo
+    assert cal.events[3].begin.tzinfo is Timezone.from_tzid("Europe/Berlin")
+
+
+@pytest.mark.parametrize(
+    "source, deferred",
+    [
+        (CALENDAR, ["VEVENT", "VTODO", "VEVENT"]),
+        (CALENDAR.replace("\n", "\r\n").encode(), ["VEVENT", "VTODO", "VEVENT"]),
+        (CALENDAR.replace("\n", "\r"), ["VEVENT", "VTODO", "VEVENT"]),
+        (
+            CALENDAR.replace("BEGIN:VTODO", "begin:vtodo").replace(
+                "END:VTODO", "End:VTodo"
+            ),
+            ["VEVENT", "VTODO", "VEVENT"],
+        ),
+        (
+            CALENDAR.replace(
+                "END:VEVENT",
+                "BEGIN:VALARM\nACTION:DISPLAY\nTRIGGER:-PT5M\nEND:VALARM\nEND:VEVENT",
+            ),
+            ["VEVENT", "VTODO", "VEVENT"],
+        ),
+        # folded BEGIN lines are left to the regular parser
+        (CALENDAR.replace("BEGIN:VTODO", "BEGIN:VTO\n DO"), ["VEVENT", "VEVENT"]),
+    ],
+)
+def test_split_containers(source, deferred):
+    from ics.contentline import Container, buffer_to_containers, string_to_containers
+    from ics.converter.component import ComponentMeta
+
+    meta = ComponentMeta.BY_TYPE[Calendar]
+    (calendar,) = meta.split_containers(source)
+    assert [
+        c.name for c in calendar if isinstance(c, Container) and c.source is not None
+    ] == deferred
+    if isinstance(source, str):
+        assert [calendar] == list(string_to_containers(source))
+    else:
+        assert [calendar] == list(buffer_to_containers(source))
+
+
+def test_split_containers_unterminated():
+    from ics.converter.component import ComponentMeta
+
+    meta = ComponentMeta.BY_TYPE[Calendar]
+    source = CALENDAR.replace("END:VTODO", "")
+    with pytest.raises(ParseError):
+        list(meta.split_containers(source))
+
+
+def test_relink_timezones():
+    from ics import initialize_converters
+
+    initialize_converters()
+    from ics.converter.types.calendar import relink_timezones, relink_value
+    from ics.timespan import Timespan
+
+    tz = Timezone.from_tzid("Europe/Berlin")
+    copy = pickle.loads(pickle.dumps(tz))
+    assert copy is not tz
+    begin = datetime(2021, 7, 19, 9, tzinfo=copy)
+    timespan = Timespan(begin, begin + timedelta(hours=1))
+    values = [(begin, timespan), timespan, copy, "text", None]
+    relinked = relink_value(values, {id(copy): tz})
+    assert relinked is values
+    (dt, nested), span, zone = values[0], values[1], values[2]
+    assert dt.tzinfo is nested.begin_time.tzinfo is span.end_time.tzinfo is tz
+    assert zone is tz and values[3:] == ["text", None]
+
+    event = Event(begin=begin, end=begin + timedelta(hours=1), created=begin)
+    relink_timezones(event, {id(copy): tz})
+    assert event.begin.tzinfo is event.end.tzinfo is tz
+
+
+def test_dump(tmp_path):
+    cal = Calendar(CALENDAR)
+    serialized = cal.serialize()
+    assert "".join(cal.serialize_iter()) == serialized
+    assert list(cal) == serialized.splitlines(keepends=True)
+    unix = SerializerConfig(line_ending="\n")
+    assert cal.serialize(config=unix) == serialized.replace("\r\n", "\n")
+    assert "".join(cal.serialize_iter(config=unix)) == cal.serialize(config=unix)
+
+    text = io.StringIO()
+    cal.dump(text)
+    assert text.getvalue() == serialized
+
+    path = tmp_path / "calendar.ics"
+    with open(path, "wb") as f:
+        cal.dump(f)
+    assert path.read_bytes() == serialized.encode("utf-8")
+    # the timezone is placed before the entries using it
+    assert Calendar(serialized) == cal
+    entries = Calendar.iter_events(iter(serialized.splitlines()))
+    assert list(entries) == cal.events + cal.todos
+
+
+def test_dump_timezones():
+    berlin, new_york = Timezone.from_tzid("Europe/Berlin"), gettz("America/New_York")
+    cal = Calendar()
+    cal.events.append(Event("utc", begin=datetime(2021, 7, 1, 9, tzinfo=UTC)))
+    cal.events.append(Event("berlin", begin=datetime(2021, 7, 1, 9, tzinfo=berlin)))
+    cal.todos.append(Todo(due=datetime(2021, 7, 2, 9, tzinfo=new_york)))
+    cal.events.append(Event("floating", begin=datetime(2021, 7, 1, 9)))
+    serialized = cal.serialize()
+    assert "".join(cal.serialize_iter()) == serialized
+    assert serialized.count("BEGIN:VTIMEZONE") == 2
+    assert serialized.index("America/New_York") < serialized.index("BEGIN:VEVENT")
+
+
+LAZY_CALENDAR = """
+BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//ics.py//test//EN
+BEGIN:VEVENT
+UID:lazy@example.org
+DTSTAMP:20210818T113251Z
+DTSTART:20210720T090000Z
+DESCRIPTION;ALTREP="cid:part1":Line one\\Nand two
+CATEGORIES:a,b
+CREATED;TZID=X-Custom/Zone:20210101T120000
+END:VEVENT
+BEGIN:VTIMEZONE
+TZID:X-Custom/Zone
+BEGIN:STANDARD
+DTSTART:19700101T000000
+TZOFFSETFROM:+0300
+TZOFFSETTO:+0300
+END:STANDARD
+END:VTIMEZONE
+END:VCALENDAR
+""".strip()
+
+
+def test_lazy_populate():
+    eager = Calendar(LAZY_CALENDAR)
+    cal = Calendar(LAZY_CALENDAR, lazy=True)
+    event = cal.events[0]
+    assert event.begin == datetime(2021, 7, 20, 9, tzinfo=UTC)
+    assert event._lazy is not None and "description" in event._lazy.lines
+
+    # untouched properties are serialized from their original lines, including the timezone they refer to
+    serialized = cal.serialize()
+    assert 'DESCRIPTION;ALTREP="cid:part1":Line one\\Nand two' in serialized
+    assert "CREATED;TZID=X-Custom/Zone:20210101T120000" in serialized
+    assert "BEGIN:VTIMEZONE" in serialized
+    assert "".join(cal.serialize_iter()) == serialized
+    assert Calendar(serialized) == eager
+
+    assert event.created == datetime(2021, 1, 1, 9, tzinfo=UTC)
+    assert event.categories == ["a", "b"]
+    assert cal == eager
+    assert event._lazy is None
+    assert cal.serialize() == eager.serialize()
+
+    event = Calendar(LAZY_CALENDAR, lazy=True).events[0]
+    event.description = "Changed"
+    assert event.extra_params["DESCRIPTION"] == {"ALTREP": ["cid:part1"]}
+    assert 'DESCRIPTION;ALTREP="cid:part1":Changed' in event.serialize()
+    del event.categories
+    with pytest.raises(AttributeError):
+        event.categories
+
+    entries = list(Calendar.iter_events(LAZY_CALENDAR, lazy=True))
+    assert pickle.loads(pickle.dumps(entries[0])) == eager.events[0]
+    assert entries == eager.events
+
+
+def test_lazy_type():
+    eager = Calendar(LAZY_CALENDAR).events[0]
+    event = Calendar(LAZY_CALENDAR, lazy=True).events[0]
+    # only pending instances use the hooks of the lazy subclass, the plain slots of `Event` are kept
+    assert type(event) is not Event and isinstance(event, Event)
+    assert isinstance(Event.description, MemberDescriptorType)
+    assert type(event.clone()) is Event
+    assert eager == event and type(event) is Event
+
+    event = Calendar(LAZY_CALENDAR, lazy=True).events[0]
+    assert type(copy.copy(event)) is Event and type(event) is Event
+    event = Calendar(LAZY_CALENDAR, lazy=True).events[0]
+    event.uid, event.dtstamp, event.description, event.categories, event.created
+    assert event._lazy is None and type(event) is Event
+
+
+VERBATIM_CALENDAR = """\
+BEGIN:VCALENDAR\r
+VERSION:2.0\r
+PRODID:-//ics.py//test//EN\r
+BEGIN:VEVENT\r
+UID:verbatim-1\r
+DTSTAMP:20210701T080000Z\r
+DTSTART;TZID=Europe/Berlin:20210720T110000\r
+SUMMARY:Spaced\\,   oddly \r
+ folded\r
+X-Custom;Foo=bar:kept   as is\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+UID:verbatim-2\r
+DTSTAMP:20210701T080000Z\r
+DTSTART:20210721T090000Z\r
+BEGIN:VALARM\r
+ACTION:DISPLAY\r
+DESCRIPTION:Reminder\r
+TRIGGER:-PT5M\r
+END:VALARM\r
+END:VEVENT\r
+END:VCALENDAR\r
+"""
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_keep_source(lazy):
+    first, second = VERBATIM_CALENDAR.split("BEGIN:VEVENT\r\n")[1:]
+    first = "BEGIN:VEVENT\r\n" + first
+    second = "BEGIN:VEVENT\r\n" + second.split("END:VCALENDAR")[0]
+
+    cal = Calendar(VERBATIM_CALENDAR, keep_source=True, lazy=lazy)
+    serialized = cal.serialize()
+    assert first in serialized and second in serialized
+    # timezones referenced by the verbatim text are still emitted
+    assert "TZID:Europe/Berlin" in serialized
+    assert Calendar(serialized) == Calendar(VERBATIM_CALENDAR)
+
+    # reading attributes doesn't modify the component
+    event, other = cal.events
+    assert event.summary == "Spaced,   oddly folded"
+    assert first in cal.serialize()
+    assert event.serialize() == first.rstrip("\r\n")
+    # copies don't keep a reference to the whole source text
+    copy = pickle.loads(pickle.dumps(event))
+    assert copy == event and copy._source is None
+
+    # modifying a sub-component or the length of a list also invalidates the parent
+    other.alarms[0].trigger = timedelta(minutes=-10)
+    event.extra.append(ContentLine("X-OTHER", value="1"))
+    serialized = cal.serialize()
+    assert "TRIGGER:-PT10M" in serialized and "X-OTHER:1" in serialized
+    assert first not in serialized and second not in serialized
+    assert "SUMMARY:Spaced\\,   oddly folded" in serialized
+
+    # with a different line ending, the original lines are unfolded and folded again
+    cal = Calendar(VERBATIM_CALENDAR.replace("\r\n", "\n"), keep_source=True)
+    serialized = cal.serialize()
+    assert "\n" not in serialized.replace("\r\n", "")
+    assert "SUMMARY:Spaced\\,   oddly folded\r\nX-CUSTOM;Foo=bar" in serialized
+    assert Calendar(serialized) == Calendar(VERBATIM_CALENDAR)
+
+
+IN_PLACE_EVENT = """\
+BEGIN:VEVENT\r
+UID:in-place\r
+DTSTAMP:20210701T080000Z\r
+DTSTART:20210720T090000Z\r
+SUMMARY;LANGUAGE=en:Hello\r
+CATEGORIES:a,b\r
+ATTENDEE;CN=Ann:mailto:ann@example.org\r
+X-Custom;Foo=bar:kept   as is\r
+END:VEVENT\r
+"""
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+@pytest.mark.parametrize(
+    "modify, expected",
+    [
+        (lambda e: setattr(e.extra[0], "value", "changed"), "X-CUSTOM;Foo=bar:changed"),
+        (lambda e: e.extra[0].params["Foo"].__setitem__(0, "baz"), "Foo=baz:kept"),
+        (lambda e: e.extra_params["SUMMARY"].update(LANGUAGE=["de"]), "LANGUAGE=de"),
+        (lambda e: e.categories.__setitem__(0, "c"), "CATEGORIES:c,b"),
+        (lambda e: e.attendees[0].extra.update(CN=["Bob"]), "CN=Bob"),
+    ],
+)
+def test_keep_source_in_place(lazy, modify, expected):
+    text = VERBATIM_CALENDAR.split("BEGIN:VEVENT")[0] + IN_PLACE_EVENT + "END:VCALENDAR"
+    cal = Calendar(text, keep_source=True, lazy=lazy)
+    event = cal.events[0]
+    # converting lazily populated properties doesn't count as modification
+    event.summary, event.categories, event.attendees
+    assert IN_PLACE_EVENT in cal.serialize()
+
+    # in-place modifications that keep the number of values are noticed as well
+    modify(event)
+    serialized = cal.serialize()
+    assert expected in serialized and IN_PLACE_EVENT not in serialized
+
+
+def test_diff():
+    old = Calendar(CALENDAR, keep_source=True, lazy=True)
+    todo = CALENDAR[CALENDAR.index("BEGIN:VTODO") : CALENDAR.index("END:VTODO") + 9]
+    new_text = CALENDAR.replace("SUMMARY:Second", "SUMMARY:Second, moved").replace(
+        todo, "BEGIN:VEVENT\nUID:third@example.org\nSUMMARY:Third\nEND:VEVENT"
+    )
+    new = Calendar(new_text, keep_source=True, lazy=True)
+    diff = old.diff(new)
+    assert diff.added == {"third@example.org"}
+    assert diff.removed == {"todo@example.org"}
+    assert diff.changed == {"second@example.org"}
+    assert not new.diff(new) and new.diff(old).added == {"todo@example.org"}
+    # unchanged entries are compared without converting their properties
+    assert old.events[0]._lazy is not None and new.events[0]._lazy is not None
+
+    # digests don't depend on folding and line endings, and match the serialization of unparsed components
+    first = old.events[0]
+    refolded = Calendar(
+        CALENDAR.replace("\n", "\r\n").replace("SUMMARY:First", "SUMMARY:Fi\r\n\trst"),
+        keep_source=True,
+    )
+    assert refolded.events[0].digest() == first.digest()
+    event = Event(uid="x@example.org", summary="X", dtstamp=datetime(2021, 1, 1))
+    reparsed = Calendar(Calendar(events=[event]).serialize(), keep_source=True)
+    assert reparsed.events[0]._source is not None
+    assert reparsed.events[0].digest() == event.digest()
+    event.summary = "Y"
+    assert reparsed.events[0].digest() != event.digest()
+
+    # entries sharing a UID are compared as a whole, regardless of their order
+    a, b = Event(uid="same", summary="A"), Event(uid="same", summary="B")
+    assert not Calendar(events=[a, b]).diff(Calendar(events=[b, a]))
+    assert Calendar(events=[a, b]).diff(Calendar(events=[a])).changed == {"same"}
+
+
+async def chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 2**16])
+def test_load_async(size):
+    text = CALENDAR.replace("\n", "\r\n").replace(
+        "SUMMARY:First", "SUMMARY:Fïrst\r\n  ✓"
+    )
+    expected = Calendar(text)
+    assert expected.events[0].summary == "Fïrst ✓"
+
+    async def load():
+        reader = asyncio.StreamReader()
+        async for chunk in chunks(text.encode(), size):
+            reader.feed_data(chunk)
+        reader.feed_eof()
+        from_reader = await Calendar.load_async(reader)
+        from_iterator = await Calendar.load_async(
+            chunks(text.encode(), size), lazy=True
+        )
+        # checked within the loop, as asyncio might repr the result, which converts all properties
+        assert from_iterator.events[0]._lazy is not None
+        return from_reader, from_iterator
+
+    from_reader, from_iterator = asyncio.run(load())
+    assert from_reader == expected and from_iterator == expected
+
+
+@pytest.mark.parametrize(
+    "text, error",
+    [
+        ("", "Missing BEGIN:VCALENDAR"),
+        ("BEGIN:VEVENT\nEND:VEVENT", "Expected BEGIN:VCALENDAR"),
+        (CALENDAR.replace("END:VCALENDAR", ""), "Missing END:VCALENDAR"),
+        (CALENDAR + "\n" + CALENDAR, "Expected no more content after END:VCALENDAR"),
+        (CALENDAR.replace("END:VTODO", "END:VEVENT"), "Expected END:VTODO"),
+        (" continued\nBEGIN:VCALENDAR\nEND:VCALENDAR", "continuation"),
+    ],
+)
+def test_load_async_errors(text, error):
+    with pytest.raises(ParseError, match=error):
+        asyncio.run(Calendar.load_async(chunks(text.encode(), 5)))
+
+
+def test_async_yields_to_loop():
+    cal = Calendar(CALENDAR)
+    ticks = []
+
+    class Writer:
+        def __init__(self):
+            self.data, self.drained = b"", 0
+
+        def write(self, data: bytes):
+            ticks.append("write")
+            self.data += data
+
+        async def drain(self):
+            self.drained += 1
+
+    async def ticker():
+        while True:
+            ticks.append("tick")
+            await asyncio.sleep(0)
+
+    async def run():
+        task = asyncio.create_task(ticker())
+        writer = Writer()
+        await cal.dump_async(writer)
+        loaded = await Calendar.load_async(chunks(writer.data, 2**16))
+        task.cancel()
+        return writer, loaded
+
+    writer, loaded = asyncio.run(run())
+    assert writer.data.decode() == cal.serialize()
+    assert writer.drained == ticks.count("write") > 3
+    assert loaded == cal
+    # other tasks ran between the writes and while loading the entries
+    assert ticks.count("tick") > ticks.count("write") + 2
+    assert ("write", "write") not in zip(ticks, ticks[1:])
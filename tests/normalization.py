@@ -1,13 +1,18 @@
-from datetime import date, datetime
+import itertools
+import warnings
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
 
 from ics import Calendar, Event, Timezone, Todo
 from ics.event import deterministic_event_data
-from ics.timespan import NormalizationAction
+from ics.timespan import EventTimespan, Normalization, NormalizationAction
 from ics.timezone import UTC
 
 
+@pytest.mark.parametrize("in_place", [False, True])
 @deterministic_event_data()
-def test_normalization():
+def test_normalization(in_place):
     cal = Calendar()
     start = datetime(2021, 8, 1, 12, 0)
     end = datetime(2021, 8, 1, 18, 0)
@@ -40,7 +45,10 @@ def test_normalization():
     allday_todo.make_all_day()
     cal.todos.append(allday_todo)
 
-    cal.normalize(tzCA, normalize_floating=NormalizationAction.REPLACE)
+    index = cal.timeline.index()
+    cal.normalize(
+        tzCA, normalize_floating=NormalizationAction.REPLACE, in_place=in_place
+    )
 
     startCA = start.astimezone(tzCA)
     endCA = end.astimezone(tzCA)
@@ -58,3 +66,50 @@ def test_normalization():
         Todo(summary="Todo1 - diverging", begin=startCA, due=endCA),
         allday_todo,
     ]
+    # the timeline notices the changed timespans, even if they were modified in place
+    assert cal.timeline.index() is not index
+
+
+@pytest.mark.parametrize(
+    "replacement, floating, with_tz",
+    list(
+        itertools.product(
+            [UTC, Timezone.from_tzid("America/Toronto"), timezone(timedelta(hours=5))],
+            list(NormalizationAction),
+            list(NormalizationAction),
+        )
+    ),
+)
+def test_normalize_timespans(replacement, floating, with_tz):
+    """Test that batch normalization gives the same results as normalizing every timespan on its own."""
+    normalization = Normalization(replacement, floating, with_tz)
+    timezones = [None, UTC, Timezone.from_tzid("Europe/Berlin"), timezone.utc]
+    timespans = [
+        EventTimespan(
+            begin.replace(tzinfo=tz),
+            (begin + timedelta(hours=hours)).replace(tzinfo=tz),
+        )
+        for tz in timezones
+        for hours in (0, 1, 5)
+        # including the DST transitions in Berlin and Toronto
+        for begin in (datetime(2021, 3, 28, 1, 30), datetime(2021, 11, 7, 0, 30))
+    ]
+    timespans += [EventTimespan(), EventTimespan(datetime(2021, 1, 1), precision="day")]
+    timespans += [
+        EventTimespan(ts.begin_time, duration=timedelta(hours=2))
+        for ts in timespans[:12]
+    ]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = [
+            ts if ts.is_all_day() else normalization.normalize(ts) for ts in timespans
+        ]
+        normalized = normalization.normalize_timespans(timespans)
+        assert normalized == expected
+        for ts, exp in zip(normalized, expected):
+            assert (
+                ts.begin_time is None or ts.begin_time.tzinfo is exp.begin_time.tzinfo
+            )
+        assert normalization.normalize_timespans(timespans, in_place=True) == expected
+        assert timespans == expected
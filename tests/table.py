@@ -0,0 +1,148 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from ics import Calendar, Event
+from ics.table import NULL_TIME, EventTable, from_epoch_us, to_epoch_us
+from ics.timezone import UTC
+
+
+@pytest.fixture
+def calendar() -> Calendar:
+    cal = Calendar()
+    start = datetime(2000, 1, 1, 9, 0, tzinfo=UTC)
+    for i in range(40):
+        cal.events.append(
+            Event(
+                summary=f"event {i % 7}",
+                begin=start + timedelta(hours=5 * i),
+                duration=timedelta(hours=i % 9),
+                location=["Room A", "Room B", None][i % 3],
+                status=["CONFIRMED", "TENTATIVE"][i % 2],
+                uid=f"uid-{i}",
+            )
+        )
+    cal.events.append(Event(summary="all day", begin=date(2000, 1, 3), uid="all-day"))
+    cal.events[-1].make_all_day()
+    cal.events.append(Event(summary="floating", uid="floating"))
+    cal.events[-1].begin = datetime(2000, 1, 2, 12, 0)
+    cal.events[-1].duration = timedelta(hours=2)
+    cal.events.append(Event(summary="undated", uid="undated"))
+    return cal
+
+
+def uids(table: EventTable, indices) -> set:
+    return {table.uid[i] for i in indices}
+
+
+def test_parse_matches_events(calendar):
+    table = EventTable.parse(calendar.serialize())
+    assert len(table) == len(calendar.events)
+    for columns in (table, calendar.to_table()):
+        for i, event in enumerate(calendar.events):
+            row = columns.row(i)
+            assert row["uid"] == event.uid
+            assert row["summary"] == event.summary
+            assert row["location"] == event.location
+            assert row["status"] == event.status
+            assert columns.begin[i] == to_epoch_us(event.begin)
+            assert columns.end[i] == to_epoch_us(event.end)
+    assert table.begin[-1] == table.end[-1] == NULL_TIME
+    assert table.row(0)["begin"] == datetime(2000, 1, 1, 9, 0, tzinfo=UTC)
+    assert from_epoch_us(NULL_TIME) is None
+    # string columns are dictionary-encoded
+    assert table.location.values == [None, "Room A", "Room B"]
+
+
+def test_queries_match_timeline(calendar):
+    table = calendar.to_table()
+    timeline = calendar.timeline
+    for start in (
+        datetime(2000, 1, 1, tzinfo=UTC),
+        datetime(2000, 1, 2, 13, 0),
+        datetime(2000, 1, 3, 5, 0, tzinfo=UTC),
+        datetime(2000, 1, 5, tzinfo=UTC),
+    ):
+        stop = start + timedelta(hours=30)
+        assert uids(table, table.overlapping(start, stop)) == {
+            e.uid for e in timeline.overlapping(start, stop)
+        }
+        assert uids(table, table.included(start, stop)) == {
+            e.uid for e in timeline.included(start, stop)
+        }
+        assert uids(table, table.at(start)) == {e.uid for e in timeline.at(start)}
+        assert uids(table, table.start_after(start)) == {
+            e.uid for e in timeline.start_after(start)
+        }
+
+
+def scan(table: EventTable, predicate) -> list:
+    return [
+        i
+        for i, (b, e) in enumerate(zip(table.begin, table.end))
+        if b != NULL_TIME and e != NULL_TIME and predicate(b, e)
+    ]
+
+
+@pytest.fixture(params=["numpy", "bisect"])
+def query_path(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr("ics.table.numpy", None)
+    return request.param
+
+
+def test_queries_match_scan(calendar, query_path):
+    table = calendar.to_table()
+    long = Event(begin=datetime(2000, 1, 2, tzinfo=UTC), duration=timedelta(days=3))
+    table.append(long.timespan, "long")
+    instants = sorted((set(table.begin) | set(table.end)) - {NULL_TIME})
+    for qb in instants[::3]:
+        for qe in (qb, qb + 1, qb + 3 * 3600 * 10**6):
+            start, stop = from_epoch_us(qb), from_epoch_us(qe)
+            assert list(table.overlapping(start, stop)) == scan(
+                table,
+                lambda b, e: qb <= b < qe or qb <= e < qe or b <= qb < e or b <= qe < e,
+            )
+            assert list(table.included(start, stop)) == scan(
+                table, lambda b, e: qb <= b and e < qe
+            )
+        assert list(table.at(start)) == scan(table, lambda b, e: b <= qb < e)
+        assert list(table.start_after(start)) == scan(table, lambda b, e: b > qb)
+
+
+def test_begin_order_follows_appends(calendar):
+    table = calendar.to_table()
+    order, begins = table.begin_order()
+    assert list(begins) == sorted(b for b in table.begin if b != NULL_TIME)
+    assert [table.begin[i] for i in order] == list(begins)
+    assert table.begin_order() == (order, begins)
+    begin = datetime(1999, 1, 1, tzinfo=UTC)
+    table.append(Event(begin=begin, duration=timedelta(hours=1)).timespan, "early")
+    assert table.begin_order()[0][0] == len(table) - 1
+    assert uids(table, table.at(begin)) == {"early"}
+
+
+def test_sort_take_group(calendar):
+    table = calendar.to_table()
+    order = table.argsort()
+    assert [table.begin[i] for i in order] == sorted(table.begin)
+    sorted_table = table.sort("summary", "begin")
+    assert list(sorted_table.summary) == sorted(table.summary)  # type: ignore[type-var]
+    assert len(sorted_table) == len(table)
+    assert sorted_table.summary.values is table.summary.values
+
+    groups = table.group_by("location")
+    assert set(groups) == {"Room A", "Room B", None}
+    assert sum(len(g) for g in groups.values()) == len(table)
+    room_a = table.take(groups["Room A"])
+    assert set(room_a.location) == {"Room A"}
+    assert list(room_a.uid) == [table.uid[i] for i in groups["Room A"]]
+
+
+def test_to_numpy(calendar):
+    numpy = pytest.importorskip("numpy")
+    columns = calendar.to_table().to_numpy()
+    assert columns["begin"].dtype == numpy.int64
+    assert list(columns["uid"]) == [e.uid for e in calendar.events]
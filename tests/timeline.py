@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import itertools
 from datetime import date, datetime, timedelta
 
 import pytest
 from freezegun import freeze_time
 
-from ics import Calendar, Event
+from ics import Calendar, Event, Timespan
+from ics.timeline import Timeline
 from ics.timezone import UTC
 
 
@@ -86,6 +88,21 @@ def test_start_after(calendar: Calendar) -> None:
     ]
 
 
+def test_start_after_mixed_floating(calendar: Calendar) -> None:
+    """Test that floating all-day events can be compared to a timezone-aware instant."""
+    calendar.events.append(
+        Event(
+            "aware",
+            datetime(2000, 2, 15, tzinfo=UTC),
+            datetime(2000, 2, 16, tzinfo=UTC),
+        )
+    )
+    assert [
+        e.summary
+        for e in calendar.timeline.start_after(datetime(2000, 1, 15, tzinfo=UTC))
+    ] == ["second", "aware", "third", "fourth"]
+
+
 @pytest.mark.parametrize(
     "at_datetime,expected_events",
     [
@@ -148,3 +165,257 @@ def test_included(
     assert [
         e.summary for e in calendar_times.timeline.included(start, end)
     ] == expected_events
+
+
+def test_index_invalidation(calendar_times: Calendar) -> None:
+    """Test that the index of a timeline follows changes to the calendar."""
+    timeline = calendar_times.timeline
+    assert [e.summary for e in timeline.at(datetime(2000, 1, 1, 12, 30))] == ["second"]
+    index = timeline.index()
+    assert timeline.index() is index
+    calendar_times.events[1].summary = "renamed second"
+    assert timeline.index() is index
+    calendar_times.events[1].summary = "second"
+
+    calendar_times.events.append(
+        Event(
+            "fourth",
+            begin=datetime(2000, 1, 1, 10, 0),
+            end=datetime(2000, 1, 2, 0, 0),
+        )
+    )
+    assert [e.summary for e in timeline.at(datetime(2000, 1, 1, 12, 30))] == [
+        "fourth",
+        "second",
+    ]
+
+    calendar_times.events[0].end = datetime(2000, 1, 1, 12, 45)
+    assert [e.summary for e in timeline.at(datetime(2000, 1, 1, 12, 30))] == [
+        "fourth",
+        "first",
+        "second",
+    ]
+
+    del calendar_times.events[:]
+    assert list(timeline.at(datetime(2000, 1, 1, 12, 30))) == []
+
+    calendar_times.events = [
+        Event(
+            "fifth", begin=datetime(2000, 1, 1, 12, 0), end=datetime(2000, 1, 1, 13, 0)
+        )
+    ]
+    assert [e.summary for e in timeline.at(datetime(2000, 1, 1, 12, 30))] == ["fifth"]
+
+
+def test_index_consistency() -> None:
+    """Test that indexed queries return the same events as checking every single event."""
+    cal = Calendar()
+    start = datetime(2000, 1, 1, tzinfo=UTC)
+    for i in range(200):
+        begin = start + timedelta(hours=(i * 37) % 500)
+        cal.events.append(
+            Event(str(i), begin=begin, duration=timedelta(hours=(i * 13) % 50))
+        )
+    timeline = cal.timeline
+    entries = list(timeline.iterator())
+    assert [e for _, e in entries] == sorted(cal.events)
+
+    for hours in range(0, 560, 7):
+        query_start = start + timedelta(hours=hours)
+        query_stop = query_start + timedelta(hours=hours % 40)
+        query = Timespan(query_start, query_stop)
+        assert list(timeline.overlapping(query_start, query_stop)) == [
+            e for ts, e in entries if ts.intersects(query)
+        ]
+        assert list(timeline.included(query_start, query_stop)) == [
+            e for ts, e in entries if ts.is_included_in(query)
+        ]
+        assert list(timeline.at(query_start)) == [
+            e for ts, e in entries if ts.includes(query_start)
+        ]
+        assert list(timeline.start_after(query_start)) == [
+            e
+            for ts, e in entries
+            if ts.begin_time is not None and ts.begin_time > query_start
+        ]
+
+
+RECURRING_CALENDAR = """
+BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//ics.py//test//EN
+BEGIN:VEVENT
+UID:weekly@example.org
+DTSTAMP:20000101T000000Z
+DTSTART:20000103T100000Z
+DTEND:20000103T110000Z
+RRULE:FREQ=WEEKLY
+EXDATE:20000110T100000Z
+RDATE:20000112T150000Z
+SUMMARY:Weekly
+END:VEVENT
+BEGIN:VEVENT
+UID:weekly@example.org
+DTSTAMP:20000101T000000Z
+RECURRENCE-ID:20000117T100000Z
+DTSTART:20000118T120000Z
+DTEND:20000118T130000Z
+SUMMARY:Moved
+END:VEVENT
+BEGIN:VEVENT
+UID:single@example.org
+DTSTAMP:20000101T000000Z
+DTSTART:20000105T000000Z
+DURATION:PT1H
+SUMMARY:Single
+END:VEVENT
+END:VCALENDAR
+""".strip()
+
+
+def test_expand_recurrences() -> None:
+    """Test that occurrences of recurring events are generated within the queried timespan."""
+    cal = Calendar(RECURRING_CALENDAR)
+    timeline = Timeline(cal, None, expand_recurrences=True)
+
+    events = list(
+        timeline.overlapping(
+            datetime(2000, 1, 1, tzinfo=UTC), datetime(2000, 2, 1, tzinfo=UTC)
+        )
+    )
+    assert [(e.summary, e.begin.day) for e in events] == [
+        ("Weekly", 3),
+        ("Single", 5),
+        ("Weekly", 12),
+        ("Moved", 18),
+        ("Weekly", 24),
+        ("Weekly", 31),
+    ]
+    assert events[0] is cal.events[0]
+    assert events[-1].end == datetime(2000, 1, 31, 11, 0, tzinfo=UTC)
+
+    assert [
+        e.begin for e in timeline.at(datetime(2000, 1, 24, 10, 30, tzinfo=UTC))
+    ] == [datetime(2000, 1, 24, 10, 0, tzinfo=UTC)]
+    assert [
+        e.begin
+        for e in itertools.islice(
+            timeline.start_after(datetime(2010, 1, 1, tzinfo=UTC)), 2
+        )
+    ] == [
+        datetime(2010, 1, 4, 10, 0, tzinfo=UTC),
+        datetime(2010, 1, 11, 10, 0, tzinfo=UTC),
+    ]
+    assert [e.summary for e in itertools.islice(timeline, 4)] == [
+        "Weekly",
+        "Single",
+        "Weekly",
+        "Moved",
+    ]
+
+    # without expansion, only the first occurrence is returned
+    assert [e.summary for e in cal.timeline] == ["Weekly", "Single", "Moved"]
+
+
+def test_overlapping_pairs_and_clusters() -> None:
+    """Test that the sweep finds the same overlaps as comparing every pair of events."""
+    cal = Calendar()
+    start = datetime(2000, 1, 1, tzinfo=UTC)
+    for i in range(150):
+        begin = start + timedelta(hours=(i * 37) % 400)
+        # including events without duration and events that only touch each other
+        cal.events.append(
+            Event(str(i), begin=begin, duration=timedelta(hours=(i * 7) % 9))
+        )
+    cal.events.append(Event("floating", begin=datetime(2000, 1, 3, 5)))
+    cal.events.append(Event("no begin"))
+    timeline = cal.timeline
+
+    def spans(event):
+        begin, end = event.timespan.cmp_tuple()
+        return begin, max(begin, end)
+
+    expected = set()
+    for first, second in itertools.combinations(cal.events[:-1], 2):
+        (begin1, end1), (begin2, end2) = spans(first), spans(second)
+        if begin1 < end2 and begin2 < end1:
+            expected.add(frozenset((first.summary, second.summary)))
+    pairs = list(timeline.overlapping_pairs())
+    assert {frozenset((a.summary, b.summary)) for a, b in pairs} == expected
+    assert len(pairs) == len(expected)
+    assert all(a.timespan <= b.timespan for a, b in pairs)
+
+    clusters = list(timeline.overlapping_clusters())
+    assert sorted(e.summary for c in clusters for e in c) == sorted(
+        set().union(*expected)
+    )
+    for cluster in clusters:
+        assert len(cluster) > 1
+        assert cluster == sorted(cluster)
+        # pairs never connect different clusters
+        members = {e.summary for e in cluster}
+        for pair in expected:
+            assert pair <= members or not pair & members
+
+    query = (datetime(2000, 1, 5, tzinfo=UTC), datetime(2000, 1, 6, tzinfo=UTC))
+    in_query = {e.summary for e in timeline.overlapping(*query)}
+    assert {
+        frozenset((a.summary, b.summary)) for a, b in timeline.overlapping_pairs(*query)
+    } == {pair for pair in expected if pair <= in_query}
+
+
+def test_overlapping_pairs_recurrences() -> None:
+    """Test overlaps between occurrences of recurring events."""
+    cal = Calendar(RECURRING_CALENDAR)
+    cal.events.append(
+        Event(
+            "Clash",
+            begin=datetime(2000, 1, 24, 10, 30, tzinfo=UTC),
+            end=datetime(2000, 1, 24, 12, tzinfo=UTC),
+        )
+    )
+    cal.events.append(
+        Event(
+            "Adjacent",
+            begin=datetime(2000, 1, 18, 13, tzinfo=UTC),
+            end=datetime(2000, 1, 18, 14, tzinfo=UTC),
+        )
+    )
+    timeline = Timeline(cal, None, expand_recurrences=True)
+    month = (datetime(2000, 1, 1, tzinfo=UTC), datetime(2000, 2, 1, tzinfo=UTC))
+    assert [
+        (a.summary, a.begin.day, b.summary)
+        for a, b in timeline.overlapping_pairs(*month)
+    ] == [("Weekly", 24, "Clash")]
+    assert [
+        [e.summary for e in cluster]
+        for cluster in timeline.overlapping_clusters(*month)
+    ] == [["Weekly", "Clash"]]
+    # without expansion, only the first occurrence is checked, and "Moved" only touches "Adjacent"
+    assert list(cal.timeline.overlapping_pairs()) == []
+    with pytest.raises(ValueError):
+        next(timeline.overlapping_pairs(None, month[1]))
+
+
+def test_index_per_calendar() -> None:
+    """Test that changes to the events of one calendar don't invalidate the index of another one."""
+    first, second = Calendar(), Calendar()
+    for cal in (first, second):
+        for i in range(3):
+            cal.events.append(
+                Event(
+                    f"{i}", begin=datetime(2000, 1, 1 + i), end=datetime(2000, 1, 2 + i)
+                )
+            )
+    index = second.timeline.index()
+    first.events[0].begin = datetime(1999, 12, 31)
+    Event("unrelated").begin = datetime(2000, 1, 1)
+    Calendar(first.serialize())
+    assert second.timeline.index() is index
+
+    shared = first.events[1]
+    second.events.append(shared)
+    index = second.timeline.index()
+    shared.end = datetime(2000, 1, 5)
+    assert second.timeline.index() is not index
+    assert list(second.timeline.at(datetime(2000, 1, 4, 12))) == [shared]
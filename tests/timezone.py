@@ -0,0 +1,64 @@
+import copy
+import pickle
+from datetime import datetime, timedelta
+
+import pytest
+
+from ics import Timezone
+from ics.timezone.converters import TIMEZONE_CACHE, TimezoneCacheInfo
+
+
+@pytest.mark.parametrize(
+    "tzid", ["Europe/Berlin", "America/New_York", "Australia/Lord_Howe"]
+)
+def test_transition_table(tzid):
+    tz = Timezone.from_tzid(tzid)
+    transitions = tz._transitions
+    assert transitions is not None
+    for onset in transitions.keys[0][::40]:
+        for minutes in range(-90, 91, 30):
+            for fold in (0, 1):
+                dt = (onset + timedelta(minutes=minutes)).replace(fold=fold)
+                if transitions.start <= dt < transitions.end:
+                    assert tz._find_observance(
+                        dt
+                    ) is Timezone._find_observance_cachable(tz, dt)
+
+
+def test_transition_table_range():
+    tz = Timezone.from_tzid("Europe/Berlin")
+    assert tz.utcoffset(datetime(2021, 7, 1)) == timedelta(hours=2)
+    assert tz.utcoffset(datetime(2021, 10, 31, 2, 30)) == timedelta(hours=2)
+    assert tz.utcoffset(datetime(2021, 10, 31, 2, 30, fold=1)) == timedelta(hours=1)
+    # outside the precomputed range, the recurrence rules are evaluated
+    assert tz._transitions.find_observance(datetime(2150, 7, 1)) is None
+    assert tz.utcoffset(datetime(2150, 7, 1)) == timedelta(hours=2)
+    assert tz.utcoffset(datetime(2150, 1, 1)) == timedelta(hours=1)
+
+
+def test_timezone_cache():
+    TIMEZONE_CACHE.clear()
+    berlin = Timezone.from_tzid("Europe/Berlin")
+    assert Timezone.from_tzid("Europe/Berlin") is berlin
+    assert Timezone.from_tzid("W. Europe Standard Time") is berlin
+    assert TIMEZONE_CACHE.info() == TimezoneCacheInfo(
+        hits=1, misses=2, maxsize=TIMEZONE_CACHE.maxsize, currsize=3
+    )
+    with pytest.raises(ValueError, match="no vTimezone.ics file found"):
+        Timezone.from_tzid("Nowhere/Atlantis")
+
+    TIMEZONE_CACHE.clear()
+    assert TIMEZONE_CACHE.info().currsize == 0
+    assert Timezone.from_tzid("Europe/Berlin") is not berlin
+    assert Timezone.from_tzid("Europe/Berlin") == berlin
+
+
+def test_pickle():
+    tz = Timezone.from_tzid("Europe/Berlin")
+    for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+        unpickled = pickle.loads(pickle.dumps(tz, protocol))
+        assert unpickled == tz
+        assert unpickled.utcoffset(datetime(2021, 7, 1)) == timedelta(hours=2)
+    copied = copy.deepcopy(tz)
+    assert copied == tz
+    assert copied.utcoffset(datetime(2021, 7, 1)) == timedelta(hours=2)
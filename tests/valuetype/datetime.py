@@ -0,0 +1,126 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from dateutil.tz import UTC as dateutil_tzutc
+from hypothesis import example, given
+from hypothesis import strategies as st
+
+from ics.timezone import UTC, Timezone
+from ics.types import ContextDict, ExtraParams
+from ics.valuetype.datetime import (
+    DateConverter,
+    DatetimeConverter,
+    DurationConverter,
+    format_date_time,
+    parse_fixed_width,
+)
+
+FIXED_WIDTH_FORMATS = {8: "%Y%m%d", 15: "%Y%m%dT%H%M%S"}
+
+
+def strptime_or_error(value: str):
+    try:
+        return datetime.strptime(value, FIXED_WIDTH_FORMATS[len(value)])
+    except ValueError:
+        return None
+
+
+@given(
+    value=st.datetimes(min_value=datetime(1000, 1, 1)).map(
+        lambda dt: dt.strftime("%Y%m%dT%H%M%S")
+    )
+    | st.text(alphabet="0123456789Tt", min_size=8, max_size=8)
+    | st.text(alphabet="0123456789Tt", min_size=15, max_size=15)
+)
+@example(value="20200230")
+@example(value="20201305")
+@example(value="20200101T240000")
+@example(value="20200101T105960")
+def test_fixed_width_matches_strptime(value):
+    # the fast path must never accept something strptime would reject or parse differently
+    fast = parse_fixed_width.__wrapped__(value)  # type: ignore[attr-defined]
+    if fast is not None:
+        assert fast == strptime_or_error(value)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("20200101T100000Z", datetime(2020, 1, 1, 10, tzinfo=dateutil_tzutc)),
+        ("20200101t100000z", datetime(2020, 1, 1, 10, tzinfo=dateutil_tzutc)),
+        ("20200101T100000", datetime(2020, 1, 1, 10)),
+        ("2020-01-01T10:00", None),  # not matching any format
+        ("20200101T1000", datetime(2020, 1, 1, 10)),
+        ("20200101", datetime(2020, 1, 1)),
+    ],
+)
+def test_parse_datetime(value, expected):
+    if expected is None:
+        with pytest.raises(ValueError, match="couldn't find format matching"):
+            DatetimeConverter.parse(value)
+    else:
+        assert DatetimeConverter.parse(value) == expected
+        # results are cached, so parse again
+        assert DatetimeConverter.parse(value) == expected
+    assert DateConverter.parse("20200101") == date(2020, 1, 1)
+
+
+@pytest.mark.parametrize("value", ["20201305", "20200101T246000Z", "20200231"])
+def test_parse_errors_unchanged(value):
+    # invalid values fall back to strptime and raise its errors
+    tr_value = value.rstrip("Z")
+    with pytest.raises(ValueError) as expected:
+        datetime.strptime(tr_value, FIXED_WIDTH_FORMATS[len(tr_value)])
+    with pytest.raises(ValueError) as actual:
+        DatetimeConverter.parse(value)
+    assert str(actual.value) == str(expected.value)
+
+
+@given(value=st.datetimes(min_value=datetime(1000, 1, 1)))
+def test_format_date_time_matches_strftime(value):
+    assert format_date_time(value) == value.strftime("%Y%m%dT%H%M%S")
+
+
+def test_serialize_datetime():
+    berlin = Timezone.from_tzid("Europe/Berlin")
+    context = ContextDict(defaultdict(lambda: None))
+    for _ in range(2):  # the second time, the memoized timezones are used
+        params: ExtraParams = {}
+        assert (
+            DatetimeConverter.serialize(
+                datetime(2020, 1, 2, 3, 4, 5, tzinfo=berlin), params, context
+            )
+            == "20200102T030405"
+        )
+        assert params == {"TZID": [berlin.tzid]}
+        for utc in (UTC, dateutil_tzutc, timezone.utc):
+            params = {}
+            assert (
+                DatetimeConverter.serialize(
+                    datetime(2020, 1, 2, tzinfo=utc), params, context
+                )
+                == "20200102T000000Z"
+            )
+            assert params == {}
+    assert context[DatetimeConverter.CONTEXT_KEY_AVAILABLE_TZ] == {berlin.tzid: berlin}
+    assert DatetimeConverter.serialize(datetime(999, 1, 2)) == datetime(
+        999, 1, 2
+    ).strftime("%Y%m%dT%H%M%S")
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (timedelta(0), "PT0S"),
+        (timedelta(days=2), "P2D"),
+        (timedelta(days=1, hours=2, seconds=5), "P1DT2H5S"),
+        (timedelta(minutes=-90), "-PT1H30M"),
+        (timedelta(milliseconds=-500), "-PT0S"),
+    ],
+)
+def test_serialize_duration(value, expected):
+    assert DurationConverter.serialize(value) == expected
+    assert DurationConverter.parse(expected) == timedelta(
+        seconds=int(value.total_seconds())
+    )
@@ -1,6 +1,7 @@
 import attr
 import pytest
 from hypothesis import example, given
+from hypothesis import strategies as st
 
 from ics.contentline import ContentLine, Parser, string_to_containers
 from ics.valuetype.text import TextConverter
@@ -75,6 +76,19 @@ def test_broken_escape():
     assert e.match("unescaped character")
 
 
+@given(value=st.text(alphabet="ab\\;,nNrRt\n\r "))
+@example(value="a\\\\\\,b")
+def test_unescape_matches_iter(value):
+    try:
+        expected = "".join(TextConverter.unescape_text_iter(value))
+    except ValueError as e:
+        with pytest.raises(ValueError) as actual:
+            TextConverter.unescape_text(value)
+        assert str(actual.value) == str(e)
+    else:
+        assert TextConverter.unescape_text(value) == expected
+
+
 def test_trailing_escape_value_list():
     cl1 = parse_contentline("TEST:this is,a list \\, with a\\\\,trailing escape\\")
     with pytest.raises(ValueError) as excinfo:
@@ -95,14 +109,16 @@ def test_trailing_escape_value_list():
 @given(value=VALUE)
 @example(value="\\,")
 @example(value="\\\\\\\\,\\\\\\,")
+@example(value="000" + "\U00010000" * 18)
 def test_any_text_value_recode(value):
     esc = TextConverter.serialize(value)
     assert TextConverter.parse(esc) == value
     cl = ContentLine("TEST", value=esc)
-    assert parse_contentline(cl.serialize()) == cl
+    # even short values may be folded if they exceed 75 octets, which only string_to_containers unfolds
+    assert parse_contentline(cl.serialize(wrap=None)) == cl
     assert list(string_to_containers(cl.serialize())) == [cl]
     vals = [esc, esc, "test", esc]
     cl2 = ContentLine("TEST", value=TextConverter.join_value_list(vals))
     assert list(TextConverter.split_value_list(cl2.value)) == vals
-    assert parse_contentline(cl.serialize()) == cl
+    assert parse_contentline(cl.serialize(wrap=None)) == cl
     assert list(string_to_containers(cl.serialize())) == [cl]